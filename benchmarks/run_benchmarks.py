@@ -0,0 +1,216 @@
+"""Benchmarks für Parser, Bewertung und Tabellenaufbau mit synthetischen netsh-Ausgaben.
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.run_benchmarks --output results.json
+    python -m benchmarks.run_benchmarks --compare results.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+# Die Tabelle wird ohne Bildschirm gerendert
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# Die Messungen dürfen den gespeicherten Scan des Benutzers weder lesen noch überschreiben
+os.environ["WLAN_SNAPSHOT"] = "0"
+
+from benchmarks.synthetic_netsh import generate_netsh_output
+from network import evaluation
+from network.backends import ReplayBackend, parse_networks
+from network.history import set_history
+from network.scanner import evaluate_wlan_security, scan_networks, set_backend
+from network.signal_series import SignalSeries
+
+DEFAULT_SIZES = [10, 100, 1000, 5000, 20000]
+DEFAULT_LOCALES = ["de", "en"]
+DEFAULT_REPEAT = 3
+
+# Ab diesem Faktor gilt ein Ergebnis beim Vergleich als langsamer
+REGRESSION_FACTOR = 1.2
+# Kürzere Messungen schwanken zu stark für einen Vergleich (Sekunden)
+MIN_COMPARE_TIME = 0.001
+
+def _measure(function, repeat, setup=None):
+    # Liefert die Laufzeiten in Sekunden; setup() läuft vor jeder Messung und wird nicht gezählt
+    timings = []
+    for _ in range(repeat):
+        argument = setup() if setup is not None else None
+        started = time.perf_counter()
+        function(argument)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+def _parse(text):
+    return list(parse_networks(text))
+
+class RenderBench:
+    """Misst den Aufbau der Ergebnistabelle im Hauptfenster (Qt offscreen)."""
+
+    def __init__(self):
+        from PyQt6.QtWidgets import QApplication
+        from gui.main_window import MainWindow
+        self.app = QApplication.instance() or QApplication(sys.argv)
+        self.window_class = MainWindow
+        self.window = None
+
+    def new_window(self):
+        # Das vorherige Fenster schließen, damit sich die Messungen nicht gegenseitig beeinflussen
+        if self.window is not None:
+            self.window.close()
+            self.window.deleteLater()
+        window = self.window = self.window_class()
+        window.show()
+        self.app.processEvents()
+        return window
+
+    def finish(self, window):
+        # Layout und Zeichnen der sichtbaren Zeilen gehören zur gemessenen Zeit
+        window.result_table.viewport().repaint()
+        self.app.processEvents()
+
+    def populate(self, window, networks):
+        window.populate_table(networks)
+        self.finish(window)
+
+    def stream(self, window, networks):
+        # Wie während eines laufenden Scans: jedes Netzwerk als eigene Zeile einfügen
+        for net in networks:
+            window.network_model.add_network(net)
+        self.finish(window)
+
+def run_benchmarks(sizes=DEFAULT_SIZES, locales=DEFAULT_LOCALES, repeat=DEFAULT_REPEAT, render=True):
+    """Führt alle Messungen aus und liefert die Ergebnisse als Liste von Wörterbüchern."""
+    # Synthetische Scans nicht in den Verlauf des Benutzers schreiben
+    set_history(None)
+    render_bench = None
+    if render:
+        try:
+            render_bench = RenderBench()
+        except ImportError:
+            print("PyQt6 nicht installiert, Tabellen-Messungen werden übersprungen.")
+
+    results = []
+
+    def record(locale, size, stage, timings, **extra):
+        entry = {
+            "locale": locale,
+            "bssids": size,
+            "stage": stage,
+            "repeat": len(timings),
+            "min": min(timings),
+            "median": statistics.median(timings),
+            "mean": statistics.fmean(timings),
+        }
+        entry.update(extra)
+        results.append(entry)
+        print(f"{locale} {size:>6} {stage:<16} median {entry['median'] * 1000:9.2f} ms")
+
+    for locale in locales:
+        for size in sizes:
+            text = generate_netsh_output(size, locale)
+            networks = _parse(text)
+            access_points = [ap for net in networks for ap in net.access_points]
+            # Zeigt, ob der Parser die Felder der jeweiligen Sprache erkennt
+            record(locale, size, "parse", _measure(lambda _: _parse(text), repeat),
+                   networks=len(networks), parsed_bssids=len(access_points),
+                   with_channel=sum(1 for ap in access_points if ap.channel is not None),
+                   with_auth=sum(1 for net in networks if net.auth))
+            record(locale, size, "evaluate", _measure(lambda parsed: evaluate_wlan_security(parsed), repeat,
+                                                      setup=lambda: _parse(text)))
+            # Erneuter Scan mit gleichem Inhalt: die Bewertungen des letzten Scans werden übernommen
+            previous = {ap.bssid: ap for ap in access_points}
+            evaluate_wlan_security(networks)
+            record(locale, size, "evaluate_rescan", _measure(lambda parsed: evaluate_wlan_security(parsed, previous), repeat,
+                                                             setup=lambda: _parse(text)))
+            # Wie im Scanner: zusätzlich Ringpuffer und geglättetes Signal je BSSID nachführen
+            series = SignalSeries()
+            series.update(access_points)
+            record(locale, size, "evaluate_smoothed",
+                   _measure(lambda parsed: evaluate_wlan_security(parsed, previous, series), repeat,
+                            setup=lambda: _parse(text)))
+
+            # Kompletter Scan über das Replay-Backend (Parsen, Bewerten, Cache)
+            set_backend(ReplayBackend(text))
+            record(locale, size, "scan_replay", _measure(lambda _: scan_networks(), repeat))
+
+            if render_bench is not None:
+                def parsed_and_evaluated():
+                    parsed = _parse(text)
+                    evaluate_wlan_security(parsed)
+                    return parsed
+
+                record(locale, size, "render_populate", _measure(
+                    lambda args: render_bench.populate(*args), repeat,
+                    setup=lambda: (render_bench.new_window(), parsed_and_evaluated())))
+                record(locale, size, "render_stream", _measure(
+                    lambda args: render_bench.stream(*args), repeat,
+                    setup=lambda: (render_bench.new_window(), _parse(text))))
+
+                def window_with_table():
+                    window = render_bench.new_window()
+                    render_bench.populate(window, parsed_and_evaluated())
+                    return window, parsed_and_evaluated()
+
+                # Erneuter Scan mit gleichem Inhalt: nur der Diff gegen die bestehende Tabelle
+                record(locale, size, "render_rescan", _measure(
+                    lambda args: render_bench.populate(*args), repeat, setup=window_with_table))
+    return results
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def environment_info():
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": evaluation.numpy_module().__version__ if evaluation.numpy_module() is not None else None,
+    }
+
+def compare(results, baseline):
+    """Vergleicht die Mediane mit einer früheren Ergebnisdatei und gibt die Faktoren aus."""
+    previous = {(entry["locale"], entry["bssids"], entry["stage"]): entry for entry in baseline["results"]}
+    regressions = 0
+    for entry in results:
+        old = previous.get((entry["locale"], entry["bssids"], entry["stage"]))
+        if old is None or max(old["median"], entry["median"]) < MIN_COMPARE_TIME:
+            continue
+        factor = entry["median"] / old["median"]
+        marker = ""
+        if factor > REGRESSION_FACTOR:
+            marker = "  <- langsamer"
+            regressions += 1
+        print(f"{entry['locale']} {entry['bssids']:>6} {entry['stage']:<16} {factor:6.2f}x{marker}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks für Parser, Bewertung und Tabellenaufbau")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Anzahl der BSSIDs je Messung")
+    parser.add_argument("--locales", nargs="+", default=DEFAULT_LOCALES, choices=DEFAULT_LOCALES)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--no-render", action="store_true", help="Tabellen-Messungen überspringen")
+    parser.add_argument("--output", help="Ergebnisse als JSON speichern")
+    parser.add_argument("--compare", help="Mit einer früheren JSON-Ergebnisdatei vergleichen")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.locales, args.repeat, not args.no_render)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment_info(), "results": results}, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        # Exit-Code 1, wenn eine Messung deutlich langsamer geworden ist
+        return 1 if compare(results, baseline) else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+import os
+import random
+
+# Beschriftungen von 'netsh wlan show networks mode=Bssid' je Sprache
+LABELS = {
+    "de": {
+        "interface": "Schnittstellenname",
+        "visible": "Momentan sind {count} Netzwerke sichtbar.",
+        "network_type": "Netzwerktyp",
+        "infrastructure": "Infrastruktur",
+        "auth": "Authentifizierung",
+        "encryption": "Verschlüsselung",
+        "signal": "Signal",
+        "radio_type": "Funktyp",
+        "channel": "Kanal",
+        "basic_rates": "Basisraten (MBit/s)",
+        "other_rates": "Andere Raten (MBit/s)",
+        "open": "Offen",
+        "none": "Keine",
+    },
+    "en": {
+        "interface": "Interface name",
+        "visible": "There are {count} networks currently visible.",
+        "network_type": "Network type",
+        "infrastructure": "Infrastructure",
+        "auth": "Authentication",
+        "encryption": "Encryption",
+        "signal": "Signal",
+        "radio_type": "Radio type",
+        "channel": "Channel",
+        "basic_rates": "Basic rates (Mbps)",
+        "other_rates": "Other rates (Mbps)",
+        "open": "Open",
+        "none": "None",
+    },
+}
+
+# Verteilung der Sicherheitseinstellungen (Authentifizierung, Verschlüsselung, Gewicht)
+SECURITY = [
+    ("WPA2-Personal", "CCMP", 60),
+    ("WPA3-Personal", "CCMP", 15),
+    ("open", "none", 15),
+    ("WPA2-Enterprise", "CCMP", 7),
+    ("WEP", "WEP", 3),
+]
+
+# Kanäle mit Gewicht: im 2,4-GHz-Band drängen sich die meisten Netze auf 1, 6 und 11
+CHANNELS = [(1, 20), (6, 25), (11, 20), (3, 2), (9, 2), (13, 1)] + [
+    (channel, 2) for channel in (36, 40, 44, 48, 52, 56, 60, 64, 100, 104, 108, 112, 116, 132, 136, 140, 149, 153, 157, 161)
+]
+
+RADIO_TYPES = ["802.11n", "802.11ac", "802.11ax", "802.11g"]
+
+SSID_WORDS = ["Home", "Cafe", "FRITZ!Box", "Vodafone", "Telekom", "Office", "Guest", "Hotel", "Bahn", "Uni", "Lab", "Wohnung"]
+
+def _ssid(rng, index):
+    roll = rng.random()
+    if roll < 0.05:
+        # Verstecktes Netzwerk
+        return ""
+    if roll < 0.10:
+        # SSIDs mit Doppelpunkt prüfen das Trennen am ersten ":"
+        return f"{rng.choice(SSID_WORDS)}:Gast {index}"
+    return f"{rng.choice(SSID_WORDS)}-{index:05d}"
+
+def _weighted(rng, choices):
+    return rng.choices([choice[:-1] for choice in choices], weights=[choice[-1] for choice in choices])[0]
+
+def generate_netsh_output(bssid_count, locale="de", seed=0, max_aps_per_network=4):
+    """Erzeugt eine realistische netsh-Ausgabe mit genau bssid_count Access Points."""
+    labels = LABELS[locale]
+    rng = random.Random(seed)
+    blocks = []
+    bssid_index = 0
+    while bssid_index < bssid_count:
+        ap_count = min(rng.randint(1, max_aps_per_network), bssid_count - bssid_index)
+        auth, encryption = _weighted(rng, SECURITY)
+        auth = labels.get(auth, auth)
+        encryption = labels.get(encryption, encryption)
+        network_index = len(blocks) + 1
+        lines = [
+            f"SSID {network_index} : {_ssid(rng, network_index)}",
+            f"    {labels['network_type']:<24}: {labels['infrastructure']}",
+            f"    {labels['auth']:<24}: {auth}",
+            f"    {labels['encryption']:<24}: {encryption}",
+        ]
+        for ap_number in range(1, ap_count + 1):
+            bssid = ":".join(f"{byte:02x}" for byte in (0x02, 0x00) + tuple(bssid_index.to_bytes(4, "big")))
+            bssid_index += 1
+            (channel,) = _weighted(rng, CHANNELS)
+            lines += [
+                f"    {'BSSID ' + str(ap_number):<24}: {bssid}",
+                f"         {labels['signal']:<19}: {rng.randint(1, 100)}%",
+                f"         {labels['radio_type']:<19}: {rng.choice(RADIO_TYPES)}",
+                f"         {labels['channel']:<19}: {channel}",
+                f"         {labels['basic_rates']:<19}: 1 2 5.5 11",
+                f"         {labels['other_rates']:<19}: 6 9 12 18 24 36 48 54",
+            ]
+        blocks.append("\n".join(lines))
+    header = f"\n{labels['interface']} : WLAN\n{labels['visible'].format(count=len(blocks))}\n\n"
+    return header + "\n\n".join(blocks) + "\n"
+
+def write_replay_directory(directory, bssid_count, locale="de", seed=0):
+    """Schreibt eine synthetische Aufzeichnung für das Replay-Backend (networks.txt)."""
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, "networks.txt"), "wb") as f:
+        f.write(generate_netsh_output(bssid_count, locale, seed).encode("cp850", errors="replace"))
@@ -1,7 +1,18 @@
-from PyQt6.QtWidgets import QMainWindow, QPushButton, QVBoxLayout, QWidget, QTableWidget, QTableWidgetItem, QHeaderView, QLabel, QInputDialog, QCheckBox, QGraphicsDropShadowEffect, QSpacerItem, QSizePolicy
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QKeySequence, QShortcut, QFont
-from network.scanner import scan_networks, get_connected_network_info, connect_to_network, test_packet_loss
+from PyQt6.QtWidgets import QMainWindow, QPushButton, QVBoxLayout, QWidget, QTableView, QAbstractItemView, QHeaderView, QLabel, QInputDialog, QCheckBox, QGraphicsDropShadowEffect, QSpacerItem, QSizePolicy, QProgressBar
+import time
+from PyQt6.QtCore import Qt, QThreadPool, QTimer
+from PyQt6.QtGui import QKeySequence, QShortcut
+from network.scanner import scan_cache, signal_series, connect_to_network, NetworkMonitor, DELTA_APPEARED, DELTA_DISAPPEARED, DELTA_SECURITY_CHANGED
+from network.models import parse_channel, parse_percent
+from network.interference import InterferenceMap, MAX_INTERFERENCE, channel_band
+from network.evaluation import AUTH_OPEN, classify_auth
+from gui.scan_worker import ScanWorker, MonitorSignals, TrendSignals, TrendWorker
+from network.diagnostics import NETWORKS, CONNECTED_INFO
+from gui.network_table_model import NetworkTableModel, NetworkSortProxyModel
+from gui.theme import ThemeEngine, DEFAULT_PALETTE
+from gui.recommendation_delegate import RecommendationDelegate
+from network.metrics import metrics
+from network.snapshot import load_snapshot, save_snapshot
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -10,44 +21,86 @@ class MainWindow(QMainWindow):
         self.setGeometry(100, 100, 800, 600)
         self.setMinimumSize(1000, 700)
 
-        self.base_font_size = 10
-        self.font_scale = 1.0
+        # Zoomstufe und Farbschema, das Stylesheet wird je Kombination einmal erzeugt
+        self.theme = ThemeEngine(self)
 
         # Farbenblindheits-Modus
-        self.recommended_color = Qt.GlobalColor.green
-        self.not_recommended_color = Qt.GlobalColor.red
         self.is_colorblind_mode = False
 
+        # Hintergrund-Scan
+        self.thread_pool = QThreadPool.globalInstance()
+        self.scan_worker = None
+        self.networks = None
+        # True, solange die Tabelle den gespeicherten Scan des letzten Starts zeigt
+        self.networks_stale = False
+        self.connected_info = None
+        self.packet_loss = None
+        self.packet_loss_error = None
+        self.scan_summary = None
+        self.streamed_rows = 0
+
+        # Überwachungsmodus (regelmäßige Scans, nur Änderungen werden übernommen)
+        self.monitor = None
+        self.monitor_interval = 15
+        self.monitor_signals = MonitorSignals()
+        self.monitor_signals.deltas_ready.connect(self.on_monitor_deltas)
+        self.monitor_signals.error.connect(self.on_monitor_error)
+
+        # Signalverlauf je SSID für die Details, im Thread-Pool gelesen und bis zum nächsten Scan behalten
+        self.trend_signals = TrendSignals()
+        self.trend_signals.trend_ready.connect(self.on_signal_trend)
+        self.signal_trends = {}
+        self.details_network = None
+
         # Zentrales Widget und Layout
         self.central_widget = QWidget(self)
+        self.central_widget.setObjectName("central_widget")
         self.setCentralWidget(self.central_widget)
         self.layout = QVBoxLayout(self.central_widget)
         self.layout.setSpacing(10)
 
         # Status-Label
         self.status_label = QLabel("Drücke 'Scannen', um verfügbare Netzwerke anzuzeigen.", self)
+        self.status_label.setObjectName("status_label")
         self.status_label.setAccessibleName("Status-Label")
         self.status_label.setAccessibleDescription("Zeigt den Status des Scans an.")
         self.layout.addWidget(self.status_label)
 
+        # Fortschrittsanzeige für den Scan
+        self.scan_progress = QProgressBar(self)
+        self.scan_progress.setAccessibleName("Scan-Fortschritt")
+        self.scan_progress.setAccessibleDescription("Zeigt an, welcher Schritt des Scans gerade ausgeführt wird.")
+        self.scan_progress.setRange(0, ScanWorker.STAGE_COUNT)
+        self.scan_progress.setFormat("%v von %m Schritten")
+        self.scan_progress.setVisible(False)
+        self.layout.addWidget(self.scan_progress)
+
         # Tabelle für Ergebnisse
-        self.result_table = QTableWidget(self)
+        self.network_model = NetworkTableModel(self)
+        self.proxy_model = NetworkSortProxyModel(self)
+        self.proxy_model.setSourceModel(self.network_model)
+        self.result_table = QTableView(self)
+        self.result_table.setObjectName("result_table")
+        self.result_table.setModel(self.proxy_model)
         self.result_table.setTabKeyNavigation(False)
         self.result_table.setAccessibleName("Ergebnis-Tabelle")
         self.result_table.setAccessibleDescription("Zeigt eine Liste der gescannten WLAN-Netzwerke mit Empfehlungen an.")
-        self.result_table.setRowCount(0)
-        self.result_table.setColumnCount(4)
-        self.result_table.setHorizontalHeaderLabels(["SSID", "Signal", "Sicherheit", "Empfehlung"])
         self.result_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.result_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.result_table.verticalHeader().setVisible(False)
+        self.result_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.result_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         #self.result_table.setAlternatingRowColors(True)
         self.result_table.setSortingEnabled(True)
-        self.result_table.itemClicked.connect(self.show_details)
+        # Farben der Empfehlungsspalte zeichnet der Delegate, die Zeilen enthalten nur den Zustand
+        self.recommendation_delegate = RecommendationDelegate(self.result_table)
+        self.result_table.setItemDelegateForColumn(NetworkTableModel.RECOMMENDATION_COLUMN, self.recommendation_delegate)
+        self.result_table.clicked.connect(self.show_details)
         self.result_table.keyPressEvent = self.table_key_press_event
         self.layout.addWidget(self.result_table)
 
         # Details-Label
         self.details_label = QLabel("Wähle ein Netzwerk aus, um Details anzuzeigen.", self)
+        self.details_label.setObjectName("details_label")
         self.details_label.setAccessibleName("Details-Label")
         self.details_label.setAccessibleDescription("Zeigt detaillierte Informationen über das ausgewählte Netzwerk an.")
         self.details_label.setWordWrap(True)
@@ -56,6 +109,7 @@ class MainWindow(QMainWindow):
 
         # Verbundenes Netzwerk Label
         self.connected_label = QLabel("Informationen über das verbundene Netzwerk werden nach dem Scan angezeigt.", self)
+        self.connected_label.setObjectName("connected_label")
         self.connected_label.setAccessibleName("Verbundenes-Netzwerk-Label")
         self.connected_label.setAccessibleDescription("Zeigt Informationen über das aktuell verbundene WLAN-Netzwerk an.")
         self.connected_label.setFocusPolicy(Qt.FocusPolicy.TabFocus)
@@ -69,12 +123,20 @@ class MainWindow(QMainWindow):
         self.colorblind_checkbox.stateChanged.connect(self.toggle_colorblind_mode)
         self.layout.addWidget(self.colorblind_checkbox)
 
+        # Überwachungs-Checkbox
+        self.monitor_checkbox = QCheckBox(f"Überwachung aktivieren (alle {self.monitor_interval} Sekunden scannen)", self)
+        self.monitor_checkbox.setAccessibleName("Überwachungs-Checkbox")
+        self.monitor_checkbox.setAccessibleDescription("Scannt regelmäßig und meldet neue, verschwundene und veränderte Netzwerke.")
+        self.monitor_checkbox.stateChanged.connect(self.toggle_monitoring)
+        self.layout.addWidget(self.monitor_checkbox)
+
         # Button-Layout
         self.button_layout = QVBoxLayout()
         self.button_layout.setSpacing(5)
 
         # Scan-Button
         self.scan_button = QPushButton("Netzwerke scannen", self)
+        self.scan_button.setObjectName("scan_button")
         self.scan_button.setAccessibleName("Scan-Button")
         self.scan_button.setAccessibleDescription("Startet das Scannen verfügbarer WLAN-Netzwerke.")
         self.scan_button.clicked.connect(self.scan_networks)
@@ -88,8 +150,17 @@ class MainWindow(QMainWindow):
         self.scan_button.setGraphicsEffect(scan_shadow)
         self.button_layout.addWidget(self.scan_button, alignment=Qt.AlignmentFlag.AlignCenter)
 
+        # Abbrechen-Button (nur während eines Scans sichtbar)
+        self.cancel_button = QPushButton("Scan abbrechen", self)
+        self.cancel_button.setAccessibleName("Abbrechen-Button")
+        self.cancel_button.setAccessibleDescription("Bricht den laufenden Scan ab.")
+        self.cancel_button.clicked.connect(self.cancel_scan)
+        self.cancel_button.setVisible(False)
+        self.button_layout.addWidget(self.cancel_button, alignment=Qt.AlignmentFlag.AlignCenter)
+
         # Connect-Button
         self.connect_button = QPushButton("Mit ausgewähltem Netzwerk verbinden", self)
+        self.connect_button.setObjectName("connect_button")
         self.connect_button.setAccessibleName("Connect-Button")
         self.connect_button.setAccessibleDescription("Verbindet mit dem ausgewähltem WLAN-Netzwerk, falls empfohlen.")
         self.connect_button.clicked.connect(self.connect_to_selected_network)
@@ -109,8 +180,10 @@ class MainWindow(QMainWindow):
         self.setTabOrder(self.result_table, self.details_label)
         self.setTabOrder(self.details_label, self.connected_label)
         self.setTabOrder(self.connected_label, self.colorblind_checkbox)
-        self.setTabOrder(self.colorblind_checkbox, self.scan_button)
-        self.setTabOrder(self.scan_button, self.connect_button)
+        self.setTabOrder(self.colorblind_checkbox, self.monitor_checkbox)
+        self.setTabOrder(self.monitor_checkbox, self.scan_button)
+        self.setTabOrder(self.scan_button, self.cancel_button)
+        self.setTabOrder(self.cancel_button, self.connect_button)
         self.setTabOrder(self.connect_button, self.result_table)
 
         self.scan_button.setFocus()
@@ -119,284 +192,474 @@ class MainWindow(QMainWindow):
         self.scan_shortcut = QShortcut(QKeySequence("Ctrl+S"), self)
         self.scan_shortcut.activated.connect(self.scan_networks)
 
+        # Tastenkürzel zum Abbrechen des Scans (Esc)
+        self.cancel_shortcut = QShortcut(QKeySequence("Esc"), self)
+        self.cancel_shortcut.activated.connect(self.cancel_scan)
+
         # Tastenkürzel für Zoom (Ctrl+ und Ctrl-)
         self.zoom_in_shortcut = QShortcut(QKeySequence("Ctrl++"), self)
         self.zoom_in_shortcut.activated.connect(self.zoom_in)
         self.zoom_out_shortcut = QShortcut(QKeySequence("Ctrl+-"), self)
         self.zoom_out_shortcut.activated.connect(self.zoom_out)
 
+        # Tastenkürzel für hohen Kontrast (Ctrl+Shift+H)
+        self.contrast_shortcut = QShortcut(QKeySequence("Ctrl+Shift+H"), self)
+        self.contrast_shortcut.activated.connect(self.toggle_high_contrast)
+
+        # Entwickler-Panel mit Laufzeiten der Verarbeitungsschritte (Ctrl+Shift+M),
+        # wird erst beim ersten Öffnen erzeugt
+        self.metrics_panel = None
+        self.metrics_shortcut = QShortcut(QKeySequence("Ctrl+Shift+M"), self)
+        self.metrics_shortcut.activated.connect(self.toggle_metrics_panel)
+        if metrics.enabled:
+            self.toggle_metrics_panel()
+
         self.update_font_size()
 
     def update_font_size(self):
-        """Aktualisiert die Schriftgröße aller UI-Elemente basierend auf dem Skalierungsfaktor."""
-        scaled_size = int(self.base_font_size * self.font_scale)
-        
-        # Font-Objekt erstellen
-        font = QFont("Arial", scaled_size)
-        
-        # Schriftgröße für alle Widgets setzen
-        self.status_label.setFont(font)
-        self.result_table.setFont(font)
-        self.result_table.horizontalHeader().setFont(font)
-        self.details_label.setFont(font)
-        self.connected_label.setFont(font)
-        self.colorblind_checkbox.setFont(font)
-        self.scan_button.setFont(font)
-        self.connect_button.setFont(font)
-
-        self.status_label.setStyleSheet(f"font-size: {scaled_size}pt; color: #000000; padding: 5px;")
-        self.result_table.setStyleSheet(f"""
-            QTableWidget {{
-                font-size: {scaled_size}pt;
-                color: #000000;
-                background-color: #FFFFFF;
-                border: 1px solid #CCCCCC;
-                gridline-color: #CCCCCC;
-            }}
-            QTableWidget::item {{
-                padding: 5px;
-            }}
-            QHeaderView::section {{
-                background-color: #4A90E2;
-                color: #000000;
-                padding: 5px;
-                border: 1px solid #CCCCCC;
-                font-size: {scaled_size}pt;
-            }}
-            QTableWidget::item:alternate {{
-                background-color: #F5F5F5;
-            }}
-        """)
-
-        self.details_label.setStyleSheet(f"""
-            QLabel {{
-                font-size: {scaled_size}pt;
-                color: #333333;
-                padding: 5px;
-                border: 1px solid #CCCCCC;
-                background-color: #F0F0F0;
-            }}
-            QLabel:focus {{
-                border: 2px solid #003087;
-                background-color: #E0E0FF;
-            }}
-        """)
-        self.connected_label.setStyleSheet(f"""
-            QLabel {{
-                font-size: {scaled_size}pt;
-                color: #333333;
-                padding: 5px;
-                border: 1px solid #CCCCCC;
-                background-color: #F0F0F0;
-            }}
-            QLabel:focus {{
-                border: 2px solid #003087;
-                background-color: #E0E0FF;
-            }}
-        """)
-        self.scan_button.setStyleSheet(f"""
-            QPushButton {{
-                font-size: {scaled_size}pt;
-                color: #000000;
-                background-color: #299FFF;
-                padding: 8px;
-                border-radius: 5px;
-                border: none;
-            }}
-            QPushButton:hover {{
-                background-color: #005BB5;
-            }}
-            QPushButton:focus {{
-                border: 2px solid #003087;
-            }}
-        """)
-        self.connect_button.setStyleSheet(f"""
-            QPushButton {{
-                font-size: {scaled_size}pt;
-                color: #000000;
-                background-color: #28A745;
-                padding: 8px;
-                border-radius: 5px;
-                border: none;
-            }}
-            QPushButton:hover {{
-                background-color: #218838;
-            }}
-            QPushButton:focus {{
-                border: 2px solid #1C6D2F;
-            }}
-        """)
-        button_min_width = int(200 * self.font_scale)
-        button_connect_min_width = int(260 * self.font_scale)
-        button_min_height = int(40 * self.font_scale)
+        """Wendet Zoomstufe und Farbschema an, das Stylesheet kommt aus dem Cache von gui.theme."""
+        self.theme.apply()
+        button_min_width = int(200 * self.theme.scale)
+        button_connect_min_width = int(260 * self.theme.scale)
+        button_min_height = int(40 * self.theme.scale)
         self.scan_button.setMinimumSize(button_min_width, button_min_height)
+        self.cancel_button.setMinimumSize(button_min_width, button_min_height)
         self.connect_button.setMinimumSize(button_connect_min_width, button_min_height)
 
     def zoom_in(self):
         """Erhöht die Schriftgröße um 10%, maximal bis 200%."""
-        if self.font_scale < 2.0:
-            self.font_scale += 0.1
+        if self.theme.zoom(1):
             self.update_font_size()
-            self.status_label.setText(f"Zoom: {int(self.font_scale * 100)}%")
+            self.status_label.setText(f"Zoom: {round(self.theme.scale * 100)}%")
 
     def zoom_out(self):
         """Verkleinert die Schriftgröße um 10%, minimal bis 50%."""
-        if self.font_scale > 0.5:
-            self.font_scale -= 0.1
+        if self.theme.zoom(-1):
             self.update_font_size()
-            self.status_label.setText(f"Zoom: {int(self.font_scale * 100)}%")
+            self.status_label.setText(f"Zoom: {round(self.theme.scale * 100)}%")
+
+    def toggle_high_contrast(self):
+        high_contrast = self.theme.palette != "high_contrast"
+        self.theme.set_palette("high_contrast" if high_contrast else DEFAULT_PALETTE)
+        self.status_label.setText(f"Hoher Kontrast {'aktiviert' if high_contrast else 'deaktiviert'}.")
 
     def toggle_colorblind_mode(self, state):
         self.is_colorblind_mode = (state == Qt.CheckState.Checked.value)
         if self.is_colorblind_mode:
-            self.recommended_color = Qt.GlobalColor.cyan
-            self.not_recommended_color = Qt.GlobalColor.yellow
-            self.status_label.setText("Farbenblindheits-Modus aktiviert: Empfohlene Netzwerke sind jetzt blau, nicht empfohlene gelb.")
+            self.status_label.setText("Farbenblindheits-Modus aktiviert: Empfohlene Netzwerke sind jetzt blau, nicht empfohlene gelb und schraffiert.")
         else:
-            self.recommended_color = Qt.GlobalColor.green
-            self.not_recommended_color = Qt.GlobalColor.red
             self.status_label.setText("Farbenblindheits-Modus deaktiviert: Empfohlene Netzwerke sind jetzt grün, nicht empfohlene rot.")
         # Tabelle aktualisieren, um die neuen Farben anzuzeigen
         self.update_table_colors()
 
     def update_table_colors(self):
-        # Tabelle aktualisieren, um die Farben der Empfehlungsspalte zu setzen
-        for row in range(self.result_table.rowCount()):
-            recommendation = self.result_table.item(row, 3).text() if self.result_table.item(row, 3) else ""
-            recommendation_item = QTableWidgetItem(recommendation)
-            if recommendation == "Empfohlen":
-                recommendation_item.setBackground(self.recommended_color)
-            else:
-                recommendation_item.setBackground(self.not_recommended_color)
-            self.result_table.setItem(row, 3, recommendation_item)
+        # Nur den sichtbaren Bereich neu zeichnen, unabhängig von der Zahl der Zeilen
+        with metrics.span("gui.recolor"):
+            self.recommendation_delegate.set_palette("colorblind" if self.is_colorblind_mode else "standard")
+            self.result_table.viewport().update()
+
+    def toggle_metrics_panel(self):
+        if self.metrics_panel is None:
+            from gui.metrics_panel import MetricsPanel
+            self.metrics_panel = MetricsPanel(self)
+            self.metrics_panel.setVisible(False)
+            self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.metrics_panel)
+        self.metrics_panel.setVisible(not self.metrics_panel.isVisible())
+
+    def selected_network(self):
+        """Liefert das Netzwerk der aktuellen Tabellenzeile oder None."""
+        index = self.result_table.currentIndex()
+        if not index.isValid():
+            return None
+        return self.proxy_model.data(index, NetworkTableModel.NetworkRole)
 
     def table_key_press_event(self, event):
         """Überschreibt Tastaturevents für die Tabelle."""
-        current_row = self.result_table.currentRow()
-        if current_row >= 0:
+        net = self.selected_network()
+        if net is not None:
             if event.key() == Qt.Key.Key_Enter or event.key() == Qt.Key.Key_Return:
-                recommendation = self.result_table.item(current_row, 3).text()
-                if recommendation == "Empfohlen":
+                if net.recommendation == "Empfohlen":
                     self.connect_to_selected_network()
             elif event.key() == Qt.Key.Key_Space:
-                item = self.result_table.item(current_row, 0)
-                if item:
-                    self.show_details(item)
-        QTableWidget.keyPressEvent(self.result_table, event)
+                self.show_details(self.result_table.currentIndex())
+        QTableView.keyPressEvent(self.result_table, event)
 
     def scan_networks(self):
-        try:
-            # Verfügbare Netzwerke scannen
-            networks = scan_networks()
-            if networks:
-                self.result_table.setRowCount(0)
-                # Tabelle füllen
-                for row, net in enumerate(networks):
-                    self.result_table.insertRow(row)
-                    self.result_table.setItem(row, 0, QTableWidgetItem(net.get("ssid", "Unbekannt")))
-                    signal_item = QTableWidgetItem(net.get("signal", "Unbekannt"))
-                    signal_value = int(net.get("signal", "0").replace("%", "")) if net.get("signal", "Unbekannt") != "Unbekannt" else 0
-                    signal_item.setData(Qt.ItemDataRole.UserRole, signal_value)
-                    self.result_table.setItem(row, 1, signal_item)
-                    self.result_table.setItem(row, 2, QTableWidgetItem(net.get("security", "Unbekannt")))
-                    recommendation_item = QTableWidgetItem(net.get("recommendation", "Unbekannt"))
-                    if net.get("recommendation") == "Empfohlen":
-                        recommendation_item.setBackground(self.recommended_color)
-                    else:
-                        recommendation_item.setBackground(self.not_recommended_color)
-                    self.result_table.setItem(row, 3, recommendation_item)
-                self.status_label.setText(f"Scan abgeschlossen, {len(networks)} Netzwerke gefunden.")
+        """Startet den Scan im Hintergrund, solange nicht bereits ein Scan läuft."""
+        if self.scan_worker is not None:
+            self.status_label.setText("Es läuft bereits ein Scan. Bitte warten oder mit Esc abbrechen.")
+            return
+
+        worker = ScanWorker()
+        worker.signals.progress.connect(self.on_scan_progress)
+        worker.signals.network_found.connect(self.on_network_found)
+        worker.signals.networks_ready.connect(self.on_networks_ready)
+        worker.signals.connected_info_ready.connect(self.on_connected_info_ready)
+        worker.signals.packet_loss_ready.connect(self.on_packet_loss_ready)
+        worker.signals.error.connect(self.on_scan_error)
+        worker.signals.finished.connect(self.on_scan_finished)
+        self.scan_worker = worker
+        self.scan_summary = None
+        self.streamed_rows = 0
+        self.connected_info = None
+        self.packet_loss = None
+        self.packet_loss_error = None
+
+        self.scan_progress.setValue(0)
+        self.scan_progress.setVisible(True)
+        self.cancel_button.setVisible(True)
+        self.thread_pool.start(worker)
+
+    def cancel_scan(self):
+        """Bricht den laufenden Scan ab."""
+        if self.scan_worker is None or self.scan_worker.is_cancelled():
+            return
+        self.scan_worker.cancel()
+        self.status_label.setText("Scan wird abgebrochen …")
+
+    def _is_current_scan(self):
+        # Ergebnisse eines abgebrochenen Scans werden verworfen
+        return self.scan_worker is not None and not self.scan_worker.is_cancelled()
+
+    def on_scan_progress(self, completed, total, text):
+        if not self._is_current_scan():
+            return
+        self.scan_progress.setValue(completed)
+        if completed < total:
+            self.status_label.setText(f"{completed} von {total} Prüfungen abgeschlossen ({text}) …")
+
+    def on_network_found(self, net):
+        # Neue Netzwerke schon während des Scans anzeigen, die Bewertung folgt danach
+        if not self._is_current_scan():
+            return
+        self.network_model.add_network(net)
+        self.streamed_rows += 1
+        metrics.count("gui.rows_streamed")
+        self.status_label.setText(f"{self.streamed_rows} Netzwerke gefunden, Scan läuft …")
+
+    def on_networks_ready(self, networks):
+        if not self._is_current_scan():
+            return
+        self.networks = networks
+        self.networks_stale = False
+        self.signal_trends.clear()
+        self.streamed_rows = 0
+        self.populate_table(networks)
+        self.save_snapshot()
+        if self.connected_info:
+            # Interferenz des verbundenen Netzwerks hängt von den gescannten Netzwerken ab
+            self.update_connected_label()
+
+    def warm_start(self):
+        """Zeigt den gespeicherten Scan sofort an, der neue Scan startet nach dem ersten Bild."""
+        if self.show_snapshot():
+            QTimer.singleShot(0, self.scan_networks)
+
+    def show_snapshot(self):
+        """Zeigt den beim letzten Mal gespeicherten Scan als veraltet an, False wenn keiner vorliegt."""
+        snapshot = load_snapshot()
+        if snapshot is None or not snapshot.networks:
+            return False
+        self.networks = snapshot.networks
+        self.networks_stale = True
+        self.populate_table(snapshot.networks, snapshot_time=snapshot.timestamp)
+        return True
+
+    def save_snapshot(self):
+        # Nur frische Ergebnisse speichern, der Warmstart soll nicht den alten Stand konservieren
+        if self.networks and not self.networks_stale:
+            try:
+                save_snapshot(self.networks)
+            except OSError:
+                pass  # Ohne gespeicherten Scan startet das Programm nur ohne Warmstart
+
+    def populate_table(self, networks, snapshot_time=None):
+        """Übernimmt die gescannten Netzwerke als Diff in die Ergebnistabelle.
+
+        Mit snapshot_time stammen die Netzwerke aus einem gespeicherten Scan und
+        werden als veraltet gekennzeichnet.
+        """
+        was_empty = self.network_model.rowCount() == 0
+        with metrics.span("gui.populate_table"):
+            self.network_model.set_networks(networks, stale=snapshot_time is not None)
+        if networks and snapshot_time is not None:
+            taken = time.strftime("%d.%m. %H:%M", time.localtime(snapshot_time))
+            self.scan_summary = f"Letzter Scan vom {taken} (veraltet), {len(networks)} Netzwerke. Ein neuer Scan wird gestartet …"
+            self.status_label.setText(self.scan_summary)
+            self.result_table.setAccessibleDescription(f"Zeigt die Netzwerke des letzten Scans vom {taken} an, die Angaben sind veraltet.")
+            self.connect_button.setVisible(True)
+            if self.button_layout.indexOf(self.button_spacer) >= 0:
+                self.button_layout.removeItem(self.button_spacer)
+                self.button_layout.addWidget(self.connect_button, alignment=Qt.AlignmentFlag.AlignCenter)
+        elif networks:
+            self.scan_summary = f"Scan abgeschlossen, {len(networks)} Netzwerke gefunden."
+            self.status_label.setText(self.scan_summary)
+            self.result_table.setAccessibleDescription("Zeigt eine Liste der gescannten WLAN-Netzwerke mit Empfehlungen an.")
+            if was_empty:
+                # Nur beim ersten Ergebnis fokussieren, sonst bleibt der Fokus, wo er ist
                 self.result_table.setFocus()
-                # Connect-Button sichtbar machen, nachdem Netzwerke gescannt wurden
+            # Connect-Button sichtbar machen, nachdem Netzwerke gescannt wurden
+            if self.button_layout.indexOf(self.button_spacer) >= 0:
                 self.button_layout.removeItem(self.button_spacer)  # Spacer entfernen
                 self.button_layout.addWidget(self.connect_button, alignment=Qt.AlignmentFlag.AlignCenter)  # Button zentriert hinzufügen
-                self.connect_button.setVisible(True)
-            else:
-                self.result_table.setRowCount(0)
-                self.status_label.setText("Keine Netzwerke gefunden.")
-                self.result_table.setAccessibleDescription("Keine Netzwerke gefunden.")
-                # Connect-Button unsichtbar lassen, wenn keine Netzwerke gefunden wurden
-                self.connect_button.setVisible(False)
-                # Spacer wieder hinzufügen, wenn der Button unsichtbar ist
-                if not self.button_layout.indexOf(self.button_spacer) >= 0:
-                    self.button_layout.addItem(self.button_spacer)
-
-            # Informationen über das verbundene Netzwerk abrufen
-            connected_info = get_connected_network_info()
-            if connected_info:
-                ssid = connected_info.get("ssid", "Unbekannt")
-                signal = connected_info.get("signal", "Unbekannt")
-                receive_rate = connected_info.get("receive_rate", "Unbekannt")
-                transmit_rate = connected_info.get("transmit_rate", "Unbekannt")
-                channel = connected_info.get("channel", "Unbekannt")
-                # Interferenz prüfen
-                channel_usage = sum(1 for net in networks if net.get("channel") == channel) if networks else 0
-                interference_risk = "Hoch" if channel_usage > 3 else "Niedrig"
-                # Paketverlust-Test
-                packet_loss = test_packet_loss()
-                stability = "Stabil" if packet_loss < 10 else "Instabil"
-                self.connected_label.setText(
-                    f"Verbundenes Netzwerk: {ssid}\n"
-                    f"Signal: {signal}\n"
-                    f"Empfangsrate: {receive_rate} MBit/s\n"
-                    f"Übertragungsrate: {transmit_rate} MBit/s\n"
-                    f"Kanal: {channel} (Interferenzrisiko: {interference_risk})\n"
-                    f"Paketverlust: {packet_loss}% (Verbindung: {stability})"
-                )
-            else:
-                self.connected_label.setText("Nicht mit einem WLAN-Netzwerk verbunden.")
-        except Exception as e:
-            self.result_table.setRowCount(0)
-            self.status_label.setText(f"Fehler beim Scannen: {str(e)}")
-            self.result_table.setAccessibleDescription(f"Fehler beim Scannen: {str(e)}")
-            # Connect-Button unsichtbar lassen, wenn ein Fehler auftritt
+            self.connect_button.setVisible(True)
+        else:
+            self.scan_summary = "Keine Netzwerke gefunden."
+            self.status_label.setText(self.scan_summary)
+            self.result_table.setAccessibleDescription("Keine Netzwerke gefunden.")
+            # Connect-Button unsichtbar lassen, wenn keine Netzwerke gefunden wurden
             self.connect_button.setVisible(False)
             # Spacer wieder hinzufügen, wenn der Button unsichtbar ist
             if not self.button_layout.indexOf(self.button_spacer) >= 0:
                 self.button_layout.addItem(self.button_spacer)
 
-    def show_details(self, item):
-        row = item.row()
-        ssid = self.result_table.item(row, 0).text()
-        # Finde das Netzwerk in den gescannten Daten
-        networks = scan_networks()
-        if networks:
-            for net in networks:
-                if net.get("ssid") == ssid:
-                    self.details_label.setText(
-                        f"Details für {ssid}:\n"
-                        f"Authentifizierung: {net.get('auth', 'Unbekannt')}\n"
-                        f"Verschlüsselung: {net.get('encryption', 'Unbekannt')}\n"
-                        f"Kanal: {net.get('channel', 'Unbekannt')}\n"
-                        f"Funktyp: {net.get('funktyp', 'Unbekannt')}\n"
-                        f"BSSID: {net.get('bssid', 'Unbekannt')}\n"
-                        f"Empfehlungsgrund: {net.get('recommendation_reason', 'Unbekannt')}"
-                    )
-                    break
+    def on_connected_info_ready(self, connected_info):
+        if not self._is_current_scan():
+            return
+        self.connected_info = connected_info
+        if connected_info:
+            self.update_connected_label()
+        else:
+            self.connected_label.setText("Nicht mit einem WLAN-Netzwerk verbunden.")
+
+    def on_packet_loss_ready(self, packet_loss):
+        # Die Latenzmessung kann vor den Verbindungsinformationen fertig sein
+        if not self._is_current_scan():
+            return
+        self.packet_loss = packet_loss
+        if self.connected_info:
+            self.update_connected_label()
+
+    def update_connected_label(self):
+        """Zeigt die Informationen über das verbundene Netzwerk an."""
+        networks = self.networks
+        ssid = self.connected_info.get("ssid", "Unbekannt")
+        signal = self.connected_info.get("signal", "Unbekannt")
+        receive_rate = self.connected_info.get("receive_rate", "Unbekannt")
+        transmit_rate = self.connected_info.get("transmit_rate", "Unbekannt")
+        channel = self.connected_info.get("channel", "Unbekannt")
+        interface = self.connected_info.get("interface")
+        interference_text = self.interference_text(networks, parse_channel(channel), parse_percent(signal),
+                                                   self.connected_info.get("band"))
+        # Paketverlust
+        if self.packet_loss is not None:
+            loss = round(self.packet_loss.loss_percent)
+            stability = "Stabil" if loss < 10 else "Instabil"
+            packet_loss_text = f"{loss}% (Verbindung: {stability})"
+            if self.packet_loss.rtt_p50 is not None:
+                latency_text = f"{self.packet_loss.rtt_p50 * 1000:.0f} ms (Jitter: {self.packet_loss.jitter * 1000:.0f} ms)"
+            else:
+                latency_text = "keine Antwort"
+        elif self.packet_loss_error is not None:
+            packet_loss_text = f"nicht messbar ({self.packet_loss_error})"
+            latency_text = "nicht messbar"
+        else:
+            packet_loss_text = "wird gemessen …"
+            latency_text = "wird gemessen …"
+        self.connected_label.setText(
+            f"Verbundenes Netzwerk: {ssid}{f' (über {interface})' if interface else ''}\n"
+            f"Signal: {signal}\n"
+            f"Empfangsrate: {receive_rate} MBit/s\n"
+            f"Übertragungsrate: {transmit_rate} MBit/s\n"
+            f"Kanal: {channel} ({interference_text})\n"
+            f"Paketverlust: {packet_loss_text}\n"
+            f"Latenz: {latency_text}"
+        )
+
+    def interference_text(self, networks, channel, signal, band=None):
+        # Interferenz durch die übrigen Access Points auf dem Kanal und den Nachbarkanälen
+        band = channel_band(channel, band)
+        if not networks or band is None:
+            return "Interferenzrisiko: Unbekannt"
+        interference_map = InterferenceMap.from_networks(networks)
+        score = interference_map.score(channel, signal, band)
+        text = f"Interferenzrisiko: {'Hoch' if score > MAX_INTERFERENCE else 'Niedrig'}, Störgrad {score:.1f}"
+        best = interference_map.best_channel(band)
+        # Nur vorschlagen, wenn der Kanal spürbar weniger gestört wäre
+        if best != channel and interference_map.channel_score(best, band) < score:
+            text = f"{text}, besser: Kanal {best}"
+        return text
+
+    def on_scan_error(self, name, message):
+        # Eine fehlgeschlagene Prüfung beeinflusst die Ergebnisse der anderen nicht
+        if not self._is_current_scan():
+            return
+        if name == CONNECTED_INFO:
+            self.connected_label.setText(f"Fehler beim Abrufen der Verbindungsinformationen: {message}")
+            return
+        if name != NETWORKS:
+            self.packet_loss_error = message
+            if self.connected_info:
+                self.update_connected_label()
+            return
+        self.networks = None
+        self.networks_stale = False
+        self.network_model.set_networks([])
+        self.scan_summary = f"Fehler beim Scannen: {message}"
+        self.status_label.setText(self.scan_summary)
+        self.result_table.setAccessibleDescription(f"Fehler beim Scannen: {message}")
+        # Connect-Button unsichtbar lassen, wenn ein Fehler auftritt
+        self.connect_button.setVisible(False)
+        # Spacer wieder hinzufügen, wenn der Button unsichtbar ist
+        if not self.button_layout.indexOf(self.button_spacer) >= 0:
+            self.button_layout.addItem(self.button_spacer)
+
+    def on_scan_finished(self):
+        worker = self.scan_worker
+        self.scan_worker = None
+        self.scan_progress.setVisible(False)
+        self.cancel_button.setVisible(False)
+        if self.streamed_rows:
+            # Unbewertete Zeilen eines abgebrochenen Scans entfernen, der letzte Stand bleibt
+            self.network_model.set_networks(self.networks or [], stale=self.networks_stale)
+            self.streamed_rows = 0
+        if worker is not None and worker.is_cancelled():
+            self.status_label.setText("Scan abgebrochen.")
+        elif self.scan_summary:
+            self.status_label.setText(self.scan_summary)
+
+    def toggle_monitoring(self, state):
+        if state == Qt.CheckState.Checked.value:
+            self.monitor = NetworkMonitor(
+                interval=self.monitor_interval,
+                on_deltas=self.monitor_signals.deltas_ready.emit,
+                on_error=self.monitor_signals.error.emit,
+                baseline=self.networks,
+            )
+            self.monitor.start()
+            self.status_label.setText("Überwachung aktiviert.")
+        elif self.monitor is not None:
+            self.monitor.stop(timeout=2)
+            self.monitor = None
+            self.status_label.setText("Überwachung deaktiviert.")
+
+    def on_monitor_deltas(self, deltas, networks):
+        """Übernimmt nur die geänderten Netzwerke aus der Überwachung in die Tabelle."""
+        if self.monitor is None:
+            return
+        self.networks = networks
+        self.signal_trends.clear()
+        if self.networks_stale:
+            # Der gespeicherte Scan wird durch den ersten Überwachungsscan vollständig ersetzt
+            self.networks_stale = False
+            self.populate_table(networks)
+            return
+        updated = {}
+        removed = []
+        moved = []
+        network_key = self.network_model.network_key
+        for delta in deltas:
+            if delta.network is not None:
+                updated[id(delta.network)] = delta.network
+                if delta.kind == DELTA_SECURITY_CHANGED and network_key(delta.old.network) != network_key(delta.network):
+                    moved.append(delta.old.network)
+            else:
+                removed.append(delta.old.network)
+        if moved:
+            # Mit anderer Sicherheit gehört der Access Point zu einer anderen Zeile; die alte
+            # verschwindet nur, wenn das Netzwerk nicht über weitere Access Points sichtbar bleibt
+            current_keys = {network_key(net) for net in networks}
+            removed.extend(net for net in moved if network_key(net) not in current_keys)
+        with metrics.span("gui.monitor_deltas"):
+            self.network_model.update_networks(list(updated.values()), removed)
+
+        # Kurze Meldung für Screenreader, Sicherheitsverschlechterungen zuerst
+        downgraded = {delta.new.ssid for delta in deltas
+                      if delta.kind == DELTA_SECURITY_CHANGED and classify_auth(delta.new.auth) == AUTH_OPEN
+                      and classify_auth(delta.old.auth) != AUTH_OPEN}
+        appeared = sum(1 for delta in deltas if delta.kind == DELTA_APPEARED)
+        disappeared = sum(1 for delta in deltas if delta.kind == DELTA_DISAPPEARED)
+        changed = len(deltas) - appeared - disappeared
+        message = f"Überwachung: {appeared} neu, {disappeared} verschwunden, {changed} verändert."
+        if downgraded:
+            message = f"Warnung: {', '.join(sorted(downgraded))} ist jetzt unverschlüsselt (offen). " + message
+        self.status_label.setText(message)
+
+    def on_monitor_error(self, message):
+        self.status_label.setText(f"Fehler bei der Überwachung: {message}")
+
+    def closeEvent(self, event):
+        # Laufenden Scan beim Schließen abbrechen, damit kein Prozess weiterläuft
+        if self.scan_worker is not None:
+            self.scan_worker.cancel()
+        if self.monitor is not None:
+            self.monitor.stop(timeout=2)
+        self.thread_pool.waitForDone(2000)
+        # Letzten Stand (auch aus der Überwachung) für den Warmstart beim nächsten Mal speichern
+        self.save_snapshot()
+        super().closeEvent(event)
+
+    def show_details(self, index):
+        if not index.isValid():
+            return
+        net = self.proxy_model.data(index, NetworkTableModel.NetworkRole)
+        self.details_network = net
+        trend = self.signal_trends.get(net.ssid)
+        if trend is None:
+            # Verlauf im Hintergrund lesen, die Details erscheinen sofort und werden danach ergänzt
+            self.signal_trends[net.ssid] = ""
+            self.thread_pool.start(TrendWorker(net.ssid, self.trend_signals))
+        self.details_label.setText(self.details_text(net, trend or ""))
+
+    def details_text(self, net, trend):
+        return (
+            f"Details für {net.ssid}:\n"
+            f"Authentifizierung: {net.auth or 'Unbekannt'}\n"
+            f"Verschlüsselung: {net.encryption or 'Unbekannt'}\n"
+            f"Kanal: {net.channel_text} (Störgrad inkl. Nachbarkanälen: {net.interference:.1f})\n"
+            f"Funktyp: {net.radio_type or 'Unbekannt'}\n"
+            f"BSSID: {net.bssid or 'Unbekannt'}\n"
+            f"Access Points: {net.ap_count} (Kanäle: {', '.join(map(str, net.channels)) or 'Unbekannt'})\n"
+            f"{self.adapter_text(net)}"
+            f"Empfehlungsgrund: {net.recommendation_reason}"
+            f"{self.smoothed_signal_text(net)}"
+            f"{trend}"
+        )
+
+    def adapter_text(self, net):
+        # Nur bei mehreren Adaptern bekannt: welcher Adapter welche Access Points am besten empfängt
+        adapters = sorted({ap.interface for ap in net.access_points if ap.interface})
+        if not adapters:
+            return ""
+        return f"Bester Empfang über: {net.interface or 'Unbekannt'} (Adapter: {', '.join(adapters)})\n"
+
+    def smoothed_signal_text(self, net):
+        # Grundlage der Empfehlung: geglättetes Signal der letzten Scans statt des einzelnen Messwerts
+        statistics = signal_series.statistics(net.bssid)
+        if statistics is None or statistics.count < 2:
+            return ""
+        return (f"\nSignal geglättet: {statistics.ewma:.0f}% aus {statistics.count} Scans "
+                f"({statistics.minimum}% bis {statistics.maximum}%, Streuung ±{statistics.variance ** 0.5:.0f})")
+
+    def on_signal_trend(self, ssid, signals):
+        # Signalverlauf der letzten Stunde aus dem Scan-Verlauf, ohne neuen Scan
+        trend = ""
+        if signals:
+            trend = f"\nSignal in der letzten Stunde: {min(signals)}% bis {max(signals)}% ({len(signals)} Messungen)"
+        self.signal_trends[ssid] = trend
+        if self.details_network is not None and self.details_network.ssid == ssid:
+            self.details_label.setText(self.details_text(self.details_network, trend))
 
     def connect_to_selected_network(self):
-        current_row = self.result_table.currentRow()
-        if current_row == -1:
+        net = self.selected_network()
+        if net is None:
             self.status_label.setText("Bitte wähle ein Netzwerk aus.")
             return
 
-        ssid = self.result_table.item(current_row, 0).text()
-        recommendation = self.result_table.item(current_row, 3).text()
-
-        if recommendation != "Empfohlen":
+        ssid = net.ssid
+        if net.recommendation != "Empfohlen":
             self.status_label.setText(f"Verbindung mit {ssid} nicht empfohlen. Bitte wähle ein sicheres Netzwerk.")
             return
 
+        if not scan_cache.is_valid():
+            # Cache abgelaufen: im Hintergrund neu scannen statt mit veralteten Daten zu verbinden
+            self.status_label.setText("Die Scan-Ergebnisse sind veraltet. Es wird neu gescannt …")
+            self.scan_networks()
+            return
+
         # Authentifizierung und Verschlüsselung aus den gescannten Daten
-        networks = scan_networks()
-        auth = "WPA2PSK"
-        encryption = "AES"
-        if networks:
-            for net in networks:
-                if net.get("ssid") == ssid:
-                    auth = net.get("auth", "WPA2PSK").replace("-Personal", "PSK")
-                    encryption = net.get("encryption", "AES")
-                    break
+        auth = (net.auth or "WPA2PSK").replace("-Personal", "PSK")
+        encryption = net.encryption or "AES"
 
         # Passwort abfragen
         password, ok = QInputDialog.getText(self, "Passwort eingeben", f"Passwort für {ssid}:")
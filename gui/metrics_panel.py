@@ -0,0 +1,109 @@
+from PyQt6.QtWidgets import QDockWidget, QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QLabel, QFileDialog, QHeaderView, QAbstractItemView
+from PyQt6.QtCore import Qt, QTimer
+from network.metrics import metrics
+
+class MetricsPanel(QDockWidget):
+    """Entwickler-Panel mit den Laufzeiten der Verarbeitungsschritte und den Zählern.
+
+    Solange das Panel sichtbar ist, wird die Anzeige einmal pro Sekunde aktualisiert.
+    Beim Öffnen werden die Messungen eingeschaltet.
+    """
+
+    HEADERS = ["Schritt", "Anzahl", "Letzte (ms)", "p50 (ms)", "p95 (ms)", "Max (ms)"]
+    REFRESH_INTERVAL = 1000
+
+    def __init__(self, parent=None):
+        super().__init__("Messwerte", parent)
+        self.setObjectName("metrics_panel")
+        self.setAccessibleName("Messwerte-Panel")
+        self.setAccessibleDescription("Zeigt für Entwickler an, wie lange die einzelnen Verarbeitungsschritte dauern.")
+
+        content = QWidget(self)
+        layout = QVBoxLayout(content)
+
+        self.stage_table = QTableWidget(0, len(self.HEADERS), content)
+        self.stage_table.setHorizontalHeaderLabels(self.HEADERS)
+        self.stage_table.setAccessibleName("Laufzeit-Tabelle")
+        self.stage_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.stage_table.verticalHeader().setVisible(False)
+        self.stage_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        layout.addWidget(self.stage_table)
+
+        self.counter_label = QLabel(content)
+        self.counter_label.setAccessibleName("Zähler-Label")
+        self.counter_label.setWordWrap(True)
+        layout.addWidget(self.counter_label)
+
+        button_layout = QHBoxLayout()
+        self.jsonl_button = QPushButton("Als JSON Lines exportieren", content)
+        self.jsonl_button.clicked.connect(lambda: self.export("JSON Lines (*.jsonl)", metrics.export_jsonl))
+        button_layout.addWidget(self.jsonl_button)
+        self.prometheus_button = QPushButton("Als Prometheus-Text exportieren", content)
+        self.prometheus_button.clicked.connect(lambda: self.export("Prometheus (*.prom)", metrics.export_prometheus))
+        button_layout.addWidget(self.prometheus_button)
+        self.reset_button = QPushButton("Zurücksetzen", content)
+        self.reset_button.clicked.connect(self.reset)
+        button_layout.addWidget(self.reset_button)
+        layout.addLayout(button_layout)
+
+        self.export_label = QLabel(content)
+        self.export_label.setAccessibleName("Export-Label")
+        self.export_label.setAccessibleDescription("Zeigt an, ob der letzte Export gelungen ist.")
+        self.export_label.setWordWrap(True)
+        layout.addWidget(self.export_label)
+
+        self.setWidget(content)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.REFRESH_INTERVAL)
+        self.timer.timeout.connect(self.refresh)
+        self.visibilityChanged.connect(self.on_visibility_changed)
+
+    def on_visibility_changed(self, visible):
+        if visible:
+            metrics.enabled = True
+            self.refresh()
+            self.timer.start()
+        else:
+            self.timer.stop()
+
+    @staticmethod
+    def _milliseconds(seconds):
+        return "" if seconds is None else f"{seconds * 1000:.1f}"
+
+    def refresh(self):
+        snapshot = metrics.snapshot()
+        stages = snapshot["stages"]
+        self.stage_table.setRowCount(len(stages))
+        for row, (name, summary) in enumerate(stages.items()):
+            values = [name, str(summary["count"])] + [
+                self._milliseconds(summary[key]) for key in ("last", "p50", "p95", "max")
+            ]
+            for column, value in enumerate(values):
+                item = self.stage_table.item(row, column)
+                if item is None:
+                    item = QTableWidgetItem()
+                    if column > 0:
+                        item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                    self.stage_table.setItem(row, column, item)
+                item.setText(value)
+        counters = snapshot["counters"]
+        self.counter_label.setText(
+            ", ".join(f"{name}: {value}" for name, value in counters.items()) if counters else "Noch keine Zähler."
+        )
+
+    def export(self, file_filter, exporter):
+        path, _ = QFileDialog.getSaveFileName(self, "Messwerte exportieren", "", file_filter)
+        if not path:
+            return
+        try:
+            exporter(path)
+        except OSError as e:
+            # Z. B. schreibgeschützter Ordner oder voller Datenträger: melden statt abzustürzen
+            self.export_label.setText(f"Export fehlgeschlagen: {e.strerror or e}")
+            return
+        self.export_label.setText(f"Exportiert nach {path}")
+
+    def reset(self):
+        metrics.reset()
+        self.refresh()
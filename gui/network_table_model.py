@@ -0,0 +1,220 @@
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+from PyQt6.QtGui import QFont
+from network.models import UNKNOWN
+from network.evaluation import RECOMMENDED
+
+class NetworkTableModel(QAbstractTableModel):
+    """Tabellenmodell für die gescannten Netzwerke, aktualisiert per Schlüssel-Diff.
+
+    Jede Zeile ist ein Netzwerk (SSID). Bei einem neuen Scan werden nur
+    verschwundene Zeilen entfernt, neue angehängt und geänderte Zeilen
+    gemeldet, damit Auswahl, Fokus und Scrollposition erhalten bleiben.
+    """
+
+    HEADERS = ["SSID", "Signal", "Sicherheit", "Empfehlung"]
+    RECOMMENDATION_COLUMN = 3
+
+    # Eigene Rollen: Sortierwert, das Netzwerk-Objekt selbst und der Empfehlungszustand
+    # (True/False, None solange nicht bewertet) für den Delegate der Empfehlungsspalte
+    SortRole = Qt.ItemDataRole.UserRole + 1
+    NetworkRole = Qt.ItemDataRole.UserRole + 2
+    RecommendationRole = Qt.ItemDataRole.UserRole + 3
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._networks = []
+        self._keys = []
+        self._rows = {}
+        # Zuletzt gemeldete Anzeigewerte je Zeile, Netzwerke werden beim Bewerten verändert
+        self._displayed = []
+        # Zeilen aus einem gespeicherten Scan (Warmstart), bis ein neuer Scan sie bestätigt
+        self._stale_keys = set()
+        self._stale_font = QFont()
+        self._stale_font.setItalic(True)
+
+    @staticmethod
+    def network_key(net):
+        # Schlüssel einer Zeile für alle Aktualisierungswege (Scan, Überwachung, laufender Scan):
+        # gleiche SSID mit anderer Sicherheit steht in einem eigenen Block und bekommt eine eigene
+        # Zeile, versteckte Netzwerke haben keine SSID und werden über ihre BSSID erkannt
+        if net.ssid:
+            return (net.ssid, net.auth, net.encryption)
+        return net.access_points[0].bssid if net.access_points else ""
+
+    @staticmethod
+    def _display_values(net):
+        # Texte der vier Spalten und als fünfter Wert der Empfehlungszustand
+        best_ap = net.best_access_point
+        if best_ap is None:
+            return (net.ssid, UNKNOWN, UNKNOWN, UNKNOWN, None)
+        if not best_ap.is_evaluated:
+            # Noch nicht bewertet (Netzwerk aus einem laufenden Scan)
+            return (net.ssid, best_ap.signal_text, "Wird bewertet …", "", None)
+        return (net.ssid, best_ap.signal_text, best_ap.security, best_ap.recommendation,
+                bool(best_ap.verdict & RECOMMENDED))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._networks)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        net = self._networks[index.row()]
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._displayed[index.row()][column]
+        if role == self.SortRole:
+            if column == 1:
+                return net.signal if net.signal is not None else -1
+            return self._displayed[index.row()][column]
+        if role == self.NetworkRole:
+            return net
+        if role == Qt.ItemDataRole.UserRole and column == 0:
+            return net.bssid
+        if role in (Qt.ItemDataRole.ForegroundRole, Qt.ItemDataRole.FontRole) and self._stale_keys:
+            if self._keys[index.row()] not in self._stale_keys:
+                return None
+            return Qt.GlobalColor.gray if role == Qt.ItemDataRole.ForegroundRole else self._stale_font
+        if role == self.RecommendationRole:
+            return self._displayed[index.row()][4]
+        return None
+
+    def network(self, row):
+        return self._networks[row]
+
+    def networks(self):
+        return list(self._networks)
+
+    def row_for_key(self, key):
+        return self._rows.get(key, -1)
+
+    def _reindex(self):
+        self._rows = {key: row for row, key in enumerate(self._keys)}
+
+    def is_stale(self):
+        return bool(self._stale_keys)
+
+    def set_networks(self, networks, stale=False):
+        """Übernimmt einen neuen Scan und meldet nur die Unterschiede an die Ansicht.
+
+        Mit stale=True stammen die Netzwerke aus einem gespeicherten Scan und werden
+        bis zum nächsten Aufruf ausgegraut dargestellt.
+        """
+        was_stale = bool(self._stale_keys)
+        new_networks = {}
+        new_order = []
+        for net in networks or ():
+            key = self.network_key(net)
+            if key not in new_networks:
+                new_order.append(key)
+            new_networks[key] = net
+
+        # 1. Verschwundene Zeilen entfernen (zusammenhängende Bereiche von unten nach oben)
+        removed_rows = [row for row, key in enumerate(self._keys) if key not in new_networks]
+        for first, last in reversed(_contiguous_ranges(removed_rows)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._networks[first:last + 1]
+            del self._keys[first:last + 1]
+            del self._displayed[first:last + 1]
+            self.endRemoveRows()
+        if removed_rows:
+            self._reindex()
+
+        # 2. Bestehende Zeilen aktualisieren, geänderte Zeilen melden
+        changed_rows = []
+        for row, key in enumerate(self._keys):
+            net = new_networks[key]
+            values = self._display_values(net)
+            if values != self._displayed[row]:
+                changed_rows.append(row)
+                self._displayed[row] = values
+            self._networks[row] = net
+        if was_stale or stale:
+            # Darstellung (grau/kursiv) aller bestehenden Zeilen ändert sich
+            self._stale_keys = set(new_networks) if stale else set()
+            changed_rows = list(range(len(self._keys)))
+        # Pro Bereich ein Signal, ein einziges umfassendes Signal würde der Proxy komplett neu sortieren
+        for first, last in _contiguous_ranges(changed_rows):
+            self.dataChanged.emit(self.index(first, 0), self.index(last, len(self.HEADERS) - 1))
+
+        # 3. Neue Zeilen in einem Block anhängen
+        added_keys = [key for key in new_order if key not in self._rows]
+        if added_keys:
+            first = len(self._networks)
+            self.beginInsertRows(QModelIndex(), first, first + len(added_keys) - 1)
+            for key in added_keys:
+                self._rows[key] = len(self._keys)
+                self._keys.append(key)
+                self._networks.append(new_networks[key])
+                self._displayed.append(self._display_values(new_networks[key]))
+            self.endInsertRows()
+
+    def update_networks(self, networks, removed_networks=()):
+        """Aktualisiert nur die übergebenen Netzwerke, z. B. aus den Deltas der Überwachung.
+
+        Der Aufwand hängt von der Zahl der Änderungen ab, nicht von der Tabellengröße
+        (abgesehen vom Neuaufbau des Zeilenindex nach dem Entfernen).
+        """
+        updated_keys = {self.network_key(net) for net in networks}
+        removed_rows = sorted({self._rows[key] for key in map(self.network_key, removed_networks)
+                               if key in self._rows and key not in updated_keys})
+        for first, last in reversed(_contiguous_ranges(removed_rows)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._networks[first:last + 1]
+            del self._keys[first:last + 1]
+            del self._displayed[first:last + 1]
+            self.endRemoveRows()
+        if removed_rows:
+            self._reindex()
+
+        for net in networks:
+            row = self._rows.get(self.network_key(net))
+            if row is None:
+                self.add_network(net)
+                continue
+            self._networks[row] = net
+            values = self._display_values(net)
+            stale_key = self._keys[row] in self._stale_keys
+            self._stale_keys.discard(self._keys[row])
+            if values != self._displayed[row] or stale_key:
+                self._displayed[row] = values
+                self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1))
+
+    def add_network(self, net):
+        """Hängt ein Netzwerk aus einem laufenden Scan an, bekannte Zeilen bleiben unverändert."""
+        key = self.network_key(net)
+        if key in self._rows:
+            return
+        row = len(self._networks)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows[key] = row
+        self._keys.append(key)
+        self._networks.append(net)
+        self._displayed.append(self._display_values(net))
+        self.endInsertRows()
+
+def _contiguous_ranges(rows):
+    # [1, 2, 3, 7, 8] -> [(1, 3), (7, 8)]
+    ranges = []
+    for row in rows:
+        if ranges and ranges[-1][1] == row - 1:
+            ranges[-1] = (ranges[-1][0], row)
+        else:
+            ranges.append((row, row))
+    return ranges
+
+class NetworkSortProxyModel(QSortFilterProxyModel):
+    """Sortiert die Netzwerktabelle, das Signal numerisch statt als Text."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSortRole(NetworkTableModel.SortRole)
+        self.setDynamicSortFilter(True)
@@ -0,0 +1,54 @@
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QBrush, QColor, QPalette
+from PyQt6.QtWidgets import QApplication, QStyle, QStyledItemDelegate, QStyleOptionViewItem
+from gui.network_table_model import NetworkTableModel
+
+# Farben je Modus: (empfohlen, nicht empfohlen, Muster für nicht empfohlen)
+RECOMMENDATION_PALETTES = {
+    "standard": (QColor(Qt.GlobalColor.green), QColor(Qt.GlobalColor.red), None),
+    # Blau/Gelb und zusätzlich ein Schraffurmuster, damit der Unterschied nicht nur an der Farbe hängt
+    "colorblind": (QColor(Qt.GlobalColor.cyan), QColor(Qt.GlobalColor.yellow), Qt.BrushStyle.BDiagPattern),
+}
+
+# Symbole vor dem Text, lesbar auch ohne Farbwahrnehmung
+RECOMMENDED_SYMBOL = "✓"
+NOT_RECOMMENDED_SYMBOL = "✗"
+
+class RecommendationDelegate(QStyledItemDelegate):
+    """Zeichnet die Empfehlungsspalte aus dem Empfehlungszustand (RecommendationRole).
+
+    Die Farben stehen nur im Delegate: ein Wechsel des Modus ist ein Neuzeichnen
+    des sichtbaren Bereichs, die Daten der Zeilen bleiben unverändert.
+    """
+
+    def __init__(self, parent=None, palette="standard"):
+        super().__init__(parent)
+        self.set_palette(palette)
+
+    def set_palette(self, palette):
+        self.palette = palette
+        self.recommended_color, self.not_recommended_color, self.pattern = RECOMMENDATION_PALETTES[palette]
+        # Muster halbtransparent, damit der Text lesbar bleibt
+        self.pattern_brush = QBrush(QColor(0, 0, 0, 70), self.pattern) if self.pattern is not None else None
+
+    def paint(self, painter, option, index):
+        recommended = index.data(NetworkTableModel.RecommendationRole)
+        if recommended is None:
+            # Noch nicht bewertet: normal ohne Hintergrund zeichnen
+            super().paint(painter, option, index)
+            return
+        painter.save()
+        painter.fillRect(option.rect, self.recommended_color if recommended else self.not_recommended_color)
+        if self.pattern_brush is not None and not recommended:
+            painter.fillRect(option.rect, self.pattern_brush)
+        painter.restore()
+
+        item_option = QStyleOptionViewItem(option)
+        self.initStyleOption(item_option, index)
+        item_option.text = f"{RECOMMENDED_SYMBOL if recommended else NOT_RECOMMENDED_SYMBOL} {item_option.text}"
+        # Schwarzer Text auf den hellen Hintergrundfarben, auch im Kontrastmodus
+        for role in (QPalette.ColorRole.Text, QPalette.ColorRole.HighlightedText):
+            item_option.palette.setColor(role, QColor(Qt.GlobalColor.black))
+        widget = option.widget
+        style = widget.style() if widget is not None else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_ItemViewItem, item_option, painter, widget)
@@ -0,0 +1,104 @@
+import logging
+import sqlite3
+import threading
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+from network.scanner import ScanCancelled
+from network.diagnostics import run_diagnostics_sync, DIAGNOSTICS, NETWORKS, CONNECTED_INFO, PACKET_LOSS
+
+logger = logging.getLogger(__name__)
+
+class ScanWorkerSignals(QObject):
+    # Signale müssen an einem QObject hängen, QRunnable selbst kann keine senden
+    progress = pyqtSignal(int, int, str)
+    network_found = pyqtSignal(object)
+    networks_ready = pyqtSignal(object)
+    connected_info_ready = pyqtSignal(object)
+    packet_loss_ready = pyqtSignal(object)
+    error = pyqtSignal(str, str)
+    finished = pyqtSignal()
+
+class MonitorSignals(QObject):
+    # Überträgt die Deltas aus dem Überwachungs-Thread in den GUI-Thread
+    deltas_ready = pyqtSignal(object, object)
+    error = pyqtSignal(str)
+
+class TrendSignals(QObject):
+    # Überträgt den Signalverlauf (SSID, Signale) aus dem Thread-Pool in den GUI-Thread
+    trend_ready = pyqtSignal(str, object)
+
+class TrendWorker(QRunnable):
+    """Liest den Signalverlauf einer SSID aus dem Scan-Verlauf außerhalb des GUI-Threads.
+
+    Beim ersten Aufruf wird dabei auch die Verlaufsdatenbank geöffnet.
+    """
+
+    def __init__(self, ssid, signals):
+        super().__init__()
+        self.ssid = ssid
+        self.signals = signals
+
+    def run(self):
+        # Erst hier importieren, ohne Details braucht die GUI den Verlauf nicht
+        from network.history import get_history
+        signals = []
+        history = get_history()
+        if history is not None:
+            try:
+                signals = [observation.signal for observation in history.signal_trend(self.ssid)
+                           if observation.signal is not None]
+            except sqlite3.Error as e:
+                logger.warning("Signalverlauf von %s konnte nicht gelesen werden: %s", self.ssid, e)
+        self.signals.trend_ready.emit(self.ssid, signals)
+
+class ScanWorker(QRunnable):
+    """Führt Scan, Verbindungsabfrage und Paketverlust-Test gleichzeitig außerhalb des GUI-Threads aus."""
+
+    DIAGNOSTIC_NAMES = {
+        NETWORKS: "Netzwerke gescannt",
+        CONNECTED_INFO: "Verbindungsinformationen abgerufen",
+        PACKET_LOSS: "Paketverlust getestet",
+    }
+    STAGE_COUNT = len(DIAGNOSTICS)
+
+    def __init__(self):
+        super().__init__()
+        self.signals = ScanWorkerSignals()
+        self.cancel_event = threading.Event()
+        self._completed = 0
+
+    def cancel(self):
+        """Bricht den laufenden Scan ab, laufende Prozesse werden beendet."""
+        self.cancel_event.set()
+
+    def is_cancelled(self):
+        return self.cancel_event.is_set()
+
+    def _on_network(self, network):
+        if not self.is_cancelled():
+            self.signals.network_found.emit(network)
+
+    def _on_result(self, name, value, error):
+        # Wird für jede Diagnose aufgerufen, sobald sie fertig ist (Reihenfolge beliebig)
+        if self.is_cancelled():
+            return
+        self._completed += 1
+        self.signals.progress.emit(self._completed, self.STAGE_COUNT, self.DIAGNOSTIC_NAMES[name])
+        if error is not None:
+            self.signals.error.emit(name, error)
+        elif name == NETWORKS:
+            self.signals.networks_ready.emit(value)
+        elif name == CONNECTED_INFO:
+            self.signals.connected_info_ready.emit(value)
+        elif name == PACKET_LOSS:
+            self.signals.packet_loss_ready.emit(value)
+
+    def run(self):
+        try:
+            run_diagnostics_sync(on_network=self._on_network, on_result=self._on_result, cancel_event=self.cancel_event)
+        except ScanCancelled:
+            pass
+        except Exception as e:
+            if not self.is_cancelled():
+                self.signals.error.emit(NETWORKS, str(e))
+        finally:
+            self.signals.finished.emit()
@@ -0,0 +1,179 @@
+from functools import lru_cache
+
+# Farbschemata der Oberfläche, weitere Schemata brauchen nur einen Eintrag hier
+PALETTES = {
+    "standard": {
+        "window": "palette(window)",
+        "window_text": "palette(window-text)",
+        "text": "#000000",
+        "secondary_text": "#333333",
+        "background": "#FFFFFF",
+        "panel_background": "#F0F0F0",
+        "border": "#CCCCCC",
+        "header_background": "#4A90E2",
+        "focus_border": "#003087",
+        "focus_background": "#E0E0FF",
+        "scan_button": "#299FFF",
+        "scan_button_hover": "#005BB5",
+        "scan_button_focus": "#003087",
+        "connect_button": "#28A745",
+        "connect_button_hover": "#218838",
+        "connect_button_focus": "#1C6D2F",
+    },
+    "high_contrast": {
+        "window": "#000000",
+        "window_text": "#FFFFFF",
+        "text": "#FFFFFF",
+        "secondary_text": "#FFFFFF",
+        "background": "#000000",
+        "panel_background": "#000000",
+        "border": "#FFFFFF",
+        "header_background": "#FFFF00",
+        "focus_border": "#00FFFF",
+        "focus_background": "#003366",
+        "scan_button": "#FFFF00",
+        "scan_button_hover": "#FFFFFF",
+        "scan_button_focus": "#00FFFF",
+        "connect_button": "#00FF00",
+        "connect_button_hover": "#FFFFFF",
+        "connect_button_focus": "#00FFFF",
+    },
+}
+
+DEFAULT_PALETTE = "standard"
+
+FONT_FAMILY = "Arial"
+BASE_FONT_SIZE = 10
+
+# Zoom in Schritten von 10 %: Stufe 10 = 100 %
+SCALE_STEP = 0.1
+MIN_SCALE_STEP = 5
+MAX_SCALE_STEP = 20
+
+# Die Selektoren über objectName treffen nur die Widgets des Hauptfensters
+STYLESHEET_TEMPLATE = """
+#central_widget, #central_widget QWidget {{
+    font-family: {font_family};
+    font-size: {font_size}pt;
+}}
+#central_widget {{
+    background-color: {window};
+}}
+#central_widget QCheckBox {{
+    color: {window_text};
+}}
+#status_label {{
+    color: {text};
+    padding: {padding}px;
+}}
+#result_table {{
+    color: {text};
+    background-color: {background};
+    border: 1px solid {border};
+    gridline-color: {border};
+}}
+#result_table::item {{
+    padding: {padding}px;
+}}
+#result_table QHeaderView::section {{
+    background-color: {header_background};
+    color: #000000;
+    padding: {padding}px;
+    border: 1px solid {border};
+}}
+#details_label, #connected_label {{
+    color: {secondary_text};
+    padding: {padding}px;
+    border: 1px solid {border};
+    background-color: {panel_background};
+}}
+#details_label:focus, #connected_label:focus {{
+    border: 2px solid {focus_border};
+    background-color: {focus_background};
+}}
+#scan_button {{
+    color: #000000;
+    background-color: {scan_button};
+    padding: {button_padding}px;
+    border-radius: {radius}px;
+    border: none;
+}}
+#scan_button:hover {{
+    background-color: {scan_button_hover};
+}}
+#scan_button:focus {{
+    border: 2px solid {scan_button_focus};
+}}
+#connect_button {{
+    color: #000000;
+    background-color: {connect_button};
+    padding: {button_padding}px;
+    border-radius: {radius}px;
+    border: none;
+}}
+#connect_button:hover {{
+    background-color: {connect_button_hover};
+}}
+#connect_button:focus {{
+    border: 2px solid {connect_button_focus};
+}}
+"""
+
+def scale_step(scale):
+    """Wandelt einen Zoomfaktor (z. B. 1.2) in die ganzzahlige Stufe (12) um."""
+    return max(MIN_SCALE_STEP, min(MAX_SCALE_STEP, round(scale / SCALE_STEP)))
+
+def font_size(step):
+    return int(BASE_FONT_SIZE * step * SCALE_STEP)
+
+@lru_cache(maxsize=None)
+def stylesheet(step, palette=DEFAULT_PALETTE):
+    """Stylesheet für Zoomstufe und Farbschema, wird je Kombination nur einmal erzeugt."""
+    scale = step * SCALE_STEP
+    return STYLESHEET_TEMPLATE.format(
+        font_family=FONT_FAMILY,
+        font_size=font_size(step),
+        padding=round(5 * scale),
+        button_padding=round(8 * scale),
+        radius=round(5 * scale),
+        **PALETTES[palette],
+    )
+
+class ThemeEngine:
+    """Wendet Zoomstufe und Farbschema auf die Anwendung an.
+
+    Das Stylesheet wird nur gesetzt, wenn sich das Farbschema oder die Zoomstufe
+    tatsächlich ändert, und dann mit einem einzigen Aufruf am Hauptfenster statt
+    einzeln für jedes Widget.
+    """
+
+    def __init__(self, window, palette=DEFAULT_PALETTE, scale=1.0):
+        self.window = window
+        self.palette = palette
+        self.step = scale_step(scale)
+        self._applied = None
+
+    @property
+    def scale(self):
+        return self.step * SCALE_STEP
+
+    def apply(self):
+        key = (self.step, self.palette)
+        if key == self._applied:
+            return
+        sheet = stylesheet(self.step, self.palette)
+        self.window.setStyleSheet(sheet)
+        self._applied = key
+
+    def zoom(self, steps):
+        """Ändert die Zoomstufe um steps, liefert False an der Grenze (50 % bzw. 200 %)."""
+        step = max(MIN_SCALE_STEP, min(MAX_SCALE_STEP, self.step + steps))
+        if step == self.step:
+            return False
+        self.step = step
+        self.apply()
+        return True
+
+    def set_palette(self, palette):
+        self.palette = palette
+        self.apply()
@@ -0,0 +1,5 @@
+import sys
+from network.cli import main
+
+# python -m network: Scan ohne GUI, Ausgabe als JSON oder NDJSON
+sys.exit(main())
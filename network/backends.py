@@ -0,0 +1,648 @@
+import glob
+import logging
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from network.models import Network, intern_text, parse_percent, parse_channel
+from network.profiles import build_profile_xml, profile_store
+from network.metrics import metrics
+from network.probe import DEFAULT_TARGET, DEFAULT_COUNT, ProbeResult, compute_statistics, probe_target
+
+logger = logging.getLogger(__name__)
+
+# Backend-Auswahl über die Umgebung: "netsh", "native" oder "replay:<Verzeichnis>"
+BACKEND_ENV = "WLAN_BACKEND"
+
+# Befehle des netsh-Backends
+SCAN_COMMAND = ["netsh", "wlan", "show", "networks", "mode=Bssid"]
+INTERFACES_COMMAND = ["netsh", "wlan", "show", "interfaces"]
+
+# So lange wird die Liste der WLAN-Adapter wiederverwendet, bevor netsh erneut gefragt wird
+INTERFACE_CACHE_TTL = 60.0
+
+class ScanCancelled(Exception):
+    """Wird ausgelöst, wenn ein laufender Scan abgebrochen wurde."""
+
+class ScannerBackend:
+    """Schnittstelle für Scan, Verbindungsinformationen, Verbinden und Messungen.
+
+    iter_networks() liefert noch nicht bewertete Netzwerke, connected_info() ein
+    Wörterbuch mit ssid, signal, receive_rate, transmit_rate und channel (Texte
+    wie bei netsh) oder None, connect() eine Erfolgsmeldung. Fehler werden als
+    Exception gemeldet, ein Abbruch über cancel_event als ScanCancelled.
+
+    interfaces() liefert die Namen der WLAN-Adapter; iter_networks() und
+    connected_info() fragen mit interface nur diesen Adapter ab, ohne alle bzw.
+    den Standardadapter. Eine leere Liste heißt, dass das Backend Adapter nicht
+    einzeln ansprechen kann.
+    """
+
+    name = None
+    # Scans dieses Backends gehören in den Verlauf (nicht bei aufgezeichneten Ausgaben)
+    records_history = True
+
+    @classmethod
+    def is_available(cls):
+        return True
+
+    def interfaces(self, cancel_event=None):
+        return []
+
+    def iter_networks(self, cancel_event=None, interface=None):
+        raise NotImplementedError
+
+    def connected_info(self, cancel_event=None, interface=None):
+        raise NotImplementedError
+
+    def connect(self, ssid, password, auth="WPA2PSK", encryption="AES"):
+        raise NotImplementedError
+
+    def probe(self, target=DEFAULT_TARGET, count=DEFAULT_COUNT, cancel_event=None):
+        # Messungen laufen bei allen Backends im eigenen Prozess (siehe network.probe)
+        return probe_target(target, count, cancel_event=cancel_event)
+
+def _check_cancelled(cancel_event):
+    if cancel_event is not None and cancel_event.is_set():
+        raise ScanCancelled()
+
+# netsh-Ausgabe
+
+# Felder, die aus der netsh-Ausgabe gelesen werden
+FIELD_SSID = "ssid"
+FIELD_BSSID = "bssid"
+FIELD_SIGNAL = "signal"
+FIELD_RADIO_TYPE = "radio_type"
+FIELD_CHANNEL = "channel"
+FIELD_BAND = "band"
+FIELD_AUTH = "auth"
+FIELD_ENCRYPTION = "encryption"
+FIELD_NAME = "interface"
+FIELD_RECEIVE_RATE = "receive_rate"
+FIELD_TRANSMIT_RATE = "transmit_rate"
+
+# Beschriftungen je Sprache von Windows (ohne Nummer und Einheit in Klammern),
+# weitere Sprachen brauchen nur einen Eintrag hier
+NETSH_LABELS = {
+    "de": {
+        "SSID": FIELD_SSID,
+        "BSSID": FIELD_BSSID,
+        "Signal": FIELD_SIGNAL,
+        "Funktyp": FIELD_RADIO_TYPE,
+        "Kanal": FIELD_CHANNEL,
+        "Band": FIELD_BAND,
+        "Authentifizierung": FIELD_AUTH,
+        "Verschlüsselung": FIELD_ENCRYPTION,
+        "Name": FIELD_NAME,
+        "Empfangsrate": FIELD_RECEIVE_RATE,
+        "Übertragungsrate": FIELD_TRANSMIT_RATE,
+    },
+    "en": {
+        "SSID": FIELD_SSID,
+        "BSSID": FIELD_BSSID,
+        "Signal": FIELD_SIGNAL,
+        "Radio type": FIELD_RADIO_TYPE,
+        "Channel": FIELD_CHANNEL,
+        "Band": FIELD_BAND,
+        "Authentication": FIELD_AUTH,
+        "Encryption": FIELD_ENCRYPTION,
+        # 'show interfaces' nennt die Verschlüsselung anders als 'show networks'
+        "Cipher": FIELD_ENCRYPTION,
+        "Name": FIELD_NAME,
+        "Receive rate": FIELD_RECEIVE_RATE,
+        "Transmit rate": FIELD_TRANSMIT_RATE,
+    },
+}
+
+# Werte von Authentifizierung, Verschlüsselung und Band je Sprache, umgesetzt in die
+# deutschen Werte, mit denen auch das native Backend und die Bewertung arbeiten
+NETSH_VALUES = {
+    "de": {},
+    "en": {
+        "Open": "Offen",
+        "None": "Keine",
+        "2.4 GHz": "2,4 GHz",
+    },
+}
+
+# Erfolgsmeldungen von netsh je Sprache (Kleinschreibung, Teil der Ausgabe genügt)
+MESSAGE_PROFILE_ADDED = "profile_added"
+MESSAGE_CONNECTED = "connected"
+
+NETSH_MESSAGES = {
+    "de": {
+        MESSAGE_PROFILE_ADDED: ("wird der schnittstelle", "erfolgreich"),
+        MESSAGE_CONNECTED: ("erfolgreich",),
+    },
+    "en": {
+        MESSAGE_PROFILE_ADDED: ("is added on interface", "successfully"),
+        MESSAGE_CONNECTED: ("completed successfully", "successfully"),
+    },
+}
+
+# Ein Muster für alle Zeilen mit bekannter Beschriftung in allen Sprachen: Beschriftung,
+# Nummer (SSID 1, BSSID 2) und Einheit (MBit/s) werden in einem Schritt abgetrennt.
+# Getrennt wird am ersten Doppelpunkt, damit SSIDs und BSSIDs mit ":" erhalten bleiben;
+# Zeilen mit anderen Beschriftungen überspringt die Regex-Engine selbst
+_LINE_PATTERN = re.compile(
+    r"^[ \t]*("
+    + "|".join(sorted({re.escape(label) for labels in NETSH_LABELS.values() for label in labels}, key=len, reverse=True))
+    + r")(?: \d+)?(?: \([^)\n]*\))?[ \t]*:[ \t]?(.*)",
+    re.MULTILINE,
+)
+
+# In allen Sprachen gleiche Beschriftungen gelten schon vor der Erkennung der Sprache
+_COMMON_LABELS = {
+    label: field for label, field in NETSH_LABELS["de"].items()
+    if all(labels.get(label) == field for labels in NETSH_LABELS.values())
+}
+# Beschriftungen, an denen sich die Sprache eindeutig erkennen lässt
+_LABEL_LOCALES = {
+    label: locale for locale, labels in NETSH_LABELS.items() for label in labels if label not in _COMMON_LABELS
+}
+
+class NetshLabels:
+    """Ordnet die Beschriftungen der netsh-Ausgabe Feldern zu, unabhängig von der Sprache von Windows.
+
+    Die Sprache wird an der ersten nur in einer Sprache vorkommenden Beschriftung
+    erkannt und für alle weiteren Ausgaben gemerkt.
+    """
+
+    def __init__(self):
+        self.locale = None
+        self.fields = _COMMON_LABELS
+        self.values = {}
+
+    def field(self, label):
+        field = self.fields.get(label)
+        if field is None:
+            locale = _LABEL_LOCALES.get(label)
+            if locale is not None and locale != self.locale:
+                logger.debug("Sprache der netsh-Ausgabe: %s", locale)
+                self.locale = locale
+                self.fields = NETSH_LABELS[locale]
+                self.values = NETSH_VALUES[locale]
+                field = self.fields[label]
+        return field
+
+    def value(self, value):
+        """Wert von Authentifizierung, Verschlüsselung oder Band in der einheitlichen (deutschen) Schreibweise."""
+        return self.values.get(value, value)
+
+    def succeeded(self, message, output):
+        """True, wenn output die Erfolgsmeldung message in einer der bekannten Sprachen enthält.
+
+        Die kurzen Ausgaben von 'add profile' und 'connect' enthalten keine
+        Beschriftung, an der sich die Sprache erkennen ließe, deshalb wird gegen
+        alle Sprachen geprüft.
+        """
+        output = output.lower()
+        return any(marker in output for markers in NETSH_MESSAGES.values() for marker in markers[message])
+
+    def tokenize(self, text):
+        """Liefert (Feld, Wert) für jede Zeile von text mit bekannter Beschriftung."""
+        for label, value in _LINE_PATTERN.findall(text):
+            field = self.fields.get(label) or self.field(label)
+            if field is not None:
+                yield field, value.strip()
+
+netsh_labels = NetshLabels()
+
+class NetshNetworkParser:
+    """Parser für die Ausgabe von 'netsh wlan show networks mode=Bssid'.
+
+    feed() nimmt vollständige Zeilen (eine oder viele am Stück) und liefert die
+    Netzwerke, deren Block abgeschlossen ist, also beim Beginn des nächsten
+    SSID-Blocks; close() liefert den letzten Block. interface wird an jedem
+    Access Point als meldender Adapter vermerkt.
+    """
+
+    def __init__(self, interface=None, labels=netsh_labels):
+        self.interface = interface
+        self.labels = labels
+        self.current_network = None
+        self.current_ap = None
+        # Je Feld eine Methode statt einer Kette von Vergleichen je Zeile
+        self._handlers = {
+            FIELD_SSID: self._ssid,
+            FIELD_BSSID: self._bssid,
+            FIELD_SIGNAL: self._signal,
+            FIELD_RADIO_TYPE: self._radio_type,
+            FIELD_CHANNEL: self._channel,
+            FIELD_BAND: self._band,
+            FIELD_AUTH: self._auth,
+            FIELD_ENCRYPTION: self._encryption,
+        }
+
+    def feed(self, text):
+        # Heiße Schleife: tokenize() hier ausgeschrieben, ohne Generator je Zeile
+        completed = []
+        handlers = self._handlers
+        fields = self.labels.fields
+        for label, value in _LINE_PATTERN.findall(text):
+            field = fields.get(label)
+            if field is None:
+                field = self.labels.field(label)
+                fields = self.labels.fields
+            handler = handlers.get(field)
+            if handler is not None:
+                network = handler(value.strip())
+                if network is not None:
+                    completed.append(network)
+        return completed
+
+    def _ssid(self, value):
+        completed = self.current_network
+        self.current_network = Network(value)
+        self.current_ap = None
+        return completed
+
+    def _bssid(self, value):
+        if self.current_network is not None:
+            self.current_ap = self.current_network.add_access_point(value, interface=self.interface) if value else None
+
+    def _signal(self, value):
+        if self.current_ap:
+            self.current_ap.signal = parse_percent(value)
+
+    def _radio_type(self, value):
+        if self.current_ap:
+            self.current_ap.radio_type = intern_text(value)
+
+    def _channel(self, value):
+        if self.current_ap:
+            self.current_ap.channel = parse_channel(value)
+
+    def _band(self, value):
+        if self.current_ap:
+            self.current_ap.band = intern_text(self.labels.value(value))
+
+    def _auth(self, value):
+        if self.current_network is not None:
+            self.current_network.auth = intern_text(self.labels.value(value))
+
+    def _encryption(self, value):
+        if self.current_network is not None:
+            self.current_network.encryption = intern_text(self.labels.value(value))
+
+    def close(self):
+        completed = self.current_network
+        self.current_network = None
+        self.current_ap = None
+        return completed
+
+def parse_networks(lines):
+    # lines ist der gesamte Text oder eine Folge von Zeilen, geparst wird am Stück
+    parser = NetshNetworkParser()
+    yield from parser.feed(lines if isinstance(lines, str) else "\n".join(lines))
+    network = parser.close()
+    if network is not None:
+        yield network
+
+# Lesegröße beim Streamen der netsh-Ausgabe
+STREAM_CHUNK_SIZE = 64 * 1024
+
+def _parse_netsh_stream(stream, interface=None):
+    # Ausgabe blockweise lesen, je Block einmal dekodieren (cp850) und parsen; ein
+    # Block endet an der letzten vollständigen Zeile, der Rest kommt zum nächsten
+    parser = NetshNetworkParser(interface)
+    read = getattr(stream, "read1", stream.read)
+    clock = time.perf_counter
+    decode_time = parse_time = 0.0
+    pending = b""
+    try:
+        while True:
+            chunk = read(STREAM_CHUNK_SIZE)
+            if chunk:
+                pending += chunk
+                end = pending.rfind(b"\n") + 1
+                if not end:
+                    continue
+                data, pending = pending[:end], pending[end:]
+            elif pending:
+                data, pending = pending, b""
+            else:
+                break
+            started = clock()
+            text = data.decode("cp850", errors="replace")
+            decoded = clock()
+            networks = parser.feed(text)
+            parse_time += clock() - decoded
+            decode_time += decoded - started
+            yield from networks
+    finally:
+        if metrics.enabled:
+            metrics.observe("netsh.decode", decode_time)
+            metrics.observe("scan.parse", parse_time)
+    network = parser.close()
+    if network is not None:
+        yield network
+
+# Felder von 'netsh wlan show interfaces', die connected_info() liefert
+CONNECTED_FIELDS = (FIELD_SSID, FIELD_SIGNAL, FIELD_RECEIVE_RATE, FIELD_TRANSMIT_RATE, FIELD_CHANNEL, FIELD_BAND)
+
+def parse_interfaces(output, labels=netsh_labels):
+    """Zerlegt 'netsh wlan show interfaces' in ein Wörterbuch je Adapter.
+
+    Jeder Adapterblock beginnt mit der Zeile "Name" (Schlüssel interface), dazu
+    kommen die Felder aus CONNECTED_FIELDS als Texte wie bei netsh, das Band in
+    der einheitlichen Schreibweise (siehe NetshLabels.value()).
+    """
+    interfaces = []
+    current = None
+    for field, value in labels.tokenize(output):
+        if field == FIELD_NAME:
+            current = {FIELD_NAME: value}
+            interfaces.append(current)
+        elif field in CONNECTED_FIELDS:
+            if current is None:
+                # Ausgabe ohne Namenszeile, z. B. gekürzte Aufzeichnungen
+                current = {}
+                interfaces.append(current)
+            current[field] = labels.value(value) if field == FIELD_BAND else value
+    return interfaces
+
+def parse_interface_names(output):
+    """Namen der WLAN-Adapter aus der Ausgabe von 'netsh wlan show interfaces'."""
+    return [info[FIELD_NAME] for info in parse_interfaces(output) if FIELD_NAME in info]
+
+def parse_connected_info(output, interface=None):
+    """Informationen zum ersten verbundenen Adapter, mit interface nur zu diesem Adapter."""
+    for info in parse_interfaces(output):
+        if interface is not None and info.get(FIELD_NAME) != interface:
+            continue
+        if any(field in info for field in CONNECTED_FIELDS):
+            return info
+    return None
+
+def _run_command(args, cancel_event=None):
+    # Befehl ausführen; bei gesetztem cancel_event wird der Prozess beendet
+    if cancel_event is None:
+        return subprocess.run(args, capture_output=True, text=False, check=True).stdout
+    if cancel_event.is_set():
+        raise ScanCancelled()
+    process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    while True:
+        try:
+            stdout, stderr = process.communicate(timeout=0.1)
+            break
+        except subprocess.TimeoutExpired:
+            if cancel_event.is_set():
+                process.kill()
+                process.wait()
+                process.stdout.close()
+                process.stderr.close()
+                raise ScanCancelled()
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, args, stdout, stderr)
+    return stdout
+
+def _kill_on_cancel(process, cancel_event):
+    # Prozess beenden, sobald der Scan abgebrochen wird
+    while process.poll() is None:
+        if cancel_event.wait(0.1):
+            process.kill()
+            return
+
+class NetshBackend(ScannerBackend):
+    """Fragt die WLAN-Daten über netsh ab (Windows, ein Prozess je Abfrage)."""
+
+    name = "netsh"
+
+    def __init__(self):
+        self._interface_names = None
+        self._interfaces_time = None
+
+    def _interfaces_output(self, cancel_event=None):
+        # Eine Abfrage liefert Adapterliste und Verbindungsinformationen zugleich
+        with metrics.span("netsh.interfaces"):
+            output = _run_command(INTERFACES_COMMAND, cancel_event).decode("cp850", errors="replace")
+        self._interface_names = parse_interface_names(output)
+        self._interfaces_time = time.monotonic()
+        return output
+
+    def interfaces(self, cancel_event=None):
+        if self._interface_names is None or time.monotonic() - self._interfaces_time > INTERFACE_CACHE_TTL:
+            self._interfaces_output(cancel_event)
+        return self._interface_names
+
+    def iter_networks(self, cancel_event=None, interface=None):
+        """Startet netsh und liefert die Netzwerke, während die Ausgabe noch gelesen wird."""
+        _check_cancelled(cancel_event)
+        args = SCAN_COMMAND + [f"interface={interface}"] if interface else SCAN_COMMAND
+        with metrics.span("netsh.spawn"):
+            process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        if cancel_event is not None:
+            threading.Thread(target=_kill_on_cancel, args=(process, cancel_event), daemon=True).start()
+        try:
+            yield from _parse_netsh_stream(process.stdout, interface)
+            process.wait()
+            _check_cancelled(cancel_event)
+            if process.returncode != 0:
+                raise subprocess.CalledProcessError(process.returncode, args)
+        finally:
+            # Auch bei vorzeitigem Abbruch des Generators keinen Prozess zurücklassen
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+
+    def connected_info(self, cancel_event=None, interface=None):
+        return parse_connected_info(self._interfaces_output(cancel_event), interface)
+
+    def connect(self, ssid, password, auth="WPA2PSK", encryption="AES"):
+        fingerprint = profile_store.fingerprint(ssid, password, auth, encryption)
+        try:
+            if profile_store.is_installed(ssid, fingerprint):
+                # Profil unverändert installiert: nur verbinden (ein Befehl)
+                try:
+                    result = self._connect_profile(ssid)
+                    metrics.count("connect.fast")
+                    return result
+                except Exception as e:
+                    # Profil wurde z. B. außerhalb des Tools gelöscht, unten neu installieren
+                    logger.debug("Verbinden mit vorhandenem Profil fehlgeschlagen: %s", e)
+                    profile_store.forget(ssid)
+            with metrics.span("netsh.install_profile"):
+                self._install_profile(ssid, build_profile_xml(ssid, password, auth, encryption))
+            profile_store.remember(ssid, fingerprint)
+            metrics.count("connect.full")
+            return self._connect_profile(ssid)
+        except subprocess.CalledProcessError as e:
+            profile_store.forget(ssid)
+            error_output = e.stderr.decode("cp850", errors="replace") if e.stderr else str(e)
+            logger.debug("Fehlerausgabe: %s", error_output)
+            raise Exception(f"Fehler beim Verbinden mit {ssid}: {error_output}")
+        except Exception as e:
+            profile_store.forget(ssid)
+            logger.debug("Allgemeiner Fehler: %s", e)
+            raise Exception(f"Fehler: {str(e)}")
+
+    def _install_profile(self, ssid, profile_xml):
+        # Bestehendes Profil löschen (falls vorhanden)
+        result = subprocess.run(
+            ["netsh", "wlan", "delete", "profile", f"name={ssid}"],
+            capture_output=True,
+            text=False,
+            check=False
+        )
+        delete_output = result.stdout.decode("cp850", errors="replace")
+        logger.debug("Profil löschen Ausgabe: %s", delete_output)
+
+        # netsh liest Profile nur aus Dateien: kurzlebige Datei im Temp-Verzeichnis,
+        # nur für den eigenen Benutzer lesbar, statt im Arbeitsverzeichnis
+        fd, temp_file = tempfile.mkstemp(prefix="wlan_profile_", suffix=".xml")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(profile_xml)
+
+            # Profil hinzufügen
+            result = subprocess.run(
+                ["netsh", "wlan", "add", "profile", f"filename={temp_file}"],
+                capture_output=True,
+                text=False,
+                check=True
+            )
+        finally:
+            # Sicherstellen, dass die temporäre Datei gelöscht wird, auch bei Fehlern
+            os.remove(temp_file)
+        output = result.stdout.decode("cp850", errors="replace")
+        logger.debug("Profil hinzufügen Ausgabe: %s", output)
+        if netsh_labels.succeeded(MESSAGE_PROFILE_ADDED, output):
+            logger.debug("Profil erfolgreich hinzugefügt")
+        else:
+            raise Exception(f"Fehler beim Hinzufügen des Profils: {output}")
+
+    def _connect_profile(self, ssid):
+        # Mit dem Netzwerk verbinden
+        connect_cmd = ["netsh", "wlan", "connect", f"ssid={ssid}", f"name={ssid}"]
+        with metrics.span("netsh.connect"):
+            result = subprocess.run(connect_cmd, capture_output=True, text=False, check=True)
+        connect_output = result.stdout.decode("cp850", errors="replace")
+        logger.debug("Verbindungsausgabe: %s", connect_output)
+        if netsh_labels.succeeded(MESSAGE_CONNECTED, connect_output):
+            logger.debug("Verbindung erfolgreich hergestellt")
+            return "Erfolgreich verbunden"
+        else:
+            raise Exception(f"Fehler beim Verbinden: {connect_output}")
+
+class ReplayBackend(ScannerBackend):
+    """Spielt aufgezeichnete netsh-Ausgaben ab, z. B. für Tests und Benchmarks ohne WLAN.
+
+    Bei mehreren Scan-Ausgaben liefert jeder Scan die nächste (danach wieder von
+    vorn), so lässt sich auch die Überwachung nachstellen. probe_rtts enthält
+    aufgezeichnete Laufzeiten in Sekunden (None = verloren); ohne Aufzeichnung
+    wird wie bei den anderen Backends echt gemessen.
+    """
+
+    name = "replay"
+    records_history = False
+
+    def __init__(self, network_outputs, interfaces_output=None, probe_rtts=None):
+        if isinstance(network_outputs, str):
+            network_outputs = [network_outputs]
+        self.network_outputs = list(network_outputs)
+        self.interfaces_output = interfaces_output
+        self.probe_rtts = probe_rtts
+        self.connections = []
+        self._scan_index = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_directory(cls, directory):
+        """Lädt networks*.txt, interfaces.txt und probe.txt (ms je Zeile, '-' = verloren)."""
+        def read(path):
+            with open(path, "rb") as f:
+                return f.read().decode("cp850", errors="replace")
+
+        network_files = sorted(glob.glob(os.path.join(directory, "networks*.txt")))
+        if not network_files:
+            raise Exception(f"Keine Aufzeichnung (networks*.txt) in {directory} gefunden")
+        interfaces_path = os.path.join(directory, "interfaces.txt")
+        probe_path = os.path.join(directory, "probe.txt")
+        probe_rtts = None
+        if os.path.exists(probe_path):
+            probe_rtts = [None if line.strip() == "-" else float(line) / 1000
+                          for line in read(probe_path).splitlines() if line.strip()]
+        return cls(
+            [read(path) for path in network_files],
+            read(interfaces_path) if os.path.exists(interfaces_path) else None,
+            probe_rtts,
+        )
+
+    def iter_networks(self, cancel_event=None, interface=None):
+        # Die Aufzeichnung enthält einen gemeinsamen Scan, interface wird ignoriert
+        with self._lock:
+            output = self.network_outputs[self._scan_index % len(self.network_outputs)]
+            self._scan_index += 1
+        for network in parse_networks(output):
+            _check_cancelled(cancel_event)
+            yield network
+
+    def connected_info(self, cancel_event=None, interface=None):
+        _check_cancelled(cancel_event)
+        return parse_connected_info(self.interfaces_output, interface) if self.interfaces_output else None
+
+    def connect(self, ssid, password, auth="WPA2PSK", encryption="AES"):
+        # Nichts verbinden, nur die installierten Profile merken (wie bei netsh nur bei Änderungen)
+        fingerprint = profile_store.fingerprint(ssid, password, auth, encryption)
+        if not profile_store.is_installed(ssid, fingerprint):
+            self.connections.append(build_profile_xml(ssid, password, auth, encryption))
+            profile_store.remember(ssid, fingerprint)
+        return "Erfolgreich verbunden"
+
+    def probe(self, target=DEFAULT_TARGET, count=DEFAULT_COUNT, cancel_event=None):
+        if self.probe_rtts is None:
+            return super().probe(target, count, cancel_event)
+        results = [ProbeResult(target, sequence, rtt) for sequence, rtt in enumerate(self.probe_rtts[:count])]
+        return compute_statistics(target, results)
+
+def record_netsh_outputs(directory):
+    """Speichert die aktuelle netsh-Ausgabe als Aufzeichnung für das Replay-Backend."""
+    os.makedirs(directory, exist_ok=True)
+    for name, args in (("networks.txt", SCAN_COMMAND), ("interfaces.txt", INTERFACES_COMMAND)):
+        with open(os.path.join(directory, name), "wb") as f:
+            f.write(_run_command(args))
+
+def create_backend(spec):
+    """Erzeugt ein Backend aus einer Angabe wie "netsh", "native" oder "replay:<Verzeichnis>"."""
+    name, _, argument = spec.partition(":")
+    if name == NetshBackend.name:
+        return NetshBackend()
+    if name == "native":
+        # Erst bei Bedarf laden, enthält plattformspezifischen ctypes-/Netlink-Code
+        from network.native import NativeBackend
+        return NativeBackend()
+    if name == ReplayBackend.name:
+        return ReplayBackend.from_directory(argument or ".")
+    raise Exception(f"Unbekanntes Scanner-Backend: {spec}")
+
+def default_backend_spec():
+    # netsh bleibt unter Windows der Standard, andere Systeme nutzen nl80211
+    spec = os.environ.get(BACKEND_ENV)
+    if spec:
+        return spec
+    return NetshBackend.name if sys.platform == "win32" else "native"
+
+_backend = None
+_backend_lock = threading.Lock()
+
+def get_backend():
+    """Liefert das aktive Backend, beim ersten Aufruf nach default_backend_spec() erzeugt."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = create_backend(default_backend_spec())
+        return _backend
+
+def set_backend(backend):
+    """Setzt das aktive Backend (Objekt oder Angabe wie bei create_backend)."""
+    global _backend
+    if isinstance(backend, str):
+        backend = create_backend(backend)
+    with _backend_lock:
+        _backend = backend
+    return backend
@@ -0,0 +1,215 @@
+import argparse
+import json
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from network.scanner import (MONITOR_INTERVAL, ScanCancelled, scan_networks, get_connected_network_info, get_backend,
+                             set_backend)
+from network.probe import DEFAULT_TARGET, DEFAULT_COUNT, PROBE_TCP, PROBE_UDP, PROBE_ICMP, ProbeTarget
+
+# Kommandozeile ohne GUI: importiert weder PyQt6 noch asyncio, damit Skripte und
+# geplante Audits schnell starten und kein Display brauchen
+
+FORMAT_JSON = "json"
+FORMAT_NDJSON = "ndjson"
+
+DEFAULT_INTERVAL = 60.0
+
+def parse_target(text, method=PROBE_TCP):
+    """Wandelt 'host' oder 'host:port' in ein ProbeTarget um."""
+    if method == PROBE_ICMP:
+        return ProbeTarget(text, None, method)
+    host, separator, port = text.rpartition(":")
+    if not separator:
+        return ProbeTarget(text, DEFAULT_TARGET.port, method)
+    return ProbeTarget(host, int(port), method)
+
+def parse_throughput_target(text):
+    """Wandelt 'host' oder 'host:port' in ein ThroughputTarget um."""
+    # Erst hier importieren, Audits ohne Durchsatzmessung brauchen network.throughput nicht
+    from network.throughput import ThroughputTarget
+    host, separator, port = text.rpartition(":")
+    if not separator:
+        return ThroughputTarget(text)
+    return ThroughputTarget(host, int(port))
+
+def _timestamp():
+    return time.strftime("%Y-%m-%dT%H:%M:%S%z")
+
+def run_audit(probe=True, connected=True, target=DEFAULT_TARGET, count=DEFAULT_COUNT, cancel_event=None,
+              throughput=None, throughput_options=None):
+    """Scannt, bewertet und misst einmal und liefert den Bericht als Wörterbuch.
+
+    Verbindungsabfrage und Messung laufen in Threads, während der Scan läuft.
+    Mit throughput (ThroughputTarget) folgt danach eine Durchsatzmessung,
+    throughput_options geht an measure_throughput(). Fehler einzelner Schritte
+    stehen unter errors, die übrigen Ergebnisse bleiben erhalten.
+    """
+    cancel_event = cancel_event or threading.Event()
+    report = {
+        "timestamp": _timestamp(),
+        "host": socket.gethostname(),
+        "backend": get_backend().name,
+        "networks": [],
+        "connected": None,
+        "probe": None,
+        "throughput": None,
+        "errors": {},
+    }
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        try:
+            connected_future = executor.submit(get_connected_network_info, cancel_event) if connected else None
+            probe_future = executor.submit(get_backend().probe, target, count, cancel_event) if probe else None
+            try:
+                networks = scan_networks(cancel_event) or []
+                report["networks"] = [net.to_dict() for net in networks]
+            except ScanCancelled:
+                raise
+            except Exception as e:
+                report["errors"]["networks"] = str(e)
+            for name, future in (("connected", connected_future), ("probe", probe_future)):
+                if future is None:
+                    continue
+                try:
+                    value = future.result()
+                except ScanCancelled:
+                    raise
+                except Exception as e:
+                    report["errors"][name] = str(e)
+                    continue
+                report[name] = value.to_dict() if hasattr(value, "to_dict") else value
+            if throughput is not None:
+                # Erst nach Scan und Messung, die volle Last würde deren Ergebnisse verfälschen
+                from network.throughput import measure_throughput
+                try:
+                    report["throughput"] = measure_throughput(throughput, cancel_event=cancel_event,
+                                                              **(throughput_options or {})).to_dict()
+                except Exception as e:
+                    report["errors"]["throughput"] = str(e)
+                if cancel_event.is_set():
+                    raise ScanCancelled()
+        except (ScanCancelled, KeyboardInterrupt):
+            # Threads beenden, bevor der Pool beim Verlassen auf sie wartet
+            cancel_event.set()
+            raise
+    return report
+
+def report_records(report):
+    """Zerlegt einen Bericht in einzelne NDJSON-Datensätze (ein Netzwerk je Zeile)."""
+    header = {"timestamp": report["timestamp"], "host": report["host"], "backend": report["backend"]}
+    for network in report["networks"]:
+        yield dict(header, type="network", **network)
+    if report["connected"] is not None:
+        yield dict(header, type="connected", **report["connected"])
+    if report["probe"] is not None:
+        yield dict(header, type="probe", **report["probe"])
+    if report["throughput"] is not None:
+        yield dict(header, type="throughput", **report["throughput"])
+    for stage, message in report["errors"].items():
+        yield dict(header, type="error", stage=stage, message=message)
+
+def write_report(report, output_format, stream):
+    if output_format == FORMAT_NDJSON:
+        for record in report_records(report):
+            stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+    else:
+        stream.write(json.dumps(report, ensure_ascii=False, indent=2) + "\n")
+    stream.flush()
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m network", description="WLAN-Netzwerke ohne GUI scannen, bewerten und messen")
+    parser.add_argument("--format", choices=(FORMAT_JSON, FORMAT_NDJSON), default=FORMAT_JSON,
+                        help="Ausgabe als JSON-Dokument je Durchlauf oder als NDJSON (ein Datensatz je Zeile)")
+    parser.add_argument("--repeat", type=int, default=1, help="Anzahl der Durchläufe, 0 = bis zum Abbruch")
+    parser.add_argument("--interval", type=float,
+                        help=f"Sekunden zwischen zwei Durchläufen bzw. Scans des Dienstes (Standard: {DEFAULT_INTERVAL:g} bzw. {MONITOR_INTERVAL:g})")
+    parser.add_argument("--backend", help="Scanner-Backend: netsh, native oder replay:<Verzeichnis>")
+    parser.add_argument("--no-probe", action="store_true", help="Latenz- und Paketverlustmessung überspringen")
+    parser.add_argument("--no-connected", action="store_true", help="Verbundenes Netzwerk nicht abfragen")
+    parser.add_argument("--target", help="Messziel als host oder host:port (Standard: 8.8.8.8:53)")
+    parser.add_argument("--method", choices=(PROBE_TCP, PROBE_UDP, PROBE_ICMP), default=PROBE_TCP)
+    parser.add_argument("--count", type=int, default=DEFAULT_COUNT, help="Anzahl der Messpakete")
+    parser.add_argument("--throughput", metavar="HOST[:PORT]",
+                        help="Durchsatz zu einem Durchsatz-Server messen (ohne PORT dessen Standardport)")
+    parser.add_argument("--upload", action="store_true", help="Durchsatz in Senderichtung statt Empfangsrichtung messen")
+    # Ohne Angabe gelten die Standardwerte aus network.throughput, das erst bei --throughput geladen wird
+    parser.add_argument("--streams", type=int, help="Parallele TCP-Verbindungen der Durchsatzmessung")
+    parser.add_argument("--duration", type=float, help="Dauer der Durchsatzmessung in Sekunden")
+    parser.add_argument("--service", action="store_true",
+                        help="Als Scanner-Dienst laufen, der seine Scans an GUI und Skripte auf diesem Rechner verteilt")
+    parser.add_argument("--throughput-server", nargs="?", type=int, const=0, metavar="PORT",
+                        help="Nur als Gegenstelle für Durchsatzmessungen laufen (auf allen Adressen, ohne PORT auf dem Standardport)")
+    return parser
+
+def serve_throughput(port, stream):
+    # Erst hier importieren, wie bei serve_scanner(); ohne port (0) auf dem Standardport
+    from network.throughput import DEFAULT_PORT, ThroughputServer
+    server = ThroughputServer("0.0.0.0", port or DEFAULT_PORT)
+    stream.write(f"Durchsatz-Server läuft auf Port {server.port}, Beenden mit Strg+C\n")
+    stream.flush()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        server.stop()
+    return 0
+
+def serve_scanner(interval, stream):
+    # Erst hier importieren, Audits brauchen den Server (socketserver) nicht
+    from network.service import ScannerService
+    service = ScannerService(interval=interval)
+    stream.write(f"Scanner-Dienst läuft auf {service.host}:{service.port} (Scan alle {interval:g} s), Beenden mit Strg+C\n")
+    stream.flush()
+    try:
+        service.start().wait()
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        service.stop()
+    return 0
+
+def main(argv=None, stream=None):
+    args = build_parser().parse_args(argv)
+    stream = stream or sys.stdout
+    if args.throughput_server is not None:
+        return serve_throughput(args.throughput_server, stream)
+    if args.backend:
+        set_backend(args.backend)
+        # Ein ausdrücklich gewähltes Backend nicht durch die Scans des Dienstes ersetzen
+        from network.service import set_service_client
+        set_service_client(None)
+    if args.service:
+        return serve_scanner(args.interval or MONITOR_INTERVAL, stream)
+    target = parse_target(args.target, args.method) if args.target else DEFAULT_TARGET
+    throughput = None
+    throughput_options = None
+    if args.throughput:
+        from network.throughput import DIRECTION_DOWNLOAD, DIRECTION_UPLOAD
+        throughput = parse_throughput_target(args.throughput)
+        throughput_options = {"direction": DIRECTION_UPLOAD if args.upload else DIRECTION_DOWNLOAD}
+        if args.streams is not None:
+            throughput_options["streams"] = args.streams
+        if args.duration is not None:
+            throughput_options["duration"] = args.duration
+    cancel_event = threading.Event()
+    run = 0
+    failed = False
+    try:
+        while True:
+            report = run_audit(not args.no_probe, not args.no_connected, target, args.count, cancel_event,
+                               throughput, throughput_options)
+            write_report(report, args.format, stream)
+            failed = "networks" in report["errors"]
+            run += 1
+            if args.repeat and run >= args.repeat:
+                break
+            time.sleep(DEFAULT_INTERVAL if args.interval is None else args.interval)
+    except (KeyboardInterrupt, ScanCancelled):
+        # Laufende netsh-Prozesse und Messungen beenden
+        cancel_event.set()
+        return 130
+    # Exit-Code 1, wenn der letzte Scan fehlgeschlagen ist
+    return 1 if failed else 0
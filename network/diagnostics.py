@@ -0,0 +1,116 @@
+import asyncio
+import subprocess
+import threading
+import time
+from network.scanner import ScanCancelled, scan_networks, get_connected_network_info, get_backend
+from network.probe import DEFAULT_TARGET
+from network.metrics import metrics
+
+# Namen der einzelnen Diagnosen
+NETWORKS = "networks"
+CONNECTED_INFO = "connected_info"
+PACKET_LOSS = "packet_loss"
+
+DIAGNOSTICS = (NETWORKS, CONNECTED_INFO, PACKET_LOSS)
+
+# Zeitlimits je Diagnose in Sekunden
+DEFAULT_TIMEOUTS = {
+    NETWORKS: 20.0,
+    CONNECTED_INFO: 5.0,
+    PACKET_LOSS: 10.0,
+}
+
+class DiagnosticsResult:
+    """Ergebnis aller Diagnosen, fehlgeschlagene Diagnosen stehen in errors."""
+
+    __slots__ = ("networks", "connected_info", "packet_loss", "errors", "durations")
+
+    def __init__(self):
+        self.networks = None
+        self.connected_info = None
+        self.packet_loss = None
+        self.errors = {}
+        self.durations = {}
+
+async def _in_thread(function, *args, **kwargs):
+    # Backend-Aufrufe blockieren und laufen deshalb im Thread-Pool; bei Abbruch oder
+    # Zeitlimit beendet das Event den Aufruf (z. B. wird ein netsh-Prozess beendet).
+    # Keine asyncio-Subprozesse: nicht jedes Backend startet Prozesse (native, Replay),
+    # das netsh-Backend beendet seinen Prozess selbst, sobald das Event gesetzt ist
+    stop = threading.Event()
+    try:
+        return await asyncio.to_thread(function, *args, cancel_event=stop, **kwargs)
+    finally:
+        stop.set()
+
+async def _scan(on_network=None):
+    # scan_networks wartet selbst auf einen laufenden Scan (z. B. der Überwachung)
+    return await _in_thread(scan_networks, on_network=on_network)
+
+async def _connected_info():
+    return await _in_thread(get_connected_network_info)
+
+async def _packet_loss(target=DEFAULT_TARGET):
+    with metrics.span("probe"):
+        return await _in_thread(get_backend().probe, target)
+
+async def _watch_cancel(cancel_event, tasks):
+    # threading.Event aus dem aufrufenden Thread abfragen und alle Diagnosen abbrechen
+    while not cancel_event.is_set():
+        await asyncio.sleep(0.1)
+    for task in tasks:
+        task.cancel()
+
+async def run_diagnostics(timeouts=None, on_network=None, on_result=None, cancel_event=None):
+    """Führt Scan, Verbindungsabfrage und Paketverlust-Test gleichzeitig aus.
+
+    Jede Diagnose hat ein eigenes Zeitlimit. Schlägt eine fehl, liefern die
+    anderen trotzdem ihr Ergebnis. on_result(name, value, error) wird aufgerufen,
+    sobald eine Diagnose fertig ist, on_network für jedes gelesene Netzwerk.
+    Der Paketverlust-Test liefert eine ProbeStatistics (siehe network.probe).
+    """
+    limits = dict(DEFAULT_TIMEOUTS)
+    limits.update(timeouts or {})
+    result = DiagnosticsResult()
+    started = time.perf_counter()
+
+    async def run_one(name, coroutine):
+        value = None
+        error = None
+        try:
+            value = await asyncio.wait_for(coroutine, limits[name])
+        except asyncio.TimeoutError:
+            error = f"Zeitlimit von {limits[name]:g} Sekunden überschritten"
+        except subprocess.CalledProcessError as e:
+            error = f"Befehl fehlgeschlagen: {str(e)}"
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = str(e)
+        result.durations[name] = time.perf_counter() - started
+        metrics.observe(f"diagnostics.{name}", result.durations[name])
+        if error is not None:
+            result.errors[name] = error
+        else:
+            setattr(result, name, value)
+        if on_result is not None:
+            on_result(name, value, error)
+
+    tasks = [
+        asyncio.create_task(run_one(NETWORKS, _scan(on_network))),
+        asyncio.create_task(run_one(CONNECTED_INFO, _connected_info())),
+        asyncio.create_task(run_one(PACKET_LOSS, _packet_loss())),
+    ]
+    watcher = asyncio.create_task(_watch_cancel(cancel_event, tasks)) if cancel_event is not None else None
+    try:
+        await asyncio.gather(*tasks)
+    except asyncio.CancelledError:
+        raise ScanCancelled()
+    finally:
+        if watcher is not None:
+            watcher.cancel()
+    return result
+
+def run_diagnostics_sync(timeouts=None, on_network=None, on_result=None, cancel_event=None):
+    """Wie run_diagnostics(), aber für Aufrufer ohne eigene Event-Loop (z. B. Worker-Threads)."""
+    return asyncio.run(run_diagnostics(timeouts, on_network, on_result, cancel_event))
@@ -0,0 +1,256 @@
+from network.interference import (CHANNEL_SLOTS, DEFAULT_SIGNAL_WEIGHT, MAX_INTERFERENCE, SCORE_DECIMALS,
+                                  InterferenceMap, channel_slot, overlap_scores)
+
+# NumPy ist optional und wird erst bei der ersten großen Bewertung importiert,
+# kleine Scans sind in reinem Python schneller als der Import (ca. 80 ms)
+np = None
+_numpy_loaded = False
+
+# Ab dieser Anzahl Access Points lohnt sich die Verarbeitung mit NumPy
+NUMPY_MIN_ROWS = 256
+
+# Schwellenwerte der Bewertungsregeln
+WEAK_SIGNAL_THRESHOLD = 30
+STRONG_SIGNAL_THRESHOLD = 50
+
+# Klassen der Authentifizierung (Bits 0-1 des Bewertungscodes)
+AUTH_SECURE = 0
+AUTH_OPEN = 1
+AUTH_WEP = 2
+AUTH_UNKNOWN = 3
+
+AUTH_CLASSES = {
+    "WPA2-Personal": AUTH_SECURE,
+    "WPA3-Personal": AUTH_SECURE,
+    "Offen": AUTH_OPEN,
+    "WEP": AUTH_WEP,
+}
+
+# Weitere Bits des Bewertungscodes
+WEAK_SIGNAL = 1 << 2
+HIGH_INTERFERENCE = 1 << 3
+RECOMMENDED = 1 << 4
+
+AUTH_MASK = 0b11
+
+_SECURITY_LABELS = {
+    AUTH_SECURE: "Sicher",
+    AUTH_OPEN: "Unsicher",
+    AUTH_WEP: "Unsicher",
+    AUTH_UNKNOWN: "Unbekannt",
+}
+
+_SECURITY_REASONS = {
+    AUTH_SECURE: "Sichere Verschlüsselung",
+    AUTH_OPEN: "Keine Verschlüsselung (offen)",
+    AUTH_WEP: "Veraltete Verschlüsselung (WEP)",
+    AUTH_UNKNOWN: "Unbekannte Verschlüsselung",
+}
+
+def numpy_module():
+    """Liefert NumPy oder None, wenn es nicht installiert ist; importiert beim ersten Aufruf."""
+    global np, _numpy_loaded
+    if not _numpy_loaded:
+        try:
+            import numpy
+            np = numpy
+        except ImportError:  # Ohne NumPy wird die reine Python-Variante verwendet
+            np = None
+        _numpy_loaded = True
+    return np
+
+def classify_auth(auth):
+    return AUTH_CLASSES.get(auth, AUTH_UNKNOWN)
+
+def signal_bucket(signal):
+    """Bereich des Signals, in dem die Bewertung gleich bleibt (0 = unbekannt, 1 = schwach, 2, 3 = stark)."""
+    if signal is None or signal < 0:
+        return 0
+    if signal < WEAK_SIGNAL_THRESHOLD:
+        return 1
+    return 2 if signal < STRONG_SIGNAL_THRESHOLD else 3
+
+def evaluate_columns(auth_classes, signals, channels, interference=None, channel_usage=None):
+    """Bewertet viele Access Points auf einmal.
+
+    Erwartet drei gleich lange Spalten: Authentifizierungsklasse (siehe
+    classify_auth), Signal in Prozent (-1 = unbekannt) und Kanal als Index nach
+    channel_slot() (0 = unbekannt).
+    Liefert die Bewertungscodes, die Kanalbelegung und die Interferenz je
+    Eintrag. Ohne interference werden Belegung und Interferenz aus den Spalten
+    selbst berechnet (siehe InterferenceMap). Ab NUMPY_MIN_ROWS Einträgen werden
+    Spalten mit NumPy als Arrays verarbeitet, sonst als Listen.
+    """
+    if len(channels) >= NUMPY_MIN_ROWS and numpy_module() is not None:
+        return _evaluate_columns_numpy(auth_classes, signals, channels, interference, channel_usage)
+    return _evaluate_columns_python(auth_classes, signals, channels, interference, channel_usage)
+
+def _interference_numpy(signals, channels):
+    # Belegung über zwei gewichtete Histogramme statt paarweiser Vergleiche,
+    # danach eine Faltung über die Kanäle (unabhängig von der Anzahl Access Points)
+    valid = (channels > 0) & (channels < CHANNEL_SLOTS)
+    index = np.where(valid, channels, 0)
+    weights = np.where(signals < 0, DEFAULT_SIGNAL_WEIGHT, signals / 100)
+    occupancy = np.bincount(index, weights=weights, minlength=CHANNEL_SLOTS)
+    occupancy[0] = 0
+    counts = np.bincount(index, minlength=CHANNEL_SLOTS)
+    counts[0] = 0
+    scores = np.asarray(overlap_scores(occupancy.tolist()))
+    interference = np.where(valid, np.maximum(0.0, np.round(scores[index] - weights, SCORE_DECIMALS)), 0.0)
+    return interference, counts[index]
+
+def interference_columns(signals, channels):
+    """Interferenz und Kanalbelegung je Eintrag der Signal- und Kanalspalte als Listen."""
+    if len(channels) >= NUMPY_MIN_ROWS and numpy_module() is not None:
+        interference, channel_usage = _interference_numpy(np.asarray(signals, dtype=np.int16),
+                                                          np.asarray(channels, dtype=np.int32))
+        return interference.tolist(), channel_usage.tolist()
+    return InterferenceMap(channels, signals).access_point_scores(channels, signals)
+
+def _evaluate_columns_numpy(auth_classes, signals, channels, interference=None, channel_usage=None):
+    auth_classes = np.asarray(auth_classes, dtype=np.int8)
+    signals = np.asarray(signals, dtype=np.int16)
+    channels = np.asarray(channels, dtype=np.int32)
+    if channels.size == 0:
+        return np.zeros(0, dtype=np.int8), np.zeros(0, dtype=np.int32), np.zeros(0)
+
+    if interference is None:
+        interference, channel_usage = _interference_numpy(signals, channels)
+    else:
+        interference = np.asarray(interference, dtype=np.float64)
+        channel_usage = np.asarray(channel_usage, dtype=np.int32)
+
+    secure = auth_classes == AUTH_SECURE
+    weak = secure & (signals >= 0) & (signals < WEAK_SIGNAL_THRESHOLD)
+    high_interference = secure & (interference > MAX_INTERFERENCE)
+    recommended = secure & ~weak & ~high_interference & (signals >= STRONG_SIGNAL_THRESHOLD)
+
+    codes = auth_classes.copy()
+    codes[weak] |= WEAK_SIGNAL
+    codes[high_interference] |= HIGH_INTERFERENCE
+    codes[recommended] |= RECOMMENDED
+    return codes, channel_usage, interference
+
+def _evaluate_columns_python(auth_classes, signals, channels, interference=None, channel_usage=None):
+    if interference is None:
+        interference, channel_usage = interference_columns(signals, channels)
+    codes = []
+    for auth_class, signal, score in zip(auth_classes, signals, interference):
+        code = auth_class
+        if auth_class == AUTH_SECURE:
+            if 0 <= signal < WEAK_SIGNAL_THRESHOLD:
+                code |= WEAK_SIGNAL
+            if score > MAX_INTERFERENCE:
+                code |= HIGH_INTERFERENCE
+            if not code & (WEAK_SIGNAL | HIGH_INTERFERENCE) and signal >= STRONG_SIGNAL_THRESHOLD:
+                code |= RECOMMENDED
+        codes.append(code)
+    return codes, channel_usage, interference
+
+def _columns(access_points):
+    signals = [-1 if ap.signal is None else ap.signal for ap in access_points]
+    channels = [channel_slot(ap.channel, ap.band) for ap in access_points]
+    return signals, channels
+
+def evaluate_access_points(access_points, interference=None, channel_usage=None, stable_signals=None):
+    """Bewertet eine Liste von Access Points und speichert Code, Kanalbelegung und Interferenz am Objekt.
+
+    interference und channel_usage enthalten bei Bedarf die schon berechneten
+    Werte je Access Point, z. B. wenn nur ein Teil eines Scans neu bewertet wird.
+    stable_signals ersetzt für die Signalschwellen das gemessene Signal, z. B.
+    durch das geglättete aus network.signal_series (-1 = unbekannt); die
+    Interferenz beruht immer auf dem gemessenen Signal.
+    """
+    auth_classes = [classify_auth(ap.auth) for ap in access_points]
+    signals, channels = _columns(access_points)
+    if interference is None:
+        interference, channel_usage = interference_columns(signals, channels)
+    if stable_signals is not None:
+        signals = stable_signals
+    codes, channel_usage, interference = evaluate_columns(auth_classes, signals, channels, interference, channel_usage)
+    if not isinstance(codes, list):
+        codes = codes.tolist()
+    if not isinstance(channel_usage, list):
+        channel_usage = channel_usage.tolist()
+        interference = interference.tolist()
+    for ap, code, usage, score, signal in zip(access_points, codes, channel_usage, interference, signals):
+        ap.verdict = code
+        ap.channel_usage = usage
+        ap.interference = score
+        ap.stable_signal = None if signal < 0 else signal
+
+def reevaluate_access_points(networks, previous, stable_signals=None):
+    """Bewertet einen erneuten Scan und rechnet nur Access Points mit geänderten Eingaben neu.
+
+    previous ordnet jeder BSSID ihren bewerteten Access Point aus dem letzten Scan
+    zu (z. B. der Index des Scan-Caches). Der Code wird übernommen, wenn
+    Authentifizierung, Verschlüsselung, Band, Kanal und Signalbereich gleich sind und
+    die Interferenz auf derselben Seite von MAX_INTERFERENCE liegt; die
+    Interferenz selbst hängt von den Signalen aller Access Points auf
+    überlappenden Kanälen ab und wird deshalb für alle in einem Durchlauf neu
+    berechnet. Alle übrigen Access Points werden zusammen bewertet.
+    stable_signals wie bei evaluate_access_points(), in der Reihenfolge der
+    Access Points je Netzwerk. Liefert die Anzahl der neu bewerteten Access Points.
+    """
+    access_points = [ap for net in networks for ap in net.access_points]
+    signals, channels = _columns(access_points)
+    interference, channel_usage = interference_columns(signals, channels)
+    if stable_signals is not None:
+        signals = stable_signals
+    get = previous.get
+    stale = []
+    stale_positions = []
+    position = 0
+    for net in networks:
+        auth = net.auth
+        encryption = net.encryption
+        for ap in net.access_points:
+            old = get(ap.bssid)
+            score = interference[position]
+            signal = signals[position]
+            if (old is not None and old.verdict is not None and old.channel == ap.channel and old.band == ap.band
+                    and signal_bucket(old.stable_signal) == signal_bucket(signal)
+                    and (old.interference > MAX_INTERFERENCE) == (score > MAX_INTERFERENCE)
+                    and old.network.auth == auth and old.network.encryption == encryption):
+                ap.verdict = old.verdict
+                ap.channel_usage = channel_usage[position]
+                ap.interference = score
+                ap.stable_signal = None if signal < 0 else signal
+            else:
+                stale.append(ap)
+                stale_positions.append(position)
+            position += 1
+    if stale:
+        evaluate_access_points(stale, [interference[position] for position in stale_positions],
+                               [channel_usage[position] for position in stale_positions],
+                               [signals[position] for position in stale_positions])
+    return len(stale)
+
+# Texte werden erst erzeugt, wenn sie angezeigt werden
+
+def security_text(code):
+    auth_class = code & AUTH_MASK
+    text = _SECURITY_LABELS[auth_class]
+    if code & WEAK_SIGNAL:
+        text = "Sicher, aber schwaches Signal"
+    if code & HIGH_INTERFERENCE:
+        text = f"{text}, hohe Interferenz"
+    return text
+
+def security_reason_text(code, channel_text, channel_usage, interference=0.0):
+    auth_class = code & AUTH_MASK
+    reason = _SECURITY_REASONS[auth_class]
+    if code & WEAK_SIGNAL:
+        reason = f"Sichere Verschlüsselung, aber schwaches Signal (< {WEAK_SIGNAL_THRESHOLD}%)"
+    if code & HIGH_INTERFERENCE:
+        reason = (f"{reason}, aber hohe Interferenz (Kanal {channel_text} wird von {channel_usage} Access Points genutzt, "
+                  f"Störgrad {interference:.1f} inkl. Nachbarkanälen)")
+    return reason
+
+def recommendation_text(code):
+    return "Empfohlen" if code & RECOMMENDED else "Nicht empfohlen"
+
+def recommendation_reason_text(code, auth, signal_text, channel_text, channel_usage, interference=0.0):
+    if code & RECOMMENDED:
+        return f"Sichere Verschlüsselung ({auth}), starkes Signal ({signal_text}), geringe Interferenz"
+    return security_reason_text(code, channel_text, channel_usage, interference)
@@ -0,0 +1,263 @@
+import atexit
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from network.snapshot import data_directory
+
+logger = logging.getLogger(__name__)
+
+# Pfad der Verlaufsdatenbank, "0" oder leer schaltet den Verlauf aus
+HISTORY_ENV = "WLAN_HISTORY"
+
+# Rohdaten werden nach einem Tag auf 5-Minuten-Mittelwerte verdichtet und nach 30 Tagen gelöscht
+RETENTION = 30 * 24 * 3600.0
+DOWNSAMPLE_AFTER = 24 * 3600.0
+DOWNSAMPLE_INTERVAL = 300
+
+# Verdichten und Löschen höchstens einmal pro Minute, nicht bei jedem Scan
+MAINTENANCE_INTERVAL = 60.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS observations (
+    ts REAL NOT NULL,
+    bssid TEXT NOT NULL,
+    ssid TEXT NOT NULL,
+    signal INTEGER,
+    channel INTEGER,
+    auth TEXT,
+    encryption TEXT,
+    resolution INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS observations_bssid_ts ON observations (bssid, ts);
+CREATE INDEX IF NOT EXISTS observations_ssid_ts ON observations (ssid, ts);
+CREATE INDEX IF NOT EXISTS observations_ts ON observations (ts);
+"""
+
+COLUMNS = "ts, bssid, ssid, signal, channel, auth, encryption, resolution"
+
+def default_history_path():
+    """Pfad der Verlaufsdatenbank aus WLAN_HISTORY oder im Benutzerverzeichnis, None wenn ausgeschaltet."""
+    path = os.environ.get(HISTORY_ENV)
+    if path is not None:
+        return None if path in ("", "0") else path
+    return os.path.join(data_directory(), "history.sqlite3")
+
+class Observation:
+    """Eine gespeicherte Beobachtung eines Access Points.
+
+    resolution ist 0 für Rohdaten, sonst die Breite des verdichteten Zeitfensters in
+    Sekunden (signal ist dann der Mittelwert im Fenster).
+    """
+
+    __slots__ = ("timestamp", "bssid", "ssid", "signal", "channel", "auth", "encryption", "resolution")
+
+    def __init__(self, timestamp, bssid, ssid, signal, channel, auth, encryption, resolution=0):
+        self.timestamp = timestamp
+        self.bssid = bssid
+        self.ssid = ssid
+        self.signal = signal
+        self.channel = channel
+        self.auth = auth
+        self.encryption = encryption
+        self.resolution = resolution
+
+    def __repr__(self):
+        return f"Observation({self.bssid!r}, ts={self.timestamp:.0f}, signal={self.signal})"
+
+def observation_rows(networks, timestamp):
+    # Zeilen für executemany, eine je Access Point
+    return [
+        (timestamp, ap.bssid, net.ssid, ap.signal, ap.channel, net.auth, net.encryption, 0)
+        for net in networks for ap in net.access_points
+    ]
+
+class ScanHistory:
+    """Scan-Verlauf in SQLite (WAL) mit Index nach BSSID, SSID und Zeit.
+
+    record() wandelt den Scan nur in Zeilen um und reicht sie an einen Schreib-Thread
+    weiter, der alle bis dahin angefallenen Scans in einer Transaktion einfügt. Lesende
+    Abfragen laufen über eine eigene Verbindung und blockieren das Schreiben nicht.
+    """
+
+    def __init__(self, path, retention=RETENTION, downsample_after=DOWNSAMPLE_AFTER,
+                 downsample_interval=DOWNSAMPLE_INTERVAL):
+        self.path = path
+        self.retention = retention
+        self.downsample_after = downsample_after
+        self.downsample_interval = downsample_interval
+        if path != ":memory:":
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+        self._writer = self._connect()
+        self._writer.executescript(SCHEMA)
+        self._reader = self._connect() if path != ":memory:" else self._writer
+        self._read_lock = threading.Lock()
+        # Teilen sich Lesen und Schreiben eine Verbindung (":memory:"), brauchen sie dieselbe Sperre
+        self._write_lock = self._read_lock if self._reader is self._writer else threading.Lock()
+        self._queue = queue.Queue()
+        self._last_maintenance = 0.0
+        self._thread = threading.Thread(target=self._run, name="ScanHistory", daemon=True)
+        self._thread.start()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        # Im WAL-Modus reicht NORMAL, ein Stromausfall kostet höchstens die letzten Scans
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def record(self, networks, timestamp=None):
+        """Merkt alle Access Points des Scans zum Speichern vor."""
+        rows = observation_rows(networks or (), time.time() if timestamp is None else timestamp)
+        if rows:
+            self._queue.put(rows)
+
+    def flush(self):
+        """Wartet, bis alle vorgemerkten Scans gespeichert sind."""
+        self._queue.join()
+
+    def close(self):
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        if self._reader is not self._writer:
+            self._reader.close()
+        self._writer.close()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            # Alles mitnehmen, was inzwischen angefallen ist, und gemeinsam schreiben
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            try:
+                self._write([row for rows in batch if rows is not None for row in rows])
+                if time.monotonic() - self._last_maintenance >= MAINTENANCE_INTERVAL:
+                    self.maintain()
+            except sqlite3.Error as e:
+                logger.warning("Scan-Verlauf konnte nicht gespeichert werden: %s", e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, rows):
+        if not rows:
+            return
+        with self._write_lock:
+            self._writer.execute("BEGIN")
+            try:
+                self._writer.executemany(f"INSERT INTO observations ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                self._writer.execute("COMMIT")
+            except BaseException:
+                self._writer.execute("ROLLBACK")
+                raise
+
+    def maintain(self, now=None):
+        """Verdichtet alte Rohdaten zu Mittelwerten je Zeitfenster und löscht abgelaufene Einträge."""
+        now = time.time() if now is None else now
+        self._last_maintenance = time.monotonic()
+        interval = self.downsample_interval
+        # Grenze auf ein ganzes Zeitfenster legen, damit kein Fenster zweimal verdichtet wird
+        cutoff = (now - self.downsample_after) // interval * interval
+        with self._write_lock:
+            self._writer.execute("BEGIN")
+            try:
+                self._writer.execute(
+                    f"INSERT INTO observations ({COLUMNS}) "
+                    "SELECT CAST(ts / :interval AS INTEGER) * :interval, bssid, MAX(ssid), "
+                    "CAST(ROUND(AVG(signal)) AS INTEGER), MAX(channel), MAX(auth), MAX(encryption), :interval "
+                    "FROM observations WHERE ts < :cutoff AND resolution = 0 "
+                    "GROUP BY bssid, CAST(ts / :interval AS INTEGER)",
+                    {"interval": interval, "cutoff": cutoff},
+                )
+                self._writer.execute("DELETE FROM observations WHERE ts < ? AND resolution = 0", (cutoff,))
+                self._writer.execute("DELETE FROM observations WHERE ts < ?", (now - self.retention,))
+                self._writer.execute("COMMIT")
+            except BaseException:
+                self._writer.execute("ROLLBACK")
+                raise
+
+    def _query(self, sql, parameters):
+        with self._read_lock:
+            return [Observation(*row) for row in self._reader.execute(sql, parameters)]
+
+    def last_seen(self, bssid):
+        """Letzte Beobachtung des Access Points oder None, wenn er nie gesehen wurde."""
+        rows = self._query(
+            f"SELECT {COLUMNS} FROM observations WHERE bssid = ? ORDER BY ts DESC LIMIT 1",
+            (bssid.lower(),),
+        )
+        return rows[0] if rows else None
+
+    def bssid_history(self, bssid, since=None, until=None):
+        """Beobachtungen eines Access Points im Zeitraum, zeitlich sortiert."""
+        return self._range("bssid", bssid.lower(), since, until)
+
+    def signal_trend(self, ssid, window=3600.0, now=None):
+        """Beobachtungen aller Access Points einer SSID in den letzten window Sekunden."""
+        now = time.time() if now is None else now
+        return self._range("ssid", ssid, now - window, None)
+
+    def _range(self, column, value, since, until):
+        return self._query(
+            f"SELECT {COLUMNS} FROM observations WHERE {column} = ? AND ts >= ? AND ts <= ? ORDER BY ts",
+            (value, float("-inf") if since is None else since, float("inf") if until is None else until),
+        )
+
+    def count(self):
+        with self._read_lock:
+            return self._reader.execute("SELECT COUNT(*) FROM observations").fetchone()[0]
+
+_history = None
+_history_opened = False
+_history_lock = threading.Lock()
+
+def get_history():
+    """Liefert den Scan-Verlauf, beim ersten Aufruf unter default_history_path() geöffnet.
+
+    None, wenn der Verlauf ausgeschaltet ist oder die Datenbank nicht geöffnet werden kann.
+    """
+    global _history, _history_opened
+    with _history_lock:
+        if not _history_opened:
+            _history_opened = True
+            path = default_history_path()
+            if path is not None:
+                try:
+                    _history = ScanHistory(path)
+                except (OSError, sqlite3.Error) as e:
+                    logger.warning("Scan-Verlauf %s konnte nicht geöffnet werden: %s", path, e)
+        return _history
+
+def set_history(history):
+    """Setzt den Scan-Verlauf (Objekt, Pfad oder None zum Ausschalten)."""
+    global _history, _history_opened
+    if isinstance(history, str):
+        history = ScanHistory(history)
+    with _history_lock:
+        previous = _history
+        _history = history
+        _history_opened = True
+    if previous is not None and previous is not history:
+        previous.close()
+    return history
+
+def close_history():
+    # Beim Beenden noch ausstehende Scans schreiben
+    with _history_lock:
+        history = _history
+    if history is not None:
+        history.close()
+
+atexit.register(close_history)
@@ -0,0 +1,156 @@
+BAND_24 = "2,4 GHz"
+BAND_5 = "5 GHz"
+BAND_6 = "6 GHz"
+
+# Belegung je Kanal in einer Spalte: im 2,4- und 5-GHz-Band ist der Index die
+# Kanalnummer (1-196), die 6-GHz-Kanäle 1-233 folgen ab BAND_6_OFFSET, weil sich
+# ihre Nummern mit denen der anderen Bänder überschneiden. 0 = unbekannt.
+BAND_6_OFFSET = 197
+BAND_6_MAX_CHANNEL = 233
+CHANNEL_SLOTS = BAND_6_OFFSET + BAND_6_MAX_CHANNEL + 1
+
+# 2,4 GHz: 20 MHz breite Kanäle im Abstand von 5 MHz überlappen bis zu vier Kanäle
+# weit, Gewicht je Kanalabstand (0 = gleicher Kanal). Im 5- und 6-GHz-Band
+# überlappen 20-MHz-Kanäle nicht, dort zählt nur der gleiche Kanal.
+OVERLAP_MASKS = {
+    BAND_24: (1.0, 0.8, 0.6, 0.4, 0.2),
+    BAND_5: (1.0,),
+    BAND_6: (1.0,),
+}
+
+BAND_CHANNELS = {
+    BAND_24: tuple(range(1, 15)),
+    BAND_5: (36, 40, 44, 48, 52, 56, 60, 64, 100, 104, 108, 112, 116, 120, 124, 128, 132, 136, 140, 144,
+             149, 153, 157, 161, 165),
+    BAND_6: tuple(range(1, BAND_6_MAX_CHANNEL + 1, 4)),
+}
+
+# Kanäle, die als bester Kanal vorgeschlagen werden (2,4 GHz: die drei überlappungsfreien,
+# 6 GHz: die Preferred Scanning Channels, die Geräte ohne Hinweis aus 2,4/5 GHz finden)
+SUGGESTED_CHANNELS = {
+    BAND_24: (1, 6, 11),
+    BAND_5: BAND_CHANNELS[BAND_5],
+    BAND_6: tuple(range(5, BAND_6_MAX_CHANNEL + 1, 16)),
+}
+
+# Gewicht eines Access Points mit unbekanntem Signal (wie 50 %)
+DEFAULT_SIGNAL_WEIGHT = 0.5
+
+# Ab dieser Interferenz gilt ein Kanal als überlastet; entspricht etwa drei weiteren
+# Access Points mit mittlerem Signal (50 %) auf demselben Kanal
+MAX_INTERFERENCE = 1.5
+
+# Nachkommastellen der Interferenz je Access Point
+SCORE_DECIMALS = 3
+_SCORE_SCALE = 10 ** SCORE_DECIMALS
+
+def channel_band(channel, band=None):
+    """Band eines Kanals oder None, wenn der Kanal unbekannt ist.
+
+    Ein gemeldetes band (z. B. von netsh oder aus der Frequenz) hat Vorrang, ohne
+    gilt die Kanalnummer; 6-GHz-Kanäle lassen sich nur über band erkennen.
+    """
+    if band in BAND_CHANNELS:
+        return band
+    if channel is None:
+        return None
+    if 1 <= channel <= 14:
+        return BAND_24
+    if 32 <= channel <= 177:
+        return BAND_5
+    return None
+
+def channel_slot(channel, band=None):
+    """Index des Kanals in den Spalten der Belegung (siehe CHANNEL_SLOTS), 0 = unbekannt."""
+    if not channel or channel < 0:
+        return 0
+    if band == BAND_6:
+        return BAND_6_OFFSET + channel if channel <= BAND_6_MAX_CHANNEL else 0
+    return channel if channel < BAND_6_OFFSET else 0
+
+def signal_weight(signal):
+    """Gewicht eines Access Points nach seinem Signal (0-100 %), -1 oder None = unbekannt."""
+    if signal is None or signal < 0:
+        return DEFAULT_SIGNAL_WEIGHT
+    return signal / 100
+
+def round_score(score):
+    """Rundet wie numpy.round(score, SCORE_DECIMALS), damit beide Varianten der Bewertung gleiche Werte liefern.
+
+    round(score, 3) rundet den exakten Dezimalwert der Gleitkommazahl, NumPy
+    skaliert erst und rundet dann; an Grenzen wie 2.0785 weichen beide ab.
+    """
+    return round(score * _SCORE_SCALE) / _SCORE_SCALE
+
+def overlap_scores(weights):
+    """Faltet die gewichtete Belegung je Kanal mit der Überlappungsmaske des Bands."""
+    # Im 5- und 6-GHz-Band ist die Maske (1.0,), dort bleibt die Belegung unverändert
+    scores = list(weights)
+    mask = OVERLAP_MASKS[BAND_24]
+    width = len(mask) - 1
+    for channel in BAND_CHANNELS[BAND_24]:
+        low = max(1, channel - width)
+        high = min(14, channel + width)
+        scores[channel] = sum(mask[abs(other - channel)] * weights[other] for other in range(low, high + 1))
+    return scores
+
+class InterferenceMap:
+    """Interferenz je Kanal aus einem Scan, nach Signal gewichtet und mit Nachbarkanälen.
+
+    Aufbau in O(n + Kanäle): ein Durchlauf über die Access Points füllt die
+    gewichtete Belegung je Kanal, danach wird je Band einmal mit der Maske der
+    Kanalüberlappung gefaltet. Die Interferenz eines Access Points ist die seines
+    Kanals ohne seinen eigenen Anteil, gemessen in Access Points mit vollem Signal.
+    Gezählt wird je Band und Kanal (siehe channel_slot()).
+    """
+
+    __slots__ = ("weights", "counts", "scores")
+
+    def __init__(self, slots, signals):
+        # slots und signals sind gleich lange Spalten (channel_slot() bzw. -1 oder None = unbekannt)
+        weights = [0.0] * CHANNEL_SLOTS
+        counts = [0] * CHANNEL_SLOTS
+        for slot, signal in zip(slots, signals):
+            if slot and 0 < slot < CHANNEL_SLOTS:
+                weights[slot] += DEFAULT_SIGNAL_WEIGHT if signal is None or signal < 0 else signal / 100
+                counts[slot] += 1
+        self.weights = weights
+        self.counts = counts
+        self.scores = overlap_scores(weights)
+
+    @classmethod
+    def from_networks(cls, networks):
+        access_points = [ap for net in networks or () for ap in net.access_points]
+        return cls([channel_slot(ap.channel, ap.band) for ap in access_points], [ap.signal for ap in access_points])
+
+    def channel_score(self, channel, band=None):
+        """Interferenz auf einem Kanal durch alle gesehenen Access Points."""
+        slot = channel_slot(channel, band)
+        return self.scores[slot] if slot else 0.0
+
+    def channel_count(self, channel, band=None):
+        """Anzahl der Access Points genau auf diesem Kanal."""
+        slot = channel_slot(channel, band)
+        return self.counts[slot] if slot else 0
+
+    def score(self, channel, signal, band=None):
+        """Interferenz für einen Access Point auf channel mit signal, ohne seinen eigenen Anteil."""
+        return self._slot_score(channel_slot(channel, band), signal)
+
+    def _slot_score(self, slot, signal):
+        if not slot or not 0 < slot < CHANNEL_SLOTS:
+            return 0.0
+        return max(0.0, round_score(self.scores[slot] - signal_weight(signal)))
+
+    def access_point_scores(self, slots, signals):
+        """Interferenz und Kanalbelegung je Eintrag zweier Spalten wie beim Aufbau."""
+        counts = self.counts
+        return ([self._slot_score(slot, signal) for slot, signal in zip(slots, signals)],
+                [counts[slot] if slot and 0 < slot < CHANNEL_SLOTS else 0 for slot in slots])
+
+    def channel_scores(self, band):
+        return {channel: self.scores[channel_slot(channel, band)] for channel in BAND_CHANNELS[band]}
+
+    def best_channel(self, band):
+        """Vorgeschlagener Kanal mit der geringsten Interferenz im Band (bei Gleichstand der niedrigste)."""
+        return min(SUGGESTED_CHANNELS[band], key=lambda channel: (self.scores[channel_slot(channel, band)], channel))
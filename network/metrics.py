@@ -0,0 +1,182 @@
+import atexit
+import bisect
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# Messungen einschalten ("1") und optional beim Beenden exportieren (Pfad auf .jsonl oder .prom)
+METRICS_ENV = "WLAN_METRICS"
+METRICS_FILE_ENV = "WLAN_METRICS_FILE"
+
+# Obergrenzen der Histogramm-Klassen in Sekunden
+BUCKETS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0)
+
+# Anzahl der letzten Messwerte je Schritt für Perzentile
+WINDOW_SIZE = 512
+
+class StageHistogram:
+    """Laufzeiten eines Verarbeitungsschritts.
+
+    Klassen, Summe und Anzahl zählen seit dem Start (für den Prometheus-Export),
+    Perzentile und letzter Wert beziehen sich auf die letzten WINDOW_SIZE Messungen.
+    """
+
+    __slots__ = ("bucket_counts", "count", "total", "window")
+
+    def __init__(self):
+        self.bucket_counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.window = deque(maxlen=WINDOW_SIZE)
+
+    def observe(self, seconds):
+        self.bucket_counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.window.append(seconds)
+
+    def percentile(self, percent):
+        if not self.window:
+            return None
+        ordered = sorted(self.window)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "last": self.window[-1] if self.window else None,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "max": max(self.window) if self.window else None,
+        }
+
+class _NullSpan:
+    # Wird bei ausgeschalteten Messungen zurückgegeben und tut nichts
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class _Span:
+    __slots__ = ("registry", "name", "started")
+
+    def __init__(self, registry, name):
+        self.registry = registry
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.registry.observe(self.name, time.perf_counter() - self.started)
+        return False
+
+class MetricsRegistry:
+    """Sammelt Laufzeiten (Spans) und Zähler der einzelnen Verarbeitungsschritte.
+
+    Ist die Messung ausgeschaltet, liefern span() und count() sofort zurück,
+    die Kosten beschränken sich auf eine Attributabfrage.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+
+    def span(self, name):
+        """Kontextmanager, der die Laufzeit des Blocks unter name erfasst."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def observe(self, name, seconds):
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = StageHistogram()
+            histogram.observe(seconds)
+
+    def count(self, name, value=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def snapshot(self):
+        """Aktueller Stand als Wörterbuch mit stages (Laufzeiten) und counters."""
+        with self._lock:
+            return {
+                "timestamp": time.time(),
+                "stages": {name: histogram.summary() for name, histogram in sorted(self._histograms.items())},
+                "counters": dict(sorted(self._counters.items())),
+            }
+
+    def export_jsonl(self, path):
+        """Hängt den aktuellen Stand als eine JSON-Zeile an die Datei an."""
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(self.snapshot()) + "\n")
+
+    def prometheus_text(self):
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+        lines = [
+            "# HELP wlan_stage_duration_seconds Laufzeit der Verarbeitungsschritte",
+            "# TYPE wlan_stage_duration_seconds histogram",
+        ]
+        for name, histogram in histograms:
+            cumulative = 0
+            for bound, bucket_count in zip(BUCKETS + (None,), histogram.bucket_counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound is None else f"{bound:g}"
+                lines.append(f'wlan_stage_duration_seconds_bucket{{stage="{name}",le="{le}"}} {cumulative}')
+            lines.append(f'wlan_stage_duration_seconds_sum{{stage="{name}"}} {histogram.total:.6f}')
+            lines.append(f'wlan_stage_duration_seconds_count{{stage="{name}"}} {histogram.count}')
+        lines += [
+            "# HELP wlan_events_total Zähler der Ereignisse",
+            "# TYPE wlan_events_total counter",
+        ]
+        lines += [f'wlan_events_total{{name="{name}"}} {value}' for name, value in counters]
+        return "\n".join(lines) + "\n"
+
+    def export_prometheus(self, path):
+        """Schreibt den Stand im Textformat von Prometheus (z. B. für den node_exporter)."""
+        # Erst vollständig schreiben, dann ersetzen, damit nie eine halbe Datei gelesen wird
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(self.prometheus_text())
+        os.replace(temp_path, path)
+
+    def export(self, path):
+        """Exportiert je nach Dateiendung als Prometheus-Text (.prom) oder JSON-Zeile."""
+        if path.endswith(".prom"):
+            self.export_prometheus(path)
+        else:
+            self.export_jsonl(path)
+
+metrics = MetricsRegistry(enabled=os.environ.get(METRICS_ENV, "") not in ("", "0"))
+
+def export_on_exit():
+    # Beim Beenden in die über WLAN_METRICS_FILE angegebene Datei exportieren
+    path = os.environ.get(METRICS_FILE_ENV)
+    if path and metrics.enabled:
+        metrics.export(path)
+
+atexit.register(export_on_exit)
@@ -0,0 +1,244 @@
+import sys
+from network.evaluation import security_text, security_reason_text, recommendation_text, recommendation_reason_text
+
+UNKNOWN = "Unbekannt"
+
+def intern_text(value):
+    # Wiederkehrende Texte (Authentifizierung, Funktyp, BSSID) nur einmal im Speicher halten
+    return sys.intern(value) if value else value
+
+def parse_percent(text):
+    """Wandelt eine Angabe wie '80%' in eine Zahl um, None bei unbekanntem Wert."""
+    text = text.strip() if text else ""
+    if text.endswith("%") and text[:-1].strip().isdigit():
+        return int(text[:-1])
+    return None
+
+def parse_channel(text):
+    """Wandelt eine Kanalangabe in eine Zahl um, None bei unbekanntem Wert."""
+    text = text.strip() if text else ""
+    return int(text) if text.isdigit() else None
+
+class AccessPoint:
+    """Ein einzelner Access Point (BSSID) eines WLAN-Netzwerks samt Bewertung."""
+
+    __slots__ = (
+        "network", "bssid", "signal", "channel", "band", "radio_type", "interface", "verdict", "channel_usage",
+        "interference", "stable_signal",
+    )
+
+    def __init__(self, network, bssid, signal=None, channel=None, radio_type=None, interface=None, band=None):
+        self.network = network
+        self.bssid = intern_text(bssid.lower())
+        self.signal = signal
+        self.channel = channel
+        # Frequenzband (BAND_* aus network.interference), None = nur aus dem Kanal ableitbar
+        self.band = intern_text(band)
+        self.radio_type = intern_text(radio_type)
+        # WLAN-Adapter, der den Access Point gemeldet hat (None = Standardadapter)
+        self.interface = intern_text(interface)
+        # Bewertungscode, Kanalbelegung und Interferenz, gesetzt von network.evaluation
+        self.verdict = None
+        self.channel_usage = 0
+        self.interference = 0.0
+        # Signal, auf dem die Bewertung beruht (geglättet, siehe network.signal_series)
+        self.stable_signal = None
+
+    @property
+    def ssid(self):
+        return self.network.ssid
+
+    @property
+    def auth(self):
+        return self.network.auth
+
+    @property
+    def encryption(self):
+        return self.network.encryption
+
+    @property
+    def signal_text(self):
+        return f"{self.signal}%" if self.signal is not None else UNKNOWN
+
+    @property
+    def evaluated_signal_text(self):
+        """Signal, auf dem die Bewertung beruht, mit dem Messwert, wenn das geglättete abweicht."""
+        if self.stable_signal is None or self.stable_signal == self.signal:
+            return self.signal_text
+        return f"{self.stable_signal}% geglättet, gemessen {self.signal_text}"
+
+    @property
+    def channel_text(self):
+        return str(self.channel) if self.channel is not None else UNKNOWN
+
+    @property
+    def is_evaluated(self):
+        return self.verdict is not None
+
+    # Texte der Bewertung werden erst beim Anzeigen erzeugt
+
+    @property
+    def security(self):
+        return security_text(self.verdict) if self.verdict is not None else None
+
+    @property
+    def security_reason(self):
+        if self.verdict is None:
+            return None
+        return security_reason_text(self.verdict, self.channel_text, self.channel_usage, self.interference)
+
+    @property
+    def recommendation(self):
+        return recommendation_text(self.verdict) if self.verdict is not None else None
+
+    @property
+    def recommendation_reason(self):
+        if self.verdict is None:
+            return None
+        return recommendation_reason_text(self.verdict, self.auth, self.evaluated_signal_text, self.channel_text,
+                                          self.channel_usage, self.interference)
+
+    def to_dict(self):
+        """Daten und Bewertung als JSON-taugliches Wörterbuch (ohne das Netzwerk)."""
+        return {
+            "bssid": self.bssid,
+            "signal": self.signal,
+            "channel": self.channel,
+            "band": self.band,
+            "radio_type": self.radio_type,
+            "interface": self.interface,
+            "verdict": self.verdict,
+            "channel_usage": self.channel_usage,
+            "interference": self.interference,
+            "stable_signal": self.stable_signal,
+            "security": self.security,
+            "recommendation": self.recommendation,
+        }
+
+    def __repr__(self):
+        return f"AccessPoint({self.bssid!r}, signal={self.signal}, channel={self.channel})"
+
+class Network:
+    """Ein WLAN-Netzwerk (SSID) mit allen gesehenen Access Points."""
+
+    __slots__ = ("ssid", "auth", "encryption", "access_points")
+
+    def __init__(self, ssid, auth=None, encryption=None):
+        self.ssid = intern_text(ssid)
+        self.auth = intern_text(auth)
+        self.encryption = intern_text(encryption)
+        self.access_points = []
+
+    def add_access_point(self, bssid, signal=None, channel=None, radio_type=None, interface=None, band=None):
+        ap = AccessPoint(self, bssid, signal, channel, radio_type, interface, band)
+        self.access_points.append(ap)
+        return ap
+
+    @property
+    def best_access_point(self):
+        """Access Point mit dem stärksten Signal oder None, wenn keiner gesehen wurde."""
+        if not self.access_points:
+            return None
+        return max(self.access_points, key=lambda ap: -1 if ap.signal is None else ap.signal)
+
+    def _best(self, attribute, default=None):
+        ap = self.best_access_point
+        value = getattr(ap, attribute) if ap is not None else None
+        return default if value is None else value
+
+    @property
+    def bssid(self):
+        return self._best("bssid")
+
+    @property
+    def signal(self):
+        return self._best("signal")
+
+    @property
+    def channel(self):
+        return self._best("channel")
+
+    @property
+    def band(self):
+        return self._best("band")
+
+    @property
+    def radio_type(self):
+        return self._best("radio_type")
+
+    @property
+    def interface(self):
+        return self._best("interface")
+
+    @property
+    def interference(self):
+        return self._best("interference", 0.0)
+
+    @property
+    def signal_text(self):
+        ap = self.best_access_point
+        return ap.signal_text if ap is not None else UNKNOWN
+
+    @property
+    def channel_text(self):
+        ap = self.best_access_point
+        return ap.channel_text if ap is not None else UNKNOWN
+
+    # Die Bewertung des Netzwerks entspricht der seines besten Access Points
+    @property
+    def security(self):
+        return self._best("security", UNKNOWN)
+
+    @property
+    def security_reason(self):
+        return self._best("security_reason", UNKNOWN)
+
+    @property
+    def recommendation(self):
+        return self._best("recommendation", UNKNOWN)
+
+    @property
+    def recommendation_reason(self):
+        return self._best("recommendation_reason", UNKNOWN)
+
+    @property
+    def ap_count(self):
+        return len(self.access_points)
+
+    @property
+    def channels(self):
+        """Sortierte Liste aller Kanäle, auf denen das Netzwerk gesehen wurde."""
+        return sorted({ap.channel for ap in self.access_points if ap.channel is not None})
+
+    @property
+    def average_signal(self):
+        signals = [ap.signal for ap in self.access_points if ap.signal is not None]
+        return round(sum(signals) / len(signals)) if signals else None
+
+    def to_dict(self):
+        """Netzwerk mit allen Access Points als JSON-taugliches Wörterbuch."""
+        return {
+            "ssid": self.ssid,
+            "auth": self.auth,
+            "encryption": self.encryption,
+            "security": self.security,
+            "recommendation": self.recommendation,
+            "recommendation_reason": self.recommendation_reason,
+            "access_points": [ap.to_dict() for ap in self.access_points],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Gegenstück zu to_dict(), die Texte der Bewertung werden aus dem Code neu erzeugt."""
+        net = cls(data["ssid"], data.get("auth"), data.get("encryption"))
+        for entry in data.get("access_points", ()):
+            ap = net.add_access_point(entry["bssid"], entry.get("signal"), entry.get("channel"), entry.get("radio_type"),
+                                      entry.get("interface"), entry.get("band"))
+            ap.verdict = entry.get("verdict")
+            ap.channel_usage = entry.get("channel_usage", 0)
+            ap.interference = entry.get("interference", 0.0)
+            ap.stable_signal = entry.get("stable_signal")
+        return net
+
+    def __repr__(self):
+        return f"Network({self.ssid!r}, auth={self.auth!r}, access_points={len(self.access_points)})"
@@ -0,0 +1,823 @@
+import ctypes
+import errno
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+from network.interference import BAND_24, BAND_5, BAND_6
+from network.models import UNKNOWN, Network
+from network.backends import ScannerBackend, ScanCancelled
+from network.profiles import build_profile_xml, profile_store
+
+# Wartezeit auf das Ende eines ausgelösten Scans in Sekunden
+SCAN_TIMEOUT = 10.0
+
+# Informationselemente (IEEE 802.11)
+IE_SSID = 0
+IE_HT_CAPABILITIES = 45
+IE_RSN = 48
+IE_VHT_CAPABILITIES = 191
+IE_VENDOR = 221
+IE_EXTENSION = 255
+IE_EXT_HE_CAPABILITIES = 35
+IE_EXT_EHT_CAPABILITIES = 108
+
+CAPABILITY_PRIVACY = 0x0010
+
+_WPA_OUI = b"\x00\x50\xf2\x01"
+
+# AKM-Suiten (00-0F-AC bzw. 00-50-F2) und die Bezeichnungen wie bei netsh
+_RSN_AKM = {
+    1: "WPA2-Enterprise",
+    2: "WPA2-Personal",
+    5: "WPA2-Enterprise",
+    6: "WPA2-Personal",
+    8: "WPA3-Personal",
+    12: "WPA3-Enterprise",
+    24: "WPA3-Personal",
+}
+_WPA_AKM = {
+    1: "WPA-Enterprise",
+    2: "WPA-Personal",
+}
+# Bei mehreren AKM-Suiten gilt die stärkste
+_AUTH_ORDER = ["WPA-Enterprise", "WPA-Personal", "WPA2-Enterprise", "WPA2-Personal", "WPA3-Enterprise", "WPA3-Personal"]
+
+_CIPHERS = {
+    1: "WEP",
+    2: "TKIP",
+    4: "CCMP",
+    5: "WEP",
+    8: "GCMP",
+    9: "GCMP",
+    10: "CCMP",
+}
+
+def parse_information_elements(data):
+    """Zerlegt die Informationselemente eines Beacons in eine Liste von (ID, Inhalt)."""
+    elements = []
+    offset = 0
+    while offset + 2 <= len(data):
+        element_id, length = data[offset], data[offset + 1]
+        body = data[offset + 2:offset + 2 + length]
+        if len(body) < length:
+            break
+        elements.append((element_id, body))
+        offset += 2 + length
+    return elements
+
+def _parse_suites(body, offset):
+    # Liste von Suiten (Anzahl + je 4 Byte), liefert die Suitentypen und den neuen Offset
+    if offset + 2 > len(body):
+        return [], offset
+    count = struct.unpack_from("<H", body, offset)[0]
+    offset += 2
+    suites = [body[offset + 4 * i + 3] for i in range(count) if offset + 4 * i + 4 <= len(body)]
+    return suites, offset + 4 * count
+
+def _security_from_suites(body, akm_names):
+    # Aufbau von RSN- und WPA-Element: Version, Gruppen-Cipher, paarweise Cipher, AKM-Suiten
+    pairwise, offset = _parse_suites(body, 6)
+    akms, _ = _parse_suites(body, offset)
+    names = [akm_names[akm] for akm in akms if akm in akm_names]
+    auth = max(names, key=_AUTH_ORDER.index) if names else None
+    encryption = next((_CIPHERS[cipher] for cipher in pairwise if cipher in _CIPHERS), None)
+    return auth, encryption
+
+def describe_security(elements, capability):
+    """Liefert (Authentifizierung, Verschlüsselung) mit den Bezeichnungen von netsh."""
+    wpa = None
+    for element_id, body in elements:
+        if element_id == IE_RSN:
+            auth, encryption = _security_from_suites(body, _RSN_AKM)
+            if auth is not None:
+                return auth, encryption or "CCMP"
+        elif element_id == IE_VENDOR and body[:4] == _WPA_OUI:
+            wpa = _security_from_suites(body[4:], _WPA_AKM)
+    if wpa is not None and wpa[0] is not None:
+        return wpa[0], wpa[1] or "TKIP"
+    if capability & CAPABILITY_PRIVACY:
+        return "WEP", "WEP"
+    return "Offen", "Keine"
+
+def radio_type(elements, frequency):
+    """Leitet den Funktyp (802.11a/g/n/ac/ax/be) aus den Fähigkeiten des Access Points ab."""
+    ids = {element_id for element_id, _ in elements}
+    extensions = {body[0] for element_id, body in elements if element_id == IE_EXTENSION and body}
+    if IE_EXT_EHT_CAPABILITIES in extensions:
+        return "802.11be"
+    if IE_EXT_HE_CAPABILITIES in extensions:
+        return "802.11ax"
+    if IE_VHT_CAPABILITIES in ids:
+        return "802.11ac"
+    if IE_HT_CAPABILITIES in ids:
+        return "802.11n"
+    return "802.11a" if frequency and frequency >= 5000 else "802.11g"
+
+def ssid_from_elements(elements):
+    for element_id, body in elements:
+        if element_id == IE_SSID:
+            return body.decode("utf-8", errors="replace")
+    return ""
+
+def frequency_to_channel(frequency):
+    """Kanalnummer zur Mittenfrequenz in MHz, None bei unbekannter Frequenz."""
+    if frequency == 2484:
+        return 14
+    if 2412 <= frequency <= 2472:
+        return (frequency - 2407) // 5
+    if 5955 <= frequency <= 7115:
+        return (frequency - 5950) // 5
+    if 5000 <= frequency <= 5900:
+        return (frequency - 5000) // 5
+    return None
+
+def frequency_to_band(frequency):
+    """Band (BAND_* aus network.interference) zur Mittenfrequenz in MHz, None bei unbekannter Frequenz."""
+    if not frequency:
+        return None
+    if 2412 <= frequency <= 2484:
+        return BAND_24
+    if 5955 <= frequency <= 7115:
+        return BAND_6
+    if 5000 <= frequency <= 5900:
+        return BAND_5
+    return None
+
+def dbm_to_percent(dbm):
+    # Gleiche Umrechnung wie Windows: -100 dBm = 0 %, -50 dBm = 100 %
+    return min(100, max(0, 2 * (dbm + 100)))
+
+def format_bssid(raw):
+    return ":".join(f"{byte:02x}" for byte in raw)
+
+def group_access_points(entries, interface=None):
+    """Fasst Access Points wie netsh nach (SSID, Authentifizierung, Verschlüsselung) zusammen.
+
+    entries sind Tupel (ssid, auth, encryption, bssid, signal, channel, radio_type, band),
+    interface wird an jedem Access Point als meldender Adapter vermerkt.
+    """
+    networks = {}
+    for ssid, auth, encryption, bssid, signal, channel, radio, band in entries:
+        key = (ssid, auth, encryption)
+        network = networks.get(key)
+        if network is None:
+            network = networks[key] = Network(ssid, auth, encryption)
+        network.add_access_point(bssid, signal, channel, radio, interface, band)
+    return list(networks.values())
+
+# Linux: nl80211 über Generic Netlink
+
+NETLINK_GENERIC = 16
+SOL_NETLINK = 270
+NETLINK_ADD_MEMBERSHIP = 1
+
+NLM_F_REQUEST = 0x1
+NLM_F_ACK = 0x4
+NLM_F_DUMP = 0x300
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+NLA_TYPE_MASK = 0x3FFF
+
+GENL_ID_CTRL = 0x10
+CTRL_CMD_GETFAMILY = 3
+CTRL_ATTR_FAMILY_ID = 1
+CTRL_ATTR_FAMILY_NAME = 2
+CTRL_ATTR_MCAST_GROUPS = 7
+CTRL_ATTR_MCAST_GRP_NAME = 1
+CTRL_ATTR_MCAST_GRP_ID = 2
+
+NL80211_CMD_GET_INTERFACE = 5
+NL80211_CMD_GET_STATION = 17
+NL80211_CMD_GET_SCAN = 32
+NL80211_CMD_TRIGGER_SCAN = 33
+NL80211_CMD_NEW_SCAN_RESULTS = 34
+NL80211_CMD_SCAN_ABORTED = 35
+
+NL80211_ATTR_IFINDEX = 3
+NL80211_ATTR_IFNAME = 4
+NL80211_ATTR_IFTYPE = 5
+NL80211_ATTR_STA_INFO = 21
+NL80211_ATTR_WIPHY_FREQ = 38
+NL80211_ATTR_BSS = 47
+NL80211_ATTR_SSID = 52
+
+NL80211_IFTYPE_STATION = 2
+
+NL80211_BSS_BSSID = 1
+NL80211_BSS_FREQUENCY = 2
+NL80211_BSS_CAPABILITY = 5
+NL80211_BSS_INFORMATION_ELEMENTS = 6
+NL80211_BSS_SIGNAL_MBM = 7
+NL80211_BSS_SIGNAL_UNSPEC = 8
+NL80211_BSS_STATUS = 9
+NL80211_BSS_BEACON_IES = 11
+
+NL80211_BSS_STATUS_ASSOCIATED = 1
+
+NL80211_STA_INFO_SIGNAL = 7
+NL80211_STA_INFO_TX_BITRATE = 8
+NL80211_STA_INFO_RX_BITRATE = 14
+NL80211_RATE_INFO_BITRATE = 1
+NL80211_RATE_INFO_BITRATE32 = 5
+
+def _attribute(attr_type, value):
+    length = 4 + len(value)
+    return struct.pack("=HH", length, attr_type) + value + b"\0" * (-length % 4)
+
+def parse_attributes(data):
+    """Zerlegt Netlink-Attribute in ein Wörterbuch {Typ: Rohdaten}."""
+    attributes = {}
+    offset = 0
+    while offset + 4 <= len(data):
+        length, attr_type = struct.unpack_from("=HH", data, offset)
+        if length < 4:
+            break
+        attributes[attr_type & NLA_TYPE_MASK] = data[offset + 4:offset + length]
+        offset += (length + 3) & ~3
+    return attributes
+
+def _u16(value):
+    return struct.unpack("=H", value[:2])[0]
+
+def _u32(value):
+    return struct.unpack("=I", value[:4])[0]
+
+def _s32(value):
+    return struct.unpack("=i", value[:4])[0]
+
+def _iter_messages(data):
+    # Liefert (Typ, Flags, Sequenz, Nutzdaten) aller Netlink-Nachrichten eines Puffers
+    offset = 0
+    while offset + 16 <= len(data):
+        length, msg_type, flags, sequence, _ = struct.unpack_from("=IHHII", data, offset)
+        if length < 16:
+            break
+        yield msg_type, flags, sequence, data[offset + 16:offset + length]
+        offset += (length + 3) & ~3
+
+def _open_netlink_socket():
+    sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_GENERIC)
+    sock.bind((0, 0))
+    return sock
+
+class Nl80211Client:
+    """Minimaler nl80211-Client über einen Netlink-Socket, ohne externe Programme."""
+
+    def __init__(self):
+        self.sock = _open_netlink_socket()
+        self._sequence = 0
+        self._lock = threading.Lock()
+        try:
+            reply = self._request(GENL_ID_CTRL, CTRL_CMD_GETFAMILY,
+                                  _attribute(CTRL_ATTR_FAMILY_NAME, b"nl80211\0"))[0]
+        except FileNotFoundError:
+            self.sock.close()
+            raise Exception("nl80211 ist auf diesem System nicht verfügbar")
+        self.family_id = _u16(reply[CTRL_ATTR_FAMILY_ID])
+        self.multicast_groups = {}
+        for group in parse_attributes(reply.get(CTRL_ATTR_MCAST_GROUPS, b"")).values():
+            group = parse_attributes(group)
+            name = group[CTRL_ATTR_MCAST_GRP_NAME].rstrip(b"\0").decode()
+            self.multicast_groups[name] = _u32(group[CTRL_ATTR_MCAST_GRP_ID])
+
+    def close(self):
+        self.sock.close()
+
+    def _request(self, family, command, attributes=b"", dump=False):
+        # Anfrage senden und alle Antworten bis DONE (Dump) bzw. ACK einsammeln
+        with self._lock:
+            self._sequence += 1
+            sequence = self._sequence
+            flags = NLM_F_REQUEST | (NLM_F_DUMP if dump else NLM_F_ACK)
+            payload = struct.pack("=BBH", command, 1, 0) + attributes
+            self.sock.send(struct.pack("=IHHII", 16 + len(payload), family, flags, sequence, 0) + payload)
+            replies = []
+            while True:
+                data = self.sock.recv(1 << 20)
+                for msg_type, _, msg_sequence, body in _iter_messages(data):
+                    if msg_sequence != sequence:
+                        continue
+                    if msg_type == NLMSG_DONE:
+                        return replies
+                    if msg_type == NLMSG_ERROR:
+                        code = -struct.unpack_from("=i", body)[0]
+                        if code:
+                            raise OSError(code, os.strerror(code))
+                        return replies
+                    replies.append(parse_attributes(body[4:]))
+
+    def _nl80211(self, command, attributes=b"", dump=False):
+        return self._request(self.family_id, command, attributes, dump)
+
+    def interfaces(self):
+        """Liefert die WLAN-Schnittstellen im Client-Modus als Liste von Attribut-Wörterbüchern."""
+        return [
+            reply for reply in self._nl80211(NL80211_CMD_GET_INTERFACE, dump=True)
+            if NL80211_ATTR_IFINDEX in reply
+            and _u32(reply.get(NL80211_ATTR_IFTYPE, b"\0\0\0\0")) == NL80211_IFTYPE_STATION
+        ]
+
+    def trigger_scan(self, ifindex, timeout=SCAN_TIMEOUT, cancel_event=None):
+        """Löst einen Scan aus und wartet auf die Ergebnisse.
+
+        Ohne CAP_NET_ADMIN ist das nicht erlaubt; dann liefert die Methode False und
+        es werden die Ergebnisse des letzten Scans des Systems verwendet.
+        """
+        group = self.multicast_groups.get("scan")
+        events = _open_netlink_socket()
+        try:
+            if group is not None:
+                # Vor dem Auslösen abonnieren, damit die Benachrichtigung nicht verloren geht
+                events.setsockopt(SOL_NETLINK, NETLINK_ADD_MEMBERSHIP, group)
+            try:
+                self._nl80211(NL80211_CMD_TRIGGER_SCAN, _attribute(NL80211_ATTR_IFINDEX, struct.pack("=I", ifindex)))
+            except PermissionError:
+                return False
+            except OSError as e:
+                # EBUSY: Es läuft bereits ein Scan, auf dessen Ergebnis wird ebenfalls gewartet
+                if e.errno != errno.EBUSY:
+                    raise
+            if group is None:
+                return True
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ScanCancelled()
+                events.settimeout(0.1)
+                try:
+                    data = events.recv(1 << 16)
+                except socket.timeout:
+                    continue
+                for msg_type, _, _, body in _iter_messages(data):
+                    if msg_type != self.family_id or body[0] not in (NL80211_CMD_NEW_SCAN_RESULTS, NL80211_CMD_SCAN_ABORTED):
+                        continue
+                    attributes = parse_attributes(body[4:])
+                    if _u32(attributes.get(NL80211_ATTR_IFINDEX, b"\0\0\0\0")) == ifindex:
+                        return body[0] == NL80211_CMD_NEW_SCAN_RESULTS
+            return True
+        finally:
+            events.close()
+
+    def scan_results(self, ifindex):
+        """Liefert die BSS-Einträge des Kernels (Attribut-Wörterbücher) für eine Schnittstelle."""
+        replies = self._nl80211(NL80211_CMD_GET_SCAN, _attribute(NL80211_ATTR_IFINDEX, struct.pack("=I", ifindex)), dump=True)
+        return [parse_attributes(reply[NL80211_ATTR_BSS]) for reply in replies if NL80211_ATTR_BSS in reply]
+
+    def station_info(self, ifindex):
+        """Signal und Datenraten zum verbundenen Access Point oder None."""
+        replies = self._nl80211(NL80211_CMD_GET_STATION, _attribute(NL80211_ATTR_IFINDEX, struct.pack("=I", ifindex)), dump=True)
+        for reply in replies:
+            if NL80211_ATTR_STA_INFO in reply:
+                return parse_attributes(reply[NL80211_ATTR_STA_INFO])
+        return None
+
+def _bitrate(rate_info):
+    # Datenrate in MBit/s aus einem verschachtelten rate_info-Attribut (Einheit 100 kbit/s)
+    if rate_info is None:
+        return None
+    attributes = parse_attributes(rate_info)
+    if NL80211_RATE_INFO_BITRATE32 in attributes:
+        return _u32(attributes[NL80211_RATE_INFO_BITRATE32]) / 10
+    if NL80211_RATE_INFO_BITRATE in attributes:
+        return _u16(attributes[NL80211_RATE_INFO_BITRATE]) / 10
+    return None
+
+def _bss_entry(bss):
+    elements = parse_information_elements(bss.get(NL80211_BSS_INFORMATION_ELEMENTS) or bss.get(NL80211_BSS_BEACON_IES, b""))
+    frequency = _u32(bss[NL80211_BSS_FREQUENCY]) if NL80211_BSS_FREQUENCY in bss else None
+    capability = _u16(bss[NL80211_BSS_CAPABILITY]) if NL80211_BSS_CAPABILITY in bss else 0
+    if NL80211_BSS_SIGNAL_MBM in bss:
+        signal = dbm_to_percent(_s32(bss[NL80211_BSS_SIGNAL_MBM]) // 100)
+    elif NL80211_BSS_SIGNAL_UNSPEC in bss:
+        signal = bss[NL80211_BSS_SIGNAL_UNSPEC][0]
+    else:
+        signal = None
+    auth, encryption = describe_security(elements, capability)
+    return (
+        ssid_from_elements(elements), auth, encryption, format_bssid(bss[NL80211_BSS_BSSID]), signal,
+        frequency_to_channel(frequency) if frequency else None, radio_type(elements, frequency),
+        frequency_to_band(frequency),
+    )
+
+def _interface_name(interface):
+    return interface[NL80211_ATTR_IFNAME].rstrip(b"\0").decode("utf-8", errors="replace") if NL80211_ATTR_IFNAME in interface else None
+
+class _LinuxWlan:
+    # Anfragen sind im Client gesperrt, gewartet wird je Scan auf einem eigenen
+    # Socket: Scans verschiedener Adapter können gleichzeitig laufen
+    parallel_scan = True
+
+    def __init__(self):
+        self.client = Nl80211Client()
+
+    def close(self):
+        self.client.close()
+
+    def _interfaces(self, name=None):
+        interfaces = self.client.interfaces()
+        if name is not None:
+            interfaces = [interface for interface in interfaces if _interface_name(interface) == name]
+        if not interfaces:
+            raise Exception(f"WLAN-Schnittstelle {name} nicht gefunden" if name else "Keine WLAN-Schnittstelle gefunden")
+        return interfaces
+
+    def interface_names(self):
+        return [name for name in map(_interface_name, self.client.interfaces()) if name is not None]
+
+    def scan(self, cancel_event=None, interface=None):
+        entries = []
+        for interface in self._interfaces(interface):
+            ifindex = _u32(interface[NL80211_ATTR_IFINDEX])
+            self.client.trigger_scan(ifindex, cancel_event=cancel_event)
+            entries.extend(_bss_entry(bss) for bss in self.client.scan_results(ifindex) if NL80211_BSS_BSSID in bss)
+        return entries
+
+    def connected_info(self, interface=None):
+        for interface in self._interfaces(interface):
+            ifindex = _u32(interface[NL80211_ATTR_IFINDEX])
+            associated = next((bss for bss in self.client.scan_results(ifindex)
+                               if NL80211_BSS_STATUS in bss and _u32(bss[NL80211_BSS_STATUS]) == NL80211_BSS_STATUS_ASSOCIATED), None)
+            if NL80211_ATTR_SSID in interface:
+                ssid = interface[NL80211_ATTR_SSID].decode("utf-8", errors="replace")
+            elif associated is not None:
+                ssid = _bss_entry(associated)[0]
+            else:
+                continue
+            info = {"ssid": ssid}
+            if NL80211_ATTR_IFNAME in interface:
+                info["interface"] = _interface_name(interface)
+            frequency = _u32(interface[NL80211_ATTR_WIPHY_FREQ]) if NL80211_ATTR_WIPHY_FREQ in interface else None
+            if frequency is None and associated is not None and NL80211_BSS_FREQUENCY in associated:
+                frequency = _u32(associated[NL80211_BSS_FREQUENCY])
+            if frequency:
+                channel = frequency_to_channel(frequency)
+                info["channel"] = str(channel) if channel is not None else UNKNOWN
+                info["band"] = frequency_to_band(frequency)
+            station = self.client.station_info(ifindex)
+            if station is not None:
+                if NL80211_STA_INFO_SIGNAL in station:
+                    dbm = struct.unpack("=b", station[NL80211_STA_INFO_SIGNAL][:1])[0]
+                    info["signal"] = f"{dbm_to_percent(dbm)}%"
+                for key, attribute in (("receive_rate", NL80211_STA_INFO_RX_BITRATE), ("transmit_rate", NL80211_STA_INFO_TX_BITRATE)):
+                    rate = _bitrate(station.get(attribute))
+                    if rate is not None:
+                        info[key] = f"{rate:g}"
+            return info
+        return None
+
+    def connect(self, ssid, password, auth, encryption):
+        # Die WPA-Anmeldung übernimmt unter Linux wpa_supplicant bzw. NetworkManager
+        raise Exception("Verbinden wird vom nativen Backend unter Linux nicht unterstützt")
+
+# Windows: Native WLAN API (wlanapi.dll) über ctypes
+
+class GUID(ctypes.Structure):
+    _fields_ = [
+        ("Data1", ctypes.c_ulong),
+        ("Data2", ctypes.c_ushort),
+        ("Data3", ctypes.c_ushort),
+        ("Data4", ctypes.c_ubyte * 8),
+    ]
+
+class DOT11_SSID(ctypes.Structure):
+    _fields_ = [
+        ("uSSIDLength", ctypes.c_ulong),
+        ("ucSSID", ctypes.c_ubyte * 32),
+    ]
+
+class WLAN_INTERFACE_INFO(ctypes.Structure):
+    _fields_ = [
+        ("InterfaceGuid", GUID),
+        ("strInterfaceDescription", ctypes.c_wchar * 256),
+        ("isState", ctypes.c_int),
+    ]
+
+class WLAN_INTERFACE_INFO_LIST(ctypes.Structure):
+    _fields_ = [
+        ("dwNumberOfItems", ctypes.c_ulong),
+        ("dwIndex", ctypes.c_ulong),
+        ("InterfaceInfo", WLAN_INTERFACE_INFO * 1),
+    ]
+
+class WLAN_RATE_SET(ctypes.Structure):
+    _fields_ = [
+        ("uRateSetLength", ctypes.c_ulong),
+        ("usRateSet", ctypes.c_ushort * 126),
+    ]
+
+class WLAN_BSS_ENTRY(ctypes.Structure):
+    _fields_ = [
+        ("dot11Ssid", DOT11_SSID),
+        ("uPhyId", ctypes.c_ulong),
+        ("dot11Bssid", ctypes.c_ubyte * 6),
+        ("dot11BssType", ctypes.c_int),
+        ("dot11BssPhyType", ctypes.c_int),
+        ("lRssi", ctypes.c_long),
+        ("uLinkQuality", ctypes.c_ulong),
+        ("bInRegDomain", ctypes.c_ubyte),
+        ("usBeaconPeriod", ctypes.c_ushort),
+        ("ullTimestamp", ctypes.c_ulonglong),
+        ("ullHostTimestamp", ctypes.c_ulonglong),
+        ("usCapabilityInformation", ctypes.c_ushort),
+        ("ulChCenterFrequency", ctypes.c_ulong),
+        ("wlanRateSet", WLAN_RATE_SET),
+        ("ulIeOffset", ctypes.c_ulong),
+        ("ulIeSize", ctypes.c_ulong),
+    ]
+
+class WLAN_BSS_LIST(ctypes.Structure):
+    _fields_ = [
+        ("dwTotalSize", ctypes.c_ulong),
+        ("dwNumberOfItems", ctypes.c_ulong),
+        ("wlanBssEntries", WLAN_BSS_ENTRY * 1),
+    ]
+
+class WLAN_ASSOCIATION_ATTRIBUTES(ctypes.Structure):
+    _fields_ = [
+        ("dot11Ssid", DOT11_SSID),
+        ("dot11BssType", ctypes.c_int),
+        ("dot11Bssid", ctypes.c_ubyte * 6),
+        ("dot11PhyType", ctypes.c_int),
+        ("uDot11PhyIndex", ctypes.c_ulong),
+        ("wlanSignalQuality", ctypes.c_ulong),
+        ("ulRxRate", ctypes.c_ulong),
+        ("ulTxRate", ctypes.c_ulong),
+    ]
+
+class WLAN_SECURITY_ATTRIBUTES(ctypes.Structure):
+    _fields_ = [
+        ("bSecurityEnabled", ctypes.c_int),
+        ("bOneXEnabled", ctypes.c_int),
+        ("dot11AuthAlgorithm", ctypes.c_int),
+        ("dot11CipherAlgorithm", ctypes.c_int),
+    ]
+
+class WLAN_CONNECTION_ATTRIBUTES(ctypes.Structure):
+    _fields_ = [
+        ("isState", ctypes.c_int),
+        ("wlanConnectionMode", ctypes.c_int),
+        ("strProfileName", ctypes.c_wchar * 256),
+        ("wlanAssociationAttributes", WLAN_ASSOCIATION_ATTRIBUTES),
+        ("wlanSecurityAttributes", WLAN_SECURITY_ATTRIBUTES),
+    ]
+
+class WLAN_CONNECTION_PARAMETERS(ctypes.Structure):
+    _fields_ = [
+        ("wlanConnectionMode", ctypes.c_int),
+        ("strProfile", ctypes.c_wchar_p),
+        ("pDot11Ssid", ctypes.POINTER(DOT11_SSID)),
+        ("pDesiredBssidList", ctypes.c_void_p),
+        ("dot11BssType", ctypes.c_int),
+        ("dwFlags", ctypes.c_ulong),
+    ]
+
+class WLAN_NOTIFICATION_DATA(ctypes.Structure):
+    _fields_ = [
+        ("NotificationSource", ctypes.c_ulong),
+        ("NotificationCode", ctypes.c_ulong),
+        ("InterfaceGuid", GUID),
+        ("dwDataSize", ctypes.c_ulong),
+        ("pData", ctypes.c_void_p),
+    ]
+
+WLAN_CLIENT_VERSION = 2
+WLAN_NOTIFICATION_SOURCE_NONE = 0
+WLAN_NOTIFICATION_SOURCE_ACM = 0x8
+WLAN_NOTIFICATION_ACM_CONNECTION_COMPLETE = 10
+WLAN_NOTIFICATION_ACM_SCAN_COMPLETE = 7
+WLAN_NOTIFICATION_ACM_SCAN_FAIL = 8
+WLAN_NOTIFICATION_ACM_CONNECTION_ATTEMPT_FAIL = 11
+WLAN_INTF_OPCODE_CURRENT_CONNECTION = 7
+WLAN_INTF_OPCODE_CHANNEL_NUMBER = 8
+WLAN_INTERFACE_STATE_CONNECTED = 1
+WLAN_CONNECTION_MODE_PROFILE = 0
+DOT11_BSS_TYPE_INFRASTRUCTURE = 1
+DOT11_BSS_TYPE_ANY = 3
+ERROR_NOT_FOUND = 1168
+ERROR_INVALID_STATE = 5023
+
+# Wartezeit auf das Ergebnis eines Verbindungsaufbaus in Sekunden
+CONNECT_TIMEOUT = 20.0
+
+class _WindowsWlan:
+    # Scans warten über eine Benachrichtigung am gemeinsamen Handle, die jeweils
+    # nur ein Aufrufer registrieren kann: Adapter werden nacheinander gescannt
+    parallel_scan = False
+
+    def __init__(self):
+        self.api = ctypes.WinDLL("wlanapi.dll")
+        self.handle = ctypes.c_void_p()
+        negotiated_version = ctypes.c_ulong()
+        self._check(self.api.WlanOpenHandle(WLAN_CLIENT_VERSION, None, ctypes.byref(negotiated_version),
+                                            ctypes.byref(self.handle)), "WlanOpenHandle")
+
+    def close(self):
+        if self.handle:
+            self.api.WlanCloseHandle(self.handle, None)
+            self.handle = ctypes.c_void_p()
+
+    @staticmethod
+    def _check(result, function):
+        if result != 0:
+            raise Exception(f"Fehler in {function}: {ctypes.FormatError(result)} ({result})")
+
+    def _interfaces(self, name=None):
+        interface_list = ctypes.POINTER(WLAN_INTERFACE_INFO_LIST)()
+        self._check(self.api.WlanEnumInterfaces(self.handle, None, ctypes.byref(interface_list)), "WlanEnumInterfaces")
+        try:
+            count = interface_list.contents.dwNumberOfItems
+            items = (WLAN_INTERFACE_INFO * count).from_address(
+                ctypes.addressof(interface_list.contents.InterfaceInfo))
+            # Kopien anlegen, der Speicher wird unten freigegeben
+            interfaces = [WLAN_INTERFACE_INFO.from_buffer_copy(item) for item in items]
+        finally:
+            self.api.WlanFreeMemory(interface_list)
+        if name is not None:
+            interfaces = [interface for interface in interfaces if interface.strInterfaceDescription == name]
+        if not interfaces:
+            raise Exception(f"WLAN-Schnittstelle {name} nicht gefunden" if name else "Keine WLAN-Schnittstelle gefunden")
+        return interfaces
+
+    def interface_names(self):
+        return [interface.strInterfaceDescription for interface in self._interfaces()]
+
+    def _wait_for_notification(self, start, guid, done_codes, failed_codes, timeout, cancel_event=None):
+        # Über WlanRegisterNotification auf das Ende eines asynchronen Vorgangs warten
+        finished = threading.Event()
+        outcome = []
+        callback_type = ctypes.WINFUNCTYPE(None, ctypes.POINTER(WLAN_NOTIFICATION_DATA), ctypes.c_void_p)
+
+        def on_notification(data, context):
+            code = data.contents.NotificationCode
+            if bytes(data.contents.InterfaceGuid) == bytes(guid) and code in done_codes + failed_codes:
+                outcome.append(code in done_codes)
+                finished.set()
+
+        callback = callback_type(on_notification)
+        self._check(self.api.WlanRegisterNotification(self.handle, WLAN_NOTIFICATION_SOURCE_ACM, True, callback,
+                                                      None, None, None), "WlanRegisterNotification")
+        try:
+            start()
+            deadline = time.monotonic() + timeout
+            while not finished.wait(0.1):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ScanCancelled()
+                if time.monotonic() >= deadline:
+                    return None
+            return outcome[0]
+        finally:
+            self.api.WlanRegisterNotification(self.handle, WLAN_NOTIFICATION_SOURCE_NONE, True, None, None, None, None)
+
+    def scan(self, cancel_event=None, interface=None):
+        entries = []
+        for interface in self._interfaces(interface):
+            guid = interface.InterfaceGuid
+            self._wait_for_notification(
+                lambda: self._check(self.api.WlanScan(self.handle, ctypes.byref(guid), None, None, None), "WlanScan"),
+                guid, (WLAN_NOTIFICATION_ACM_SCAN_COMPLETE,), (WLAN_NOTIFICATION_ACM_SCAN_FAIL,),
+                SCAN_TIMEOUT, cancel_event)
+            entries.extend(self._bss_entries(guid))
+        return entries
+
+    def _bss_entries(self, guid):
+        bss_list = ctypes.POINTER(WLAN_BSS_LIST)()
+        self._check(self.api.WlanGetNetworkBssList(self.handle, ctypes.byref(guid), None, DOT11_BSS_TYPE_ANY,
+                                                   False, None, ctypes.byref(bss_list)), "WlanGetNetworkBssList")
+        try:
+            count = bss_list.contents.dwNumberOfItems
+            bss_entries = (WLAN_BSS_ENTRY * count).from_address(ctypes.addressof(bss_list.contents.wlanBssEntries))
+            entries = []
+            for entry in bss_entries:
+                ie_data = ctypes.string_at(ctypes.addressof(entry) + entry.ulIeOffset, entry.ulIeSize)
+                elements = parse_information_elements(ie_data)
+                frequency = entry.ulChCenterFrequency // 1000
+                auth, encryption = describe_security(elements, entry.usCapabilityInformation)
+                ssid = bytes(entry.dot11Ssid.ucSSID[:entry.dot11Ssid.uSSIDLength]).decode("utf-8", errors="replace")
+                entries.append((
+                    ssid, auth, encryption, format_bssid(entry.dot11Bssid), entry.uLinkQuality,
+                    frequency_to_channel(frequency), radio_type(elements, frequency), frequency_to_band(frequency),
+                ))
+            return entries
+        finally:
+            self.api.WlanFreeMemory(bss_list)
+
+    def _query(self, guid, opcode, structure):
+        size = ctypes.c_ulong()
+        data = ctypes.c_void_p()
+        result = self.api.WlanQueryInterface(self.handle, ctypes.byref(guid), opcode, None,
+                                             ctypes.byref(size), ctypes.byref(data), None)
+        if result in (ERROR_NOT_FOUND, ERROR_INVALID_STATE):
+            return None
+        self._check(result, "WlanQueryInterface")
+        try:
+            return structure.from_buffer_copy(ctypes.string_at(data, ctypes.sizeof(structure)))
+        finally:
+            self.api.WlanFreeMemory(data)
+
+    def connected_info(self, interface=None):
+        for interface in self._interfaces(interface):
+            if interface.isState != WLAN_INTERFACE_STATE_CONNECTED:
+                continue
+            guid = interface.InterfaceGuid
+            connection = self._query(guid, WLAN_INTF_OPCODE_CURRENT_CONNECTION, WLAN_CONNECTION_ATTRIBUTES)
+            if connection is None:
+                continue
+            association = connection.wlanAssociationAttributes
+            ssid = bytes(association.dot11Ssid.ucSSID[:association.dot11Ssid.uSSIDLength])
+            # Datenraten werden in kbit/s geliefert
+            info = {
+                "ssid": ssid.decode("utf-8", errors="replace"),
+                "signal": f"{association.wlanSignalQuality}%",
+                "receive_rate": f"{association.ulRxRate / 1000:g}",
+                "transmit_rate": f"{association.ulTxRate / 1000:g}",
+                "interface": interface.strInterfaceDescription,
+            }
+            channel = self._query(guid, WLAN_INTF_OPCODE_CHANNEL_NUMBER, ctypes.c_ulong)
+            if channel is not None:
+                info["channel"] = str(channel.value)
+            return info
+        return None
+
+    def connect(self, ssid, password, auth, encryption):
+        guid = self._interfaces()[0].InterfaceGuid
+        fingerprint = profile_store.fingerprint(ssid, password, auth, encryption)
+        if profile_store.is_installed(ssid, fingerprint):
+            # Profil unverändert: ohne WlanSetProfile verbinden, bei Fehlschlag neu setzen
+            if self._connect_profile(guid, ssid):
+                return "Erfolgreich verbunden"
+            profile_store.forget(ssid)
+        reason = ctypes.c_ulong()
+        # Profil ohne temporäre Datei setzen, ein vorhandenes Profil wird überschrieben
+        self._check(self.api.WlanSetProfile(self.handle, ctypes.byref(guid), 0,
+                                            ctypes.c_wchar_p(build_profile_xml(ssid, password, auth, encryption)),
+                                            None, True, None, ctypes.byref(reason)), "WlanSetProfile")
+        profile_store.remember(ssid, fingerprint)
+        if not self._connect_profile(guid, ssid):
+            profile_store.forget(ssid)
+            raise Exception(f"Fehler beim Verbinden mit {ssid}")
+        return "Erfolgreich verbunden"
+
+    def _connect_profile(self, guid, ssid):
+        parameters = WLAN_CONNECTION_PARAMETERS(WLAN_CONNECTION_MODE_PROFILE, ssid, None, None,
+                                                DOT11_BSS_TYPE_INFRASTRUCTURE, 0)
+        return self._wait_for_notification(
+            lambda: self._check(self.api.WlanConnect(self.handle, ctypes.byref(guid), ctypes.byref(parameters), None),
+                                "WlanConnect"),
+            guid, (WLAN_NOTIFICATION_ACM_CONNECTION_COMPLETE,), (WLAN_NOTIFICATION_ACM_CONNECTION_ATTEMPT_FAIL,),
+            CONNECT_TIMEOUT)
+
+class NativeBackend(ScannerBackend):
+    """Fragt die WLAN-Daten direkt beim Betriebssystem ab, ohne Prozesse zu starten.
+
+    Unter Linux über nl80211 (Netlink), unter Windows über die Native WLAN API.
+    Ein Scan wird nur ausgelöst, wenn die Rechte dafür reichen (Linux: CAP_NET_ADMIN),
+    sonst werden die zuletzt vom System gesehenen Access Points geliefert.
+    """
+
+    name = "native"
+
+    def __init__(self):
+        self._wlan = _WindowsWlan() if sys.platform == "win32" else _LinuxWlan()
+        # Die Netlink- bzw. WLAN-API-Sitzung wird von mehreren Threads genutzt
+        self._lock = threading.Lock()
+
+    @classmethod
+    def is_available(cls):
+        # Probeweise öffnen und sofort wieder schließen (Netlink-Socket bzw. WLAN-API-Handle)
+        try:
+            backend = cls()
+        except Exception:
+            return False
+        backend.close()
+        return True
+
+    def close(self):
+        with self._lock:
+            self._wlan.close()
+
+    def interfaces(self, cancel_event=None):
+        with self._lock:
+            return self._wlan.interface_names()
+
+    def iter_networks(self, cancel_event=None, interface=None):
+        if cancel_event is not None and cancel_event.is_set():
+            raise ScanCancelled()
+        if interface is not None and self._wlan.parallel_scan:
+            entries = self._wlan.scan(cancel_event, interface)
+        else:
+            with self._lock:
+                entries = self._wlan.scan(cancel_event, interface)
+        yield from group_access_points(entries, interface)
+
+    def connected_info(self, cancel_event=None, interface=None):
+        if cancel_event is not None and cancel_event.is_set():
+            raise ScanCancelled()
+        with self._lock:
+            return self._wlan.connected_info(interface)
+
+    def connect(self, ssid, password, auth="WPA2PSK", encryption="AES"):
+        with self._lock:
+            return self._wlan.connect(ssid, password, auth, encryption)
@@ -0,0 +1,336 @@
+import os
+import socket
+import struct
+import threading
+import time
+
+# Messverfahren
+PROBE_TCP = "tcp"
+PROBE_UDP = "udp"
+PROBE_ICMP = "icmp"
+
+DEFAULT_COUNT = 4
+DEFAULT_INTERVAL = 0.2
+DEFAULT_TIMEOUT = 1.0
+
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+
+# Maximale Wartezeit am Stück, damit ein Abbruch schnell wirkt
+CANCEL_POLL_INTERVAL = 0.1
+
+class ProbeTarget:
+    """Ziel einer Messung: Host, Port (bei TCP/UDP) und Verfahren."""
+
+    __slots__ = ("host", "port", "method")
+
+    def __init__(self, host, port=None, method=PROBE_TCP):
+        if method != PROBE_ICMP and port is None:
+            raise ValueError(f"Für {method.upper()}-Messungen wird ein Port benötigt")
+        self.host = host
+        self.port = port
+        self.method = method
+
+    def to_dict(self):
+        return {"host": self.host, "port": self.port, "method": self.method}
+
+    def __repr__(self):
+        port = f":{self.port}" if self.port is not None else ""
+        return f"ProbeTarget({self.method}://{self.host}{port})"
+
+# Standardziel: TCP-Verbindungsaufbau zum Google-DNS, funktioniert ohne Administratorrechte
+DEFAULT_TARGET = ProbeTarget("8.8.8.8", 53, PROBE_TCP)
+
+class ProbeResult:
+    """Ergebnis einer einzelnen Messung, rtt ist None bei Verlust."""
+
+    __slots__ = ("target", "sequence", "rtt", "error")
+
+    def __init__(self, target, sequence, rtt, error=None):
+        self.target = target
+        self.sequence = sequence
+        self.rtt = rtt
+        self.error = error
+
+    @property
+    def lost(self):
+        return self.rtt is None
+
+    def __repr__(self):
+        rtt = f"{self.rtt * 1000:.1f} ms" if self.rtt is not None else "verloren"
+        return f"ProbeResult({self.target!r}, #{self.sequence}, {rtt})"
+
+class ProbeStatistics:
+    """Zusammenfassung einer Messreihe: Verlust, Laufzeit-Perzentile und Jitter (in Sekunden)."""
+
+    __slots__ = ("target", "sent", "received", "rtt_min", "rtt_avg", "rtt_max",
+                 "rtt_p50", "rtt_p90", "rtt_p99", "jitter")
+
+    def __init__(self, target, sent, received, rtts, jitter):
+        self.target = target
+        self.sent = sent
+        self.received = received
+        ordered = sorted(rtts)
+        self.rtt_min = ordered[0] if ordered else None
+        self.rtt_max = ordered[-1] if ordered else None
+        self.rtt_avg = sum(ordered) / len(ordered) if ordered else None
+        self.rtt_p50 = _percentile(ordered, 50)
+        self.rtt_p90 = _percentile(ordered, 90)
+        self.rtt_p99 = _percentile(ordered, 99)
+        self.jitter = jitter
+
+    @property
+    def loss_percent(self):
+        return 100.0 * (self.sent - self.received) / self.sent if self.sent else 0.0
+
+    def to_dict(self):
+        """Zusammenfassung als JSON-taugliches Wörterbuch (Zeiten in Sekunden)."""
+        return {
+            "target": self.target.to_dict(),
+            "sent": self.sent,
+            "received": self.received,
+            "loss_percent": self.loss_percent,
+            "rtt_min": self.rtt_min,
+            "rtt_avg": self.rtt_avg,
+            "rtt_max": self.rtt_max,
+            "rtt_p50": self.rtt_p50,
+            "rtt_p90": self.rtt_p90,
+            "rtt_p99": self.rtt_p99,
+            "jitter": self.jitter,
+        }
+
+    def __repr__(self):
+        return f"ProbeStatistics({self.target!r}, {self.received}/{self.sent}, loss={self.loss_percent:.0f}%)"
+
+def _percentile(ordered, percent):
+    # Lineare Interpolation zwischen den benachbarten Werten
+    if not ordered:
+        return None
+    position = (len(ordered) - 1) * percent / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+def compute_statistics(target, results):
+    """Berechnet Verlust, Perzentile und Jitter aus einzelnen Messergebnissen."""
+    rtts = [result.rtt for result in results if result.rtt is not None]
+    # Jitter: mittlere Differenz aufeinanderfolgender Laufzeiten
+    differences = [abs(b - a) for a, b in zip(rtts, rtts[1:])]
+    jitter = sum(differences) / len(differences) if differences else (0.0 if rtts else None)
+    return ProbeStatistics(target, len(results), len(rtts), rtts, jitter)
+
+def _probe_tcp(target, sequence, timeout, context):
+    started = time.perf_counter()
+    try:
+        with socket.create_connection((target.host, target.port), timeout=timeout):
+            pass
+    except ConnectionRefusedError:
+        # Eine Ablehnung (RST) kommt ebenfalls vom Ziel zurück und zählt als Antwort
+        pass
+    return time.perf_counter() - started
+
+def _receive(sock, deadline, context, size):
+    # Auf eine Antwort warten, dabei regelmäßig auf Abbruch prüfen
+    cancel_event = context.get("cancel_event")
+    while True:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0 or (cancel_event is not None and cancel_event.is_set()):
+            raise socket.timeout()
+        sock.settimeout(min(remaining, CANCEL_POLL_INTERVAL))
+        try:
+            return sock.recv(size)
+        except socket.timeout:
+            continue
+
+def _probe_udp(target, sequence, timeout, context):
+    sock = context.get("socket")
+    if sock is None:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.connect((target.host, target.port))
+        context["socket"] = sock
+    token = context.setdefault("token", os.urandom(4))
+    payload = token + struct.pack("!I", sequence)
+    started = time.perf_counter()
+    sock.send(payload)
+    deadline = started + timeout
+    while True:
+        reply = _receive(sock, deadline, context, 64)
+        # Verspätete Antworten früherer Messungen ignorieren
+        if reply == payload:
+            return time.perf_counter() - started
+
+def _icmp_checksum(data):
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+def _open_icmp_socket():
+    # Zuerst unprivilegiertes ICMP (Linux/macOS), sonst Raw-Socket (Administratorrechte)
+    try:
+        return socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP), False
+    except (PermissionError, OSError):
+        return socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP), True
+
+def _probe_icmp(target, sequence, timeout, context):
+    if "socket" not in context:
+        context["socket"], context["raw"] = _open_icmp_socket()
+        context["identifier"] = os.getpid() & 0xFFFF
+    sock = context["socket"]
+    identifier = context["identifier"]
+    sequence &= 0xFFFF
+    body = struct.pack("!d", time.time())
+    header = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, 0, identifier, sequence)
+    checksum = _icmp_checksum(header + body)
+    packet = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, checksum, identifier, sequence) + body
+    started = time.perf_counter()
+    sock.sendto(packet, (target.host, 0))
+    deadline = started + timeout
+    while True:
+        reply = _receive(sock, deadline, context, 1024)
+        if context["raw"]:
+            # Raw-Sockets liefern den IP-Header mit
+            reply = reply[(reply[0] & 0x0F) * 4:]
+        if len(reply) < 8:
+            continue
+        reply_type, _, _, _, reply_sequence = struct.unpack("!BBHHH", reply[:8])
+        # Beim unprivilegierten Socket setzt der Kernel die Kennung selbst, daher nur die Sequenz prüfen
+        if reply_type == ICMP_ECHO_REPLY and reply_sequence == sequence:
+            return time.perf_counter() - started
+
+_PROBES = {
+    PROBE_TCP: _probe_tcp,
+    PROBE_UDP: _probe_udp,
+    PROBE_ICMP: _probe_icmp,
+}
+
+def iter_probes(target, count=DEFAULT_COUNT, interval=DEFAULT_INTERVAL, timeout=DEFAULT_TIMEOUT, cancel_event=None):
+    """Sendet count Messungen an das Ziel und liefert jedes Ergebnis sofort."""
+    probe = _PROBES[target.method]
+    context = {"cancel_event": cancel_event}
+    try:
+        for sequence in range(count):
+            if cancel_event is not None and cancel_event.is_set():
+                return
+            started = time.perf_counter()
+            try:
+                rtt = probe(target, sequence, timeout, context)
+                yield ProbeResult(target, sequence, rtt)
+            except (socket.timeout, TimeoutError):
+                if cancel_event is not None and cancel_event.is_set():
+                    # Abgebrochene Messung nicht als Verlust zählen
+                    return
+                yield ProbeResult(target, sequence, None, "Zeitüberschreitung")
+            except PermissionError:
+                raise
+            except OSError as e:
+                yield ProbeResult(target, sequence, None, str(e))
+            # Abstand zwischen den Messungen einhalten, Abbruch sofort berücksichtigen
+            if sequence + 1 < count:
+                wait = max(0.0, interval - (time.perf_counter() - started))
+                if cancel_event is not None:
+                    if cancel_event.wait(wait):
+                        return
+                elif wait:
+                    time.sleep(wait)
+    finally:
+        sock = context.get("socket")
+        if sock is not None:
+            sock.close()
+
+def probe_target(target=DEFAULT_TARGET, count=DEFAULT_COUNT, interval=DEFAULT_INTERVAL, timeout=DEFAULT_TIMEOUT,
+                 on_result=None, cancel_event=None):
+    """Misst ein Ziel und liefert die Statistik, on_result erhält jedes Einzelergebnis."""
+    results = []
+    for result in iter_probes(target, count, interval, timeout, cancel_event):
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+    return compute_statistics(target, results)
+
+def probe_targets(targets, count=DEFAULT_COUNT, interval=DEFAULT_INTERVAL, timeout=DEFAULT_TIMEOUT,
+                  on_result=None, cancel_event=None):
+    """Misst mehrere Ziele parallel (ein Thread je Ziel) und liefert {Ziel: Statistik}.
+
+    on_result wird aus den Mess-Threads aufgerufen und muss daher threadsicher sein.
+    """
+    # Erst hier importieren, der Start von GUI und Kommandozeile braucht den Thread-Pool nicht
+    from concurrent.futures import ThreadPoolExecutor
+    targets = list(targets)
+    if not targets:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+        futures = {
+            target: executor.submit(probe_target, target, count, interval, timeout, on_result, cancel_event)
+            for target in targets
+        }
+        return {target: future.result() for target, future in futures.items()}
+
+class LocalEchoServer:
+    """Kleiner Echo-Server auf 127.0.0.1 für Tests ohne Netzwerk (UDP-Echo und TCP-Annahme).
+
+    Verwendung: with LocalEchoServer() as server: probe_target(server.udp_target())
+    """
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.udp_socket.bind((host, port))
+        self.host, self.port = self.udp_socket.getsockname()
+        self.tcp_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.tcp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.tcp_socket.bind((self.host, self.port))
+        self.tcp_socket.listen(16)
+        # Zeitlimits vor dem Start der Threads setzen, stop() kann die Sockets sofort schließen
+        self.udp_socket.settimeout(0.2)
+        self.tcp_socket.settimeout(0.2)
+        self._stop_event = threading.Event()
+        self._threads = [
+            threading.Thread(target=self._serve_udp, daemon=True),
+            threading.Thread(target=self._serve_tcp, daemon=True),
+        ]
+
+    def udp_target(self):
+        return ProbeTarget(self.host, self.port, PROBE_UDP)
+
+    def tcp_target(self):
+        return ProbeTarget(self.host, self.port, PROBE_TCP)
+
+    def start(self):
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+        self.udp_socket.close()
+        self.tcp_socket.close()
+        for thread in self._threads:
+            thread.join(1)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _serve_udp(self):
+        while not self._stop_event.is_set():
+            try:
+                data, address = self.udp_socket.recvfrom(2048)
+                self.udp_socket.sendto(data, address)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+
+    def _serve_tcp(self):
+        while not self._stop_event.is_set():
+            try:
+                connection, _ = self.tcp_socket.accept()
+                connection.close()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
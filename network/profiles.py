@@ -0,0 +1,159 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from network.snapshot import data_directory
+
+logger = logging.getLogger(__name__)
+
+# Pfad der gemerkten Profile, "0" oder leer hält sie nur im Speicher
+PROFILES_ENV = "WLAN_PROFILES"
+
+# Gespeicherte Hashes sollen sich nicht schnell durchprobieren lassen (ca. 30 ms je Verbindung)
+HASH_ITERATIONS = 100_000
+
+def xml_escape(text):
+    # Wie xml.sax.saxutils.escape, aber ohne dessen Import (zieht urllib und http.client nach)
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+def profile_security(auth, encryption):
+    """Wandelt Authentifizierung und Verschlüsselung in die Schreibweise des WLAN-Profils um."""
+    # Authentifizierung
+    if auth == "WPA3-Personal":
+        auth = "WPA3PSK"
+    elif auth == "WPA2-Personal":
+        auth = "WPA2PSK"
+    elif auth == "WPA-Personal":
+        auth = "WPAPSK"
+
+    # Verschlüsselung anpassen (CCMP → AES)
+    if encryption == "CCMP":
+        encryption = "AES"
+    return auth, encryption
+
+def build_profile_xml(ssid, password, auth="WPA2PSK", encryption="AES"):
+    """Erzeugt das WLAN-Profil (XML) für ein WPA-Netzwerk mit Passphrase im Speicher."""
+    # Sonderzeichen im SSID und Passwort escapen
+    escaped_ssid = xml_escape(ssid)
+    escaped_password = xml_escape(password)
+    auth, encryption = profile_security(auth, encryption)
+
+    return f"""<?xml version="1.0"?>
+<WLANProfile xmlns="http://www.microsoft.com/networking/WLAN/profile/v1">
+    <name>{escaped_ssid}</name>
+    <SSIDConfig>
+        <SSID>
+            <name>{escaped_ssid}</name>
+        </SSID>
+    </SSIDConfig>
+    <connectionType>ESS</connectionType>
+    <connectionMode>auto</connectionMode>
+    <MSM>
+        <security>
+            <authEncryption>
+                <authentication>{auth}</authentication>
+                <encryption>{encryption}</encryption>
+                <useOneX>false</useOneX>
+            </authEncryption>
+            <sharedKey>
+                <keyType>passPhrase</keyType>
+                <protected>false</protected>
+                <keyMaterial>{escaped_password}</keyMaterial>
+            </sharedKey>
+        </security>
+    </MSM>
+</WLANProfile>
+"""
+
+def default_profiles_path():
+    path = os.environ.get(PROFILES_ENV)
+    if path is not None:
+        return None if path in ("", "0") else path
+    return os.path.join(data_directory(), "profiles.json")
+
+class ProfileStore:
+    """Merkt sich je SSID den Fingerabdruck des zuletzt installierten Profils.
+
+    Der Fingerabdruck besteht aus Authentifizierung, Verschlüsselung und einem
+    Hash aus SSID und Schlüssel (PBKDF2 mit zufälligem Salz), das Passwort selbst
+    wird nicht gemerkt. Durch die SSID im Hash lässt sich nicht erkennen, ob zwei
+    Netzwerke dasselbe Passwort haben. Mit path bleiben Salz und Fingerabdrücke
+    über den Neustart erhalten (gelesen beim ersten Zugriff), sonst nur im Speicher.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._salt = None
+        self._fingerprints = {}
+        self._lock = threading.Lock()
+
+    def _load(self):
+        # Unter der Sperre aufrufen; eine fehlende oder kaputte Datei beginnt mit neuem Salz
+        if self._salt is not None:
+            return
+        if self.path is not None:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    data = json.load(f)
+                self._salt = bytes.fromhex(data["salt"])
+                self._fingerprints = {ssid: tuple(fingerprint) for ssid, fingerprint in data["profiles"].items()}
+                return
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+                logger.warning("Gemerkte Profile %s konnten nicht gelesen werden: %s", self.path, e)
+        self._salt = os.urandom(16)
+        self._fingerprints = {}
+
+    def _save(self):
+        if self.path is None:
+            return
+        data = {"salt": self._salt.hex(), "profiles": self._fingerprints}
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            # Erst vollständig schreiben, dann ersetzen, damit ein Absturz keine halbe Datei hinterlässt
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            # Ohne Datei wird beim nächsten Start das Profil einmal neu installiert
+            logger.warning("Gemerkte Profile %s konnten nicht gespeichert werden: %s", self.path, e)
+
+    def fingerprint(self, ssid, password, auth, encryption):
+        auth, encryption = profile_security(auth, encryption)
+        with self._lock:
+            self._load()
+            salt = self._salt
+        # Nullbyte als Trenner, damit ("ab", "c") und ("a", "bc") verschiedene Hashes ergeben
+        key_hash = hashlib.pbkdf2_hmac("sha256", ssid.encode("utf-8") + b"\0" + password.encode("utf-8"),
+                                       salt, HASH_ITERATIONS).hex()
+        return (auth, encryption, key_hash)
+
+    def is_installed(self, ssid, fingerprint):
+        """True, wenn für die SSID bereits ein Profil mit diesem Fingerabdruck installiert wurde."""
+        with self._lock:
+            self._load()
+            return self._fingerprints.get(ssid) == fingerprint
+
+    def remember(self, ssid, fingerprint):
+        with self._lock:
+            self._load()
+            if self._fingerprints.get(ssid) != fingerprint:
+                self._fingerprints[ssid] = tuple(fingerprint)
+                self._save()
+
+    def forget(self, ssid):
+        with self._lock:
+            self._load()
+            if self._fingerprints.pop(ssid, None) is not None:
+                self._save()
+
+    def clear(self):
+        with self._lock:
+            self._load()
+            self._fingerprints.clear()
+            self._save()
+
+profile_store = ProfileStore(default_profiles_path())
@@ -1,254 +1,457 @@
+import logging
+import queue
 import subprocess
-import re
-import os
-import xml.sax.saxutils as saxutils
+import threading
+import time
+from network.models import Network
+from network.evaluation import evaluate_access_points, reevaluate_access_points
+from network.probe import DEFAULT_TARGET, DEFAULT_COUNT
+from network.backends import ScanCancelled, get_backend, set_backend
+from network.signal_series import SignalSeries
+from network.metrics import metrics
 
-def scan_networks():
+logger = logging.getLogger(__name__)
+
+# Gültigkeitsdauer des Scan-Caches in Sekunden
+SCAN_CACHE_TTL = 120.0
+
+# Standardwerte für die Überwachung
+MONITOR_INTERVAL = 15.0
+MONITOR_SIGNAL_THRESHOLD = 10
+
+# Verhindert parallele Scans (z. B. Überwachung und manueller Scan)
+scan_lock = threading.Lock()
+
+class ScanCache:
+    """Hält das letzte Scan-Ergebnis mit Index nach SSID und BSSID für eine begrenzte Zeit vor."""
+
+    def __init__(self, ttl=SCAN_CACHE_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.invalidate()
+
+    def update(self, networks):
+        # Indizes einmalig aufbauen, danach sind Suchen O(1)
+        by_ssid = {}
+        by_bssid = {}
+        for net in networks or ():
+            by_ssid.setdefault(net.ssid, net)
+            for ap in net.access_points:
+                by_bssid[ap.bssid] = ap
+        with self._lock:
+            self._networks = networks or []
+            self._by_ssid = by_ssid
+            self._by_bssid = by_bssid
+            self._timestamp = time.monotonic()
+
+    def invalidate(self):
+        with self._lock:
+            self._networks = []
+            self._by_ssid = {}
+            self._by_bssid = {}
+            self._timestamp = None
+
+    def age(self):
+        """Alter des Snapshots in Sekunden oder None, wenn kein Snapshot vorhanden ist."""
+        with self._lock:
+            return None if self._timestamp is None else time.monotonic() - self._timestamp
+
+    def is_valid(self, max_age=None):
+        age = self.age()
+        return age is not None and age <= (self.ttl if max_age is None else max_age)
+
+    def get_networks(self, max_age=None):
+        if not self.is_valid(max_age):
+            return None
+        with self._lock:
+            return self._networks or None
+
+    def get_by_ssid(self, ssid):
+        if not self.is_valid():
+            return None
+        with self._lock:
+            return self._by_ssid.get(ssid)
+
+    def access_points(self):
+        """Index BSSID -> Access Point des letzten Scans, auch nach Ablauf der Gültigkeit."""
+        with self._lock:
+            return self._by_bssid
+
+    def get_by_bssid(self, bssid):
+        """Liefert den Access Point zur BSSID, sein Netzwerk steht in ap.network."""
+        if not self.is_valid() or not bssid:
+            return None
+        with self._lock:
+            return self._by_bssid.get(bssid.lower())
+
+scan_cache = ScanCache()
+
+# Letzte Signalwerte je BSSID, glätten die Bewertung über mehrere Scans
+signal_series = SignalSeries()
+
+def set_scan_cache_ttl(seconds):
+    scan_cache.ttl = seconds
+
+def invalidate_scan_cache():
+    scan_cache.invalidate()
+
+def get_networks(max_age=None, cancel_event=None):
+    # Zwischengespeichertes Ergebnis verwenden, solange es gültig ist
+    if scan_cache.is_valid(max_age):
+        return scan_cache.get_networks(max_age)
+    return scan_networks(cancel_event)
+
+def find_network(ssid=None, bssid=None):
+    # Netzwerk im Cache suchen, neu gescannt wird nur bei abgelaufenem Cache
+    if not scan_cache.is_valid():
+        scan_networks()
+    if bssid:
+        ap = scan_cache.get_by_bssid(bssid)
+        if ap is not None:
+            return ap.network
+    return scan_cache.get_by_ssid(ssid) if ssid is not None else None
+
+def _stronger(signal, other):
+    # Unbekanntes Signal zählt schwächer als jedes gemessene
+    return signal is not None and (other is None or signal > other)
+
+class NetworkMerger:
+    """Führt die Scans mehrerer WLAN-Adapter über die BSSID zusammen.
+
+    Je BSSID bleibt ein Access Point mit dem stärksten gemeldeten Signal und dem
+    Adapter, der es gemeldet hat. add() liefert ein Netzwerk nur beim ersten
+    Auftreten zurück; Access Points weiterer Adapter kommen zu diesem Netzwerk hinzu.
+    """
+
+    def __init__(self):
+        self.networks = []
+        self._by_key = {}
+        self._by_bssid = {}
+
+    def add(self, network):
+        key = (network.ssid, network.auth, network.encryption)
+        merged = self._by_key.get(key)
+        created = merged is None
+        if created:
+            merged = self._by_key[key] = Network(*key)
+            self.networks.append(merged)
+        for ap in network.access_points:
+            known = self._by_bssid.get(ap.bssid)
+            if known is None:
+                self._by_bssid[ap.bssid] = merged.add_access_point(ap.bssid, ap.signal, ap.channel, ap.radio_type,
+                                                                   ap.interface, ap.band)
+            elif _stronger(ap.signal, known.signal):
+                known.signal = ap.signal
+                known.interface = ap.interface
+                if ap.channel is not None:
+                    known.channel = ap.channel
+                    known.band = ap.band
+                known.radio_type = ap.radio_type or known.radio_type
+        return merged if created else None
+
+def _scan_interface(backend, interface, stop_event, results):
+    # Läuft je Adapter in einem eigenen Thread und meldet Netzwerke, Fehler und das Ende
     try:
-        # Verfügbare Netzwerke scannen
-        result = subprocess.run(
-            ["netsh", "wlan", "show", "networks", "mode=Bssid"],
-            capture_output=True,
-            text=False,
-            check=True
-        )
-        output = result.stdout.decode("cp850", errors="replace")
-
-        # Netzwerke parsen
+        with metrics.span("scan.adapter"):
+            for network in backend.iter_networks(stop_event, interface):
+                results.put((interface, network))
+    except Exception as e:
+        results.put((interface, e))
+    else:
+        results.put((interface, None))
+
+def _iter_merged_networks(backend, interfaces, cancel_event=None):
+    # Alle Adapter gleichzeitig scannen, die Gesamtdauer entspricht dem langsamsten
+    stop_event = threading.Event()
+    results = queue.Queue()
+    for interface in interfaces:
+        threading.Thread(target=_scan_interface, args=(backend, interface, stop_event, results),
+                         name=f"Scan {interface}", daemon=True).start()
+    merger = NetworkMerger()
+    errors = []
+    pending = len(interfaces)
+    try:
+        while pending:
+            if cancel_event is not None and cancel_event.is_set():
+                raise ScanCancelled()
+            try:
+                interface, item = results.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is None or isinstance(item, Exception):
+                pending -= 1
+                if item is not None:
+                    # Ein ausgefallener Adapter verhindert den Scan der übrigen nicht
+                    logger.warning("Scan über %s fehlgeschlagen: %s", interface, item)
+                    metrics.count("scan.adapter_errors")
+                    errors.append(item)
+                continue
+            network = merger.add(item)
+            if network is not None:
+                yield network
+    finally:
+        # Beendet die übrigen Adapter-Scans, auch wenn der Aufrufer vorzeitig aufhört
+        stop_event.set()
+    if len(errors) == len(interfaces):
+        raise errors[0]
+
+def iter_networks(cancel_event=None):
+    """Liefert die Netzwerke des aktiven Backends, bei netsh schon während die Ausgabe gelesen wird.
+
+    Bei mehreren WLAN-Adaptern werden alle gleichzeitig gescannt und über die BSSID
+    zusammengeführt. Die Netzwerke sind noch nicht bewertet, dafür
+    evaluate_wlan_security() aufrufen.
+    """
+    backend = get_backend()
+    try:
+        interfaces = backend.interfaces(cancel_event)
+    except ScanCancelled:
+        raise
+    except Exception as e:
+        # Ohne Adapterliste wie bisher über den Standardadapter scannen
+        logger.debug("WLAN-Adapter nicht ermittelbar: %s", e)
+        interfaces = []
+    if len(interfaces) < 2:
+        yield from backend.iter_networks(cancel_event)
+    else:
+        yield from _iter_merged_networks(backend, interfaces, cancel_event)
+
+def _acquire_scan_lock(cancel_event=None):
+    # Auf einen laufenden Scan warten, dabei aber abbrechbar bleiben
+    while not scan_lock.acquire(timeout=0.1):
+        if cancel_event is not None and cancel_event.is_set():
+            raise ScanCancelled()
+
+def _scan_via_service(cancel_event=None, on_network=None):
+    # Erst hier importieren: der Dienst importiert selbst diesen Modul
+    from network.service import ServiceUnavailable, get_service_client
+    client = get_service_client()
+    if client is None or not client.is_available():
+        return None
+    try:
+        with metrics.span("scan.service"):
+            snapshot = client.snapshot(cancel_event=cancel_event)
+    except ServiceUnavailable as e:
+        logger.info("Scanner-Dienst nicht erreichbar, es wird selbst gescannt: %s", e)
+        return None
+    for network in snapshot.networks:
+        if on_network is not None:
+            on_network(network)
+    # Bewertet und im Verlauf gespeichert hat der Dienst schon
+    scan_cache.update(snapshot.networks)
+    return snapshot.networks
+
+def scan_networks(cancel_event=None, on_network=None):
+    """Liefert die bewerteten Netzwerke, über den Scanner-Dienst (network.service), wenn er läuft.
+
+    Mehrere Programme teilen sich so einen Scan je Intervall des Dienstes; ohne
+    Dienst wird wie bei scan_local_networks() selbst gescannt.
+    """
+    try:
+        networks = _scan_via_service(cancel_event, on_network)
+    except ScanCancelled:
+        metrics.count("scan.cancelled")
+        raise
+    except Exception as e:
+        metrics.count("scan.errors")
+        raise Exception(f"Fehler beim Scannen über den Scanner-Dienst: {str(e)}")
+    if networks is not None:
+        metrics.count("scan.shared")
+        return networks or None
+    return scan_local_networks(cancel_event, on_network)
+
+def scan_local_networks(cancel_event=None, on_network=None):
+    try:
+        # Verfügbare Netzwerke scannen, on_network wird für jedes gelesene Netzwerk aufgerufen
         networks = []
-        current_network = {}
-        current_bssid = None
-        for line in output.splitlines():
-            line = line.strip()
-            if line.startswith("SSID"):
-                if current_network:
-                    networks.append(current_network)
-                current_network = {"ssid": line.split(":")[1].strip()}
-                current_bssid = None
-            elif line.startswith("BSSID"):
-                current_bssid = line.split(":", 1)[1].strip()
-                if current_bssid:
-                    current_network["bssid"] = current_bssid
-            elif line.startswith("Signal") and current_bssid:
-                signal = line.split(":")[1].strip()
-                current_network["signal"] = signal if signal else "Unbekannt"
-            elif line.startswith("Funktyp") and current_bssid:
-                current_network["funktyp"] = line.split(":")[1].strip()
-            elif line.startswith("Kanal") and current_bssid:
-                channel = line.split(":")[1].strip()
-                current_network["channel"] = channel if channel else "Unbekannt"
-            elif line.startswith("Authentifizierung"):
-                current_network["auth"] = line.split(":")[1].strip()
-            elif line.startswith("Verschlüsselung"):
-                current_network["encryption"] = line.split(":")[1].strip()
-        if current_network:
-            networks.append(current_network)
-        if networks:    
-            evaluate_wlan_security(networks)
-        return networks if networks else None
+        _acquire_scan_lock(cancel_event)
+        try:
+            with metrics.span("scan.total"):
+                for network in iter_networks(cancel_event):
+                    networks.append(network)
+                    if on_network is not None:
+                        on_network(network)
+                result = process_scan_result(networks)
+        finally:
+            scan_lock.release()
+        metrics.count("scan.count")
+        return result
 
+    except ScanCancelled:
+        metrics.count("scan.cancelled")
+        raise
     except subprocess.CalledProcessError as e:
-        raise Exception(f"Fehler beim Scannen mit netsh: {str(e)}")
+        metrics.count("scan.errors")
+        raise Exception(f"Fehler beim Scannen mit {get_backend().name}: {str(e)}")
     except Exception as e:
+        metrics.count("scan.errors")
         raise Exception(f"Fehler: {str(e)}")
 
-def evaluate_wlan_security(networks):
-    # Sicherheitsbewertung, Empfehlung und Begründung hinzufügen
-        for net in networks:
-            auth = net.get('auth', 'Unbekannt')
-            signal = net.get('signal', 'Unbekannt')
-            channel = net.get('channel', 'Unbekannt')
-            signal_value = int(signal.replace("%", "")) if signal != "Unbekannt" and signal.endswith("%") else None
-
-            # Sicherheitsbewertung
-            if auth in ["WPA2-Personal", "WPA3-Personal"]:
-                security = "Sicher"
-                security_reason = "Sichere Verschlüsselung"
-            elif auth == "Offen":
-                security = "Unsicher"
-                security_reason = "Keine Verschlüsselung (offen)"
-            elif auth == "WEP":
-                security = "Unsicher"
-                security_reason = "Veraltete Verschlüsselung (WEP)"
-            else:
-                security = "Unbekannt"
-                security_reason = "Unbekannte Verschlüsselung"
-
-            # Signalstärke berücksichtigen
-            if security == "Sicher" and signal_value is not None:
-                if signal_value < 30:
-                    security = "Sicher, aber schwaches Signal"
-                    security_reason = "Sichere Verschlüsselung, aber schwaches Signal (< 30%)"
-
-            # Interferenzrisiko
-            channel_usage = sum(1 for n in networks if n.get("channel") == channel)
-            interference_risk = "Hoch" if channel_usage > 3 else "Niedrig"
-            if interference_risk == "Hoch" and security.startswith("Sicher"):
-                security = f"{security}, hohe Interferenz"
-                security_reason = f"{security_reason}, aber hohe Interferenz (Kanal {channel} wird von {channel_usage} Netzwerken genutzt)"
-
-            net["security"] = security
-            net["security_reason"] = security_reason
-
-            # Empfehlung
-            if security == "Sicher" and signal_value is not None and signal_value >= 50 and interference_risk == "Niedrig":
-                net["recommendation"] = "Empfohlen"
-                net["recommendation_reason"] = f"Sichere Verschlüsselung ({auth}), starkes Signal ({signal}), geringe Interferenz"
-            else:
-                net["recommendation"] = "Nicht empfohlen"
-                net["recommendation_reason"] = security_reason
-
-def get_connected_network_info():
+def process_scan_result(networks):
+    # Gelesene Netzwerke bewerten und als aktuellen Snapshot speichern
+    if networks:    
+        with metrics.span("scan.evaluate"):
+            # Die Bewertungen des letzten Scans werden je BSSID wiederverwendet
+            evaluate_wlan_security(networks, scan_cache.access_points(), signal_series)
+    scan_cache.update(networks)
+    # Im Verlauf speichern, geschrieben wird im Hintergrund; sqlite3 wird erst beim
+    # ersten Scan (im Scan-Thread) importiert, nicht beim Programmstart. Abgespielte
+    # Aufzeichnungen (ReplayBackend) sind keine echten Beobachtungen und bleiben draußen.
+    if not networks or not get_backend().records_history:
+        return networks if networks else None
+    from network.history import get_history
+    history = get_history()
+    if history is not None:
+        history.record(networks)
+    return networks if networks else None
+
+def evaluate_wlan_security(networks, previous=None, series=None):
+    # Sicherheitsbewertung und Empfehlung für alle Access Points; mit previous (BSSID ->
+    # bewerteter Access Point des letzten Scans) nur für die mit geänderten Eingaben,
+    # mit series (SignalSeries) nach dem geglätteten Signal statt dem einzelnen Messwert
+    access_points = [ap for net in networks for ap in net.access_points]
+    stable_signals = series.update(access_points) if series is not None else None
+    if previous:
+        recomputed = reevaluate_access_points(networks, previous, stable_signals)
+    else:
+        evaluate_access_points(access_points, stable_signals=stable_signals)
+        recomputed = len(access_points)
+    metrics.count("evaluate.recomputed", recomputed)
+    metrics.count("evaluate.reused", len(access_points) - recomputed)
+
+# Ereignistypen der Überwachung
+DELTA_APPEARED = "appeared"
+DELTA_DISAPPEARED = "disappeared"
+DELTA_SIGNAL_CHANGED = "signal_changed"
+DELTA_SECURITY_CHANGED = "security_changed"
+
+class ScanDelta:
+    """Änderung eines Access Points zwischen zwei Scans.
+
+    old und new sind die AccessPoint-Objekte vor und nach der Änderung (None,
+    wenn nicht vorhanden). network ist das Netzwerk im neuen Scan, zu dem der
+    Access Point gehört, oder None, wenn das ganze Netzwerk verschwunden ist.
+    """
+
+    __slots__ = ("kind", "bssid", "old", "new", "network")
+
+    def __init__(self, kind, bssid, old, new, network):
+        self.kind = kind
+        self.bssid = bssid
+        self.old = old
+        self.new = new
+        self.network = network
+
+    def __repr__(self):
+        return f"ScanDelta({self.kind!r}, {self.bssid!r})"
+
+def _signal_changed(old_signal, new_signal, threshold):
+    if old_signal is None or new_signal is None:
+        return old_signal != new_signal
+    return abs(new_signal - old_signal) >= threshold
+
+def diff_snapshots(old_networks, new_networks, signal_threshold=MONITOR_SIGNAL_THRESHOLD):
+    """Vergleicht zwei Scans über die BSSID und liefert nur die Änderungen."""
+    old_aps = {ap.bssid: ap for net in old_networks or () for ap in net.access_points}
+    new_aps = {ap.bssid: ap for net in new_networks or () for ap in net.access_points}
+    deltas = []
+    for bssid, new_ap in new_aps.items():
+        old_ap = old_aps.get(bssid)
+        if old_ap is None:
+            deltas.append(ScanDelta(DELTA_APPEARED, bssid, None, new_ap, new_ap.network))
+        elif (old_ap.auth, old_ap.encryption, old_ap.verdict) != (new_ap.auth, new_ap.encryption, new_ap.verdict):
+            # Andere Verschlüsselung (z. B. Wechsel auf "Offen") oder andere Bewertung
+            deltas.append(ScanDelta(DELTA_SECURITY_CHANGED, bssid, old_ap, new_ap, new_ap.network))
+        elif _signal_changed(old_ap.signal, new_ap.signal, signal_threshold):
+            deltas.append(ScanDelta(DELTA_SIGNAL_CHANGED, bssid, old_ap, new_ap, new_ap.network))
+    for bssid, old_ap in old_aps.items():
+        if bssid not in new_aps:
+            # Das Netzwerk kann über andere Access Points weiterhin sichtbar sein
+            network = next((new_aps[ap.bssid].network for ap in old_ap.network.access_points if ap.bssid in new_aps), None)
+            deltas.append(ScanDelta(DELTA_DISAPPEARED, bssid, old_ap, None, network))
+    return deltas
+
+class NetworkMonitor:
+    """Scannt in einem festen Intervall und meldet nur die Änderungen zum vorherigen Scan.
+
+    on_deltas(deltas, networks) wird im Überwachungs-Thread aufgerufen, wenn sich
+    etwas geändert hat, on_error(message) bei einem fehlgeschlagenen Scan.
+    """
+
+    def __init__(self, interval=MONITOR_INTERVAL, signal_threshold=MONITOR_SIGNAL_THRESHOLD,
+                 on_deltas=None, on_error=None, baseline=None):
+        self.interval = interval
+        self.signal_threshold = signal_threshold
+        self.on_deltas = on_deltas
+        self.on_error = on_error
+        self.networks = baseline or []
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def poll(self, cancel_event=None):
+        """Führt einen Scan aus und liefert die Änderungen seit dem letzten Aufruf."""
+        networks = scan_networks(cancel_event) or []
+        deltas = diff_snapshots(self.networks, networks, self.signal_threshold)
+        self.networks = networks
+        return deltas
+
+    def start(self):
+        if self.is_running():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="NetworkMonitor", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        # Ein laufender Scan wird über dasselbe Event abgebrochen
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                deltas = self.poll(self._stop_event)
+                if deltas and self.on_deltas is not None:
+                    self.on_deltas(deltas, self.networks)
+            except ScanCancelled:
+                break
+            except Exception as e:
+                if self.on_error is not None:
+                    self.on_error(str(e))
+            self._stop_event.wait(self.interval)
+
+def get_connected_network_info(cancel_event=None, interface=None):
     try:
-        # Informationen über das verbundene Netzwerk abrufen
-        result = subprocess.run(
-            ["netsh", "wlan", "show", "interfaces"],
-            capture_output=True,
-            text=False,
-            check=True
-        )
-        output = result.stdout.decode("cp850", errors="replace")
-
-        # Informationen parsen
-        connected_info = {}
-        for line in output.splitlines():
-            line = line.strip()
-            if line.startswith("SSID"):
-                connected_info["ssid"] = line.split(":")[1].strip()
-            elif line.startswith("Signal"):
-                connected_info["signal"] = line.split(":")[1].strip()
-            elif line.startswith("Empfangsrate"):
-                connected_info["receive_rate"] = line.split(":")[1].strip()
-            elif line.startswith("Übertragungsrate"):
-                connected_info["transmit_rate"] = line.split(":")[1].strip()
-            elif line.startswith("Kanal"):
-                connected_info["channel"] = line.split(":")[1].strip()
-
-        return connected_info if connected_info else None
+        # Informationen über das verbundene Netzwerk abrufen, ohne interface über den ersten verbundenen Adapter
+        with metrics.span("connected_info"):
+            return get_backend().connected_info(cancel_event, interface)
+    except ScanCancelled:
+        raise
     except subprocess.CalledProcessError as e:
         raise Exception(f"Fehler beim Abrufen der Verbindungsinformationen: {str(e)}")
     except Exception as e:
         raise Exception(f"Fehler: {str(e)}")
 
 def connect_to_network(ssid, password, auth="WPA2PSK", encryption="AES"):
-    temp_file = f"{ssid}_profile.xml"
-    try:
-        # Bestehendes Profil löschen (falls vorhanden)
-        result = subprocess.run(
-            ["netsh", "wlan", "delete", "profile", f"name={ssid}"],
-            capture_output=True,
-            text=False,
-            check=False
-        )
-        delete_output = result.stdout.decode("cp850", errors="replace")
-        print(f"Debug: Profil löschen Ausgabe: {delete_output}")
-
-        # Sonderzeichen im SSID und Passwort escapen
-        escaped_ssid = saxutils.escape(ssid)
-        escaped_password = saxutils.escape(password)
-
-        # Authentifizierung
-        if auth == "WPA3-Personal":
-            auth = "WPA3PSK"
-        elif auth == "WPA2-Personal":
-            auth = "WPA2PSK"
-        elif auth == "WPA-Personal":
-            auth = "WPAPSK"
-
-        # Verschlüsselung anpassen (CCMP → AES)
-        if encryption == "CCMP":
-            encryption = "AES"
-
-        # Temporäre XML-Profil-Datei erstellen
-        profile_xml = f"""<?xml version="1.0"?>
-<WLANProfile xmlns="http://www.microsoft.com/networking/WLAN/profile/v1">
-    <name>{escaped_ssid}</name>
-    <SSIDConfig>
-        <SSID>
-            <name>{escaped_ssid}</name>
-        </SSID>
-    </SSIDConfig>
-    <connectionType>ESS</connectionType>
-    <connectionMode>auto</connectionMode>
-    <MSM>
-        <security>
-            <authEncryption>
-                <authentication>{auth}</authentication>
-                <encryption>{encryption}</encryption>
-                <useOneX>false</useOneX>
-            </authEncryption>
-            <sharedKey>
-                <keyType>passPhrase</keyType>
-                <protected>false</protected>
-                <keyMaterial>{escaped_password}</keyMaterial>
-            </sharedKey>
-        </security>
-    </MSM>
-</WLANProfile>
-"""
-        # Temporäre Datei speichern
-        print(f"Debug: Erstelle XML-Datei: {temp_file}")
-        with open(temp_file, "w", encoding="utf-8") as f:
-            f.write(profile_xml)
-        print(f"Debug: XML-Datei erfolgreich erstellt: {temp_file}")
-
-        # Profil hinzufügen
-        result = subprocess.run(
-            ["netsh", "wlan", "add", "profile", f"filename={temp_file}"],
-            capture_output=True,
-            text=False,
-            check=True
-        )
-        output = result.stdout.decode("cp850", errors="replace")
-        print(f"Debug: Profil hinzufügen Ausgabe: {output}")
-        if "wird der schnittstelle" in output.lower() or "erfolgreich" in output.lower():
-            print("Debug: Profil erfolgreich hinzugefügt")
-        else:
-            raise Exception(f"Fehler beim Hinzufügen des Profils: {output}")
-
-        # Mit dem Netzwerk verbinden
-        connect_cmd = ["netsh", "wlan", "connect", f"ssid={ssid}", f"name={ssid}"]
-        result = subprocess.run(connect_cmd, capture_output=True, text=False, check=True)
-        connect_output = result.stdout.decode("cp850", errors="replace")
-        print(f"Debug: Verbindungsausgabe: {connect_output}")
-        if "erfolgreich" in connect_output.lower() or "verbindung wurde erfolgreich hergestellt" in connect_output.lower():
-            print("Debug: Verbindung erfolgreich hergestellt")
-            return "Erfolgreich verbunden"
-        else:
-            raise Exception(f"Fehler beim Verbinden: {connect_output}")
-    except subprocess.CalledProcessError as e:
-        error_output = e.stderr.decode("cp850", errors="replace") if e.stderr else str(e)
-        print(f"Debug: Fehlerausgabe: {error_output}")
-        raise Exception(f"Fehler beim Verbinden mit {ssid}: {error_output}")
-    except Exception as e:
-        print(f"Debug: Allgemeiner Fehler: {str(e)}")
-        raise Exception(f"Fehler: {str(e)}")
-    finally:
-        # Sicherstellen, dass die temporäre Datei gelöscht wird, auch bei Fehlern
-        if os.path.exists(temp_file):
-            print(f"Debug: Lösche temporäre Datei: {temp_file}")
-            os.remove(temp_file)
+    with metrics.span("connect"):
+        return get_backend().connect(ssid, password, auth, encryption)
 
-def test_packet_loss():
+def test_packet_loss(cancel_event=None, target=DEFAULT_TARGET, count=DEFAULT_COUNT):
+    """Misst den Paketverlust zum Ziel (Standard: TCP-Verbindungsaufbau zu 8.8.8.8) in Prozent."""
     try:
-        # Ping-Test durchführen (4 Pings an Google DNS)
-        result = subprocess.run(
-            ["ping", "-n", "4", "8.8.8.8"],
-            capture_output=True,
-            text=False,
-            check=True
-        )
-
-        output = result.stdout.decode("cp850", errors="replace")
-
-        # Paketverlust parsen
-        for line in output.splitlines():
-            if "Verlust" in line:
-                loss = re.search(r"(\d+)% Verlust", line)
-                if loss:
-                    return int(loss.group(1))
-        return 0
-    except subprocess.CalledProcessError as e:
-        raise Exception(f"Fehler beim Paketverlust-Test: {str(e)}")
+        with metrics.span("probe"):
+            statistics = get_backend().probe(target, count, cancel_event)
+        if cancel_event is not None and cancel_event.is_set():
+            raise ScanCancelled()
+        return round(statistics.loss_percent)
+    except ScanCancelled:
+        raise
+    except PermissionError as e:
+        raise Exception(f"Fehler beim Paketverlust-Test (fehlende Berechtigung): {str(e)}")
     except Exception as e:
-        raise Exception(f"Fehler: {str(e)}")
\ No newline at end of file
+        raise Exception(f"Fehler: {str(e)}")
@@ -0,0 +1,450 @@
+import json
+import logging
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+from network.backends import ScanCancelled
+from network.scanner import MONITOR_INTERVAL, MONITOR_SIGNAL_THRESHOLD, ScanDelta, diff_snapshots, scan_local_networks
+from network.snapshot import Snapshot, data_directory, networks_from_rows, snapshot_rows
+
+logger = logging.getLogger(__name__)
+
+# Adresse des Scanner-Dienstes als "host:port", "0" oder leer schaltet den Client aus;
+# ohne Angabe steht die Adresse in der Datei, die ein laufender Dienst anlegt
+SERVICE_ENV = "WLAN_SERVICE"
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 47230
+
+# Nach einem fehlgeschlagenen Verbindungsversuch so lange wieder selbst scannen
+RETRY_INTERVAL = 30.0
+
+CONNECT_TIMEOUT = 1.0
+# Längste Wartezeit auf eine Antwort, ein Scan des Dienstes kann einige Sekunden dauern
+RESPONSE_TIMEOUT = 60.0
+
+# Maximale Wartezeit am Stück, damit ein Abbruch schnell wirkt
+CANCEL_POLL_INTERVAL = 0.1
+
+# Nachrichten: eine JSON-Zeile je Anfrage bzw. Antwort (NDJSON)
+OP_SNAPSHOT = "snapshot"
+OP_SUBSCRIBE = "subscribe"
+
+MESSAGE_SNAPSHOT = "snapshot"
+MESSAGE_DELTAS = "deltas"
+MESSAGE_ERROR = "error"
+
+# Abonnenten, die so viele Nachrichten nicht abholen, werden getrennt
+SUBSCRIBER_QUEUE_SIZE = 16
+
+class ServiceUnavailable(Exception):
+    """Der Scanner-Dienst ist nicht erreichbar, der Aufrufer scannt selbst."""
+
+def service_file_path():
+    return os.path.join(data_directory(), "service.json")
+
+def parse_address(text):
+    host, separator, port = text.rpartition(":")
+    if not separator:
+        return (DEFAULT_HOST, int(text))
+    return (host or DEFAULT_HOST, int(port))
+
+def default_service_address():
+    """Adresse aus WLAN_SERVICE oder der Datei eines laufenden Dienstes, None wenn keiner bekannt ist."""
+    value = os.environ.get(SERVICE_ENV)
+    if value is not None:
+        return None if value in ("", "0") else parse_address(value)
+    # Ohne Datei läuft kein Dienst; spart den Verbindungsversuch, der unter Windows
+    # bei einem geschlossenen Port bis zu zwei Sekunden dauert
+    try:
+        with open(service_file_path(), encoding="utf-8") as f:
+            data = json.load(f)
+        return (data["host"], data["port"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def _encode(message):
+    return (json.dumps(message, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+def _network_key(net):
+    return (net.ssid, net.auth, net.encryption)
+
+def delta_message(old_networks, new_networks, deltas, timestamp):
+    # Nur geänderte Netzwerke vollständig senden, verschwundene über ihren Schlüssel
+    changed = {}
+    for delta in deltas:
+        if delta.network is not None:
+            changed[_network_key(delta.network)] = delta.network
+    new_keys = {_network_key(net) for net in new_networks}
+    removed = [list(key) for key in {_network_key(net) for net in old_networks} if key not in new_keys]
+    return {
+        "type": MESSAGE_DELTAS,
+        "timestamp": timestamp,
+        "deltas": [[delta.kind, delta.bssid] for delta in deltas],
+        "networks": snapshot_rows(changed.values()),
+        "removed": removed,
+    }
+
+class ScannerService:
+    """Besitzt die Scan-Schleife und den letzten bewerteten Scan für alle Clients.
+
+    Gescannt wird höchstens einmal je interval, egal wie viele Clients fragen:
+    Anfragen nach einem jüngeren Stand als dem vorhandenen warten auf einen
+    gemeinsamen Scan. Snapshot und Änderungen werden je Scan nur einmal kodiert
+    und an alle Abonnenten dieselben Bytes geschickt.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, interval=MONITOR_INTERVAL,
+                 signal_threshold=MONITOR_SIGNAL_THRESHOLD):
+        self.interval = interval
+        self.signal_threshold = signal_threshold
+        self.networks = []
+        self.timestamp = None
+        self._snapshot_line = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._subscribers = []
+        self._stop_event = threading.Event()
+        self._server = _ServiceServer((host, port), _ServiceHandler, self)
+        self.host, self.port = self._server.server_address[:2]
+        self._threads = [
+            threading.Thread(target=self._scan_loop, name="ScannerService", daemon=True),
+            threading.Thread(target=self._server.serve_forever, args=(0.2,), name="ScannerServiceServer", daemon=True),
+        ]
+
+    def start(self, publish=True):
+        """Startet Scan-Schleife und Server; mit publish finden Clients den Dienst über service_file_path()."""
+        for thread in self._threads:
+            thread.start()
+        if publish:
+            self._write_service_file()
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+        self._server.shutdown()
+        self._server.server_close()
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            subscriber.put(None)
+        for thread in self._threads:
+            thread.join(1)
+        self._remove_service_file()
+
+    def __enter__(self):
+        return self.start(publish=False)
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def wait(self):
+        """Blockiert bis stop() oder KeyboardInterrupt."""
+        while not self._stop_event.wait(1.0):
+            pass
+
+    def _write_service_file(self):
+        path = service_file_path()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"host": self.host, "port": self.port, "pid": os.getpid()}, f)
+
+    def _remove_service_file(self):
+        try:
+            with open(service_file_path(), encoding="utf-8") as f:
+                if json.load(f).get("pid") != os.getpid():
+                    # Gehört inzwischen einem anderen Dienst
+                    return
+            os.remove(service_file_path())
+        except (OSError, ValueError):
+            pass
+
+    def age(self):
+        with self._lock:
+            return None if self.timestamp is None else time.time() - self.timestamp
+
+    def refresh(self, max_age=None):
+        """Scannt, wenn der Stand älter als max_age ist (Standard: interval), und liefert die Snapshot-Zeile."""
+        max_age = self.interval if max_age is None else max_age
+        # Gleichzeitige Anfragen warten auf denselben Scan statt je einen eigenen zu starten
+        with self._refresh_lock:
+            age = self.age()
+            if age is None or age > max_age:
+                try:
+                    # Selbst scannen, nie über den Client (auch nicht über einen anderen Dienst)
+                    networks = scan_local_networks(self._stop_event) or []
+                except ScanCancelled:
+                    raise
+                except Exception as e:
+                    # Älteren Stand weiter ausliefern, ohne Stand den Fehler melden
+                    if self._snapshot_line is None:
+                        raise
+                    logger.warning("Scan des Dienstes fehlgeschlagen: %s", e)
+                else:
+                    self._publish(networks)
+            return self._snapshot_line
+
+    def _publish(self, networks):
+        timestamp = time.time()
+        deltas = diff_snapshots(self.networks, networks, self.signal_threshold)
+        snapshot_line = _encode({"type": MESSAGE_SNAPSHOT, "timestamp": timestamp, "networks": snapshot_rows(networks)})
+        delta_line = _encode(delta_message(self.networks, networks, deltas, timestamp)) if deltas else None
+        with self._lock:
+            self.networks = networks
+            self.timestamp = timestamp
+            self._snapshot_line = snapshot_line
+            subscribers = list(self._subscribers)
+        if delta_line is not None:
+            for subscriber in subscribers:
+                try:
+                    subscriber.put_nowait(delta_line)
+                except queue.Full:
+                    # Zu langsamer Client: trennen, statt den Speicher volllaufen zu lassen
+                    self.unsubscribe(subscriber)
+                    self._drain(subscriber)
+                    subscriber.put_nowait(None)
+
+    @staticmethod
+    def _drain(subscriber):
+        while True:
+            try:
+                subscriber.get_nowait()
+            except queue.Empty:
+                return
+
+    def subscribe(self):
+        """Meldet einen Abonnenten an und liefert (Snapshot-Zeile, Warteschlange der Änderungen).
+
+        Beides unter derselben Sperre, damit keine Änderung doppelt oder gar nicht ankommt.
+        """
+        self.refresh()
+        subscriber = queue.Queue(SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.append(subscriber)
+            return self._snapshot_line, subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+    def _scan_loop(self):
+        while not self._stop_event.is_set():
+            try:
+                self.refresh()
+            except ScanCancelled:
+                break
+            except Exception as e:
+                logger.warning("Scan des Dienstes fehlgeschlagen: %s", e)
+            # Bis zum Ablauf des Intervalls warten; Anfragen der Clients können
+            # zwischendurch schon neu gescannt haben
+            age = self.age()
+            self._stop_event.wait(self.interval if age is None else max(0.1, self.interval - age))
+
+class _ServiceServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, handler, service):
+        self.service = service
+        super().__init__(address, handler)
+
+class _ServiceHandler(socketserver.StreamRequestHandler):
+    # Eine Verbindung je Client, Anfragen als JSON-Zeilen
+
+    def handle(self):
+        service = self.server.service
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                op = request.get("op")
+                if op == OP_SNAPSHOT:
+                    self.wfile.write(service.refresh(request.get("max_age")))
+                elif op == OP_SUBSCRIBE:
+                    self._stream(service)
+                    return
+                else:
+                    self.wfile.write(_encode({"type": MESSAGE_ERROR, "message": f"Unbekannte Anfrage: {op}"}))
+            except (ConnectionError, ScanCancelled):
+                return
+            except Exception as e:
+                try:
+                    self.wfile.write(_encode({"type": MESSAGE_ERROR, "message": str(e)}))
+                except OSError:
+                    return
+
+    def _stream(self, service):
+        snapshot_line, subscriber = service.subscribe()
+        try:
+            self.wfile.write(snapshot_line)
+            while True:
+                line = subscriber.get()
+                if line is None:
+                    return
+                self.wfile.write(line)
+        except OSError:
+            # Client hat die Verbindung beendet
+            pass
+        finally:
+            service.unsubscribe(subscriber)
+
+class _LineReader:
+    # Liest JSON-Zeilen vom Socket und prüft dabei regelmäßig auf Abbruch
+
+    def __init__(self, sock, cancel_event=None):
+        self.sock = sock
+        self.cancel_event = cancel_event
+        self.buffer = bytearray()
+        sock.settimeout(CANCEL_POLL_INTERVAL)
+
+    def read(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            end = self.buffer.find(b"\n")
+            if end >= 0:
+                line = bytes(self.buffer[:end])
+                del self.buffer[:end + 1]
+                message = json.loads(line)
+                if message.get("type") == MESSAGE_ERROR:
+                    raise Exception(message.get("message"))
+                return message
+            if self.cancel_event is not None and self.cancel_event.is_set():
+                raise ScanCancelled()
+            if deadline is not None and time.monotonic() > deadline:
+                raise ServiceUnavailable("Keine Antwort vom Scanner-Dienst")
+            try:
+                chunk = self.sock.recv(65536)
+            except socket.timeout:
+                continue
+            except OSError as e:
+                raise ServiceUnavailable(str(e))
+            if not chunk:
+                raise ServiceUnavailable("Verbindung zum Scanner-Dienst beendet")
+            self.buffer += chunk
+
+class ServiceClient:
+    """Client des Scanner-Dienstes.
+
+    snapshot() liefert den letzten bewerteten Scan des Dienstes, subscribe()
+    zusätzlich jede Änderung. Ist der Dienst nicht erreichbar, lösen beide
+    ServiceUnavailable aus; danach wird es erst nach RETRY_INTERVAL erneut versucht.
+    stale ist nach einem Fehlversuch gesetzt, bis get_service_client() die
+    Adresse erneut gelesen hat.
+    """
+
+    def __init__(self, address):
+        self.address = address
+        self.stale = False
+        self._unavailable_until = 0.0
+
+    def is_available(self):
+        return time.monotonic() >= self._unavailable_until
+
+    def _failed(self, error):
+        self._unavailable_until = time.monotonic() + RETRY_INTERVAL
+        self.stale = True
+        return ServiceUnavailable(str(error))
+
+    def _connect(self):
+        if not self.is_available():
+            raise ServiceUnavailable("Scanner-Dienst vor Kurzem nicht erreichbar")
+        try:
+            return socket.create_connection(self.address, timeout=CONNECT_TIMEOUT)
+        except OSError as e:
+            raise self._failed(e)
+
+    def _request(self, sock, op, **arguments):
+        try:
+            sock.sendall(_encode(dict(arguments, op=op)))
+        except OSError as e:
+            raise self._failed(e)
+
+    def snapshot(self, max_age=None, cancel_event=None):
+        """Letzter Scan des Dienstes, höchstens max_age Sekunden alt (Standard: Intervall des Dienstes)."""
+        with self._connect() as sock:
+            self._request(sock, OP_SNAPSHOT, max_age=max_age)
+            try:
+                message = _LineReader(sock, cancel_event).read(RESPONSE_TIMEOUT)
+            except ServiceUnavailable as e:
+                raise self._failed(e)
+        return Snapshot(networks_from_rows(message["networks"]), message["timestamp"])
+
+    def subscribe(self, cancel_event=None):
+        """Liefert (deltas, networks): zuerst den aktuellen Scan ohne Änderungen, dann je geändertem Scan.
+
+        deltas sind ScanDelta-Objekte wie bei diff_snapshots(), networks ist der
+        beim Client nachgeführte Stand.
+        """
+        with self._connect() as sock:
+            self._request(sock, OP_SUBSCRIBE)
+            reader = _LineReader(sock, cancel_event)
+            message = reader.read()
+            networks = networks_from_rows(message["networks"])
+            yield [], networks
+            while True:
+                message = reader.read()
+                networks, deltas = _apply_deltas(networks, message)
+                yield deltas, networks
+
+def _apply_deltas(networks, message):
+    old_aps = {ap.bssid: ap for net in networks for ap in net.access_points}
+    changed = {_network_key(net): net for net in networks_from_rows(message["networks"])}
+    removed = {tuple(key) for key in message["removed"]}
+    updated = []
+    for net in networks:
+        key = _network_key(net)
+        if key in removed:
+            continue
+        updated.append(changed.pop(key, net))
+    updated.extend(changed.values())
+    new_aps = {ap.bssid: ap for net in updated for ap in net.access_points}
+    deltas = []
+    for kind, bssid in message["deltas"]:
+        new = new_aps.get(bssid)
+        deltas.append(ScanDelta(kind, bssid, old_aps.get(bssid), new, new.network if new is not None else None))
+    return updated, deltas
+
+_client = None
+_client_configured = False
+# Ohne bekannten Dienst wird die Adresse erst ab diesem Zeitpunkt (monotonic) wieder gesucht
+_lookup_after = 0.0
+_client_lock = threading.Lock()
+
+def get_service_client():
+    """Client für den laufenden Scanner-Dienst oder None, wenn keiner bekannt ist.
+
+    Die Adresse (WLAN_SERVICE bzw. service_file_path()) wird nur gelesen, bis
+    ein Client besteht, und wieder nach einem Fehlversuch des Clients, weil ein
+    neu gestarteter Dienst einen anderen Port haben kann. Ohne Dienst wird
+    höchstens einmal je RETRY_INTERVAL nachgesehen.
+    """
+    global _client, _lookup_after
+    with _client_lock:
+        if _client_configured or (_client is not None and not _client.stale):
+            return _client
+        now = time.monotonic()
+        if _client is None and now < _lookup_after:
+            return None
+        address = default_service_address()
+        if address is None:
+            _client = None
+            _lookup_after = now + RETRY_INTERVAL
+            return None
+        # Den Client behalten, damit die Wartezeit nach einem Fehlversuch gilt
+        if _client is None or _client.address != address:
+            _client = ServiceClient(address)
+        _client.stale = False
+        return _client
+
+def set_service_client(client):
+    """Setzt den Client (Objekt, "host:port" oder None, um immer selbst zu scannen)."""
+    global _client, _client_configured
+    if isinstance(client, str):
+        client = ServiceClient(parse_address(client))
+    with _client_lock:
+        _client = client
+        _client_configured = True
+    return client
@@ -0,0 +1,245 @@
+from array import array
+from collections import OrderedDict
+from network.evaluation import NUMPY_MIN_ROWS, WEAK_SIGNAL_THRESHOLD, STRONG_SIGNAL_THRESHOLD, numpy_module, signal_bucket
+
+# Höchstzahl gleichzeitig verfolgter BSSIDs und Messwerte je BSSID; der Speicher
+# ist damit fest (4096 x 16 Werte), auch wenn das Programm tagelang läuft
+DEFAULT_CAPACITY = 4096
+DEFAULT_WINDOW = 16
+
+# Gewicht des neuesten Werts im gleitenden Mittel (EWMA)
+DEFAULT_ALPHA = 0.3
+
+# Abstand in Prozentpunkten, um den das geglättete Signal eine Schwelle
+# überschreiten muss, bevor sich die Einstufung ändert
+DEFAULT_HYSTERESIS = 5
+
+# Wertebereich je Einstufung von signal_bucket() (1 = schwach, 2, 3 = stark)
+_BUCKET_RANGES = {
+    1: (0, WEAK_SIGNAL_THRESHOLD - 1),
+    2: (WEAK_SIGNAL_THRESHOLD, STRONG_SIGNAL_THRESHOLD - 1),
+    3: (STRONG_SIGNAL_THRESHOLD, 100),
+}
+
+def hysteresis_bucket(previous, value, hysteresis=DEFAULT_HYSTERESIS):
+    """Einstufung des Signals value, die erst hysteresis Punkte jenseits einer Schwelle von previous abweicht."""
+    if not previous:
+        return signal_bucket(value)
+    up = signal_bucket(value - hysteresis)
+    if up > previous:
+        return up
+    down = signal_bucket(value + hysteresis)
+    return down if down < previous else previous
+
+def stable_signal(value, bucket):
+    # Geglättetes Signal in den Bereich der Einstufung legen, damit die Bewertung
+    # mit den üblichen Schwellen dieselbe Einstufung ergibt
+    low, high = _BUCKET_RANGES[bucket]
+    return min(high, max(low, round(value)))
+
+class SignalStatistics:
+    """Kennzahlen der letzten Messwerte eines Access Points (Signal in Prozent)."""
+
+    __slots__ = ("count", "ewma", "minimum", "maximum", "mean", "variance", "stable_signal")
+
+    def __init__(self, count, ewma, minimum, maximum, mean, variance, stable_signal):
+        self.count = count
+        self.ewma = ewma
+        self.minimum = minimum
+        self.maximum = maximum
+        self.mean = mean
+        self.variance = variance
+        self.stable_signal = stable_signal
+
+    def __repr__(self):
+        return f"SignalStatistics(n={self.count}, ewma={self.ewma:.1f}, {self.minimum}-{self.maximum})"
+
+class SignalSeries:
+    """Ringpuffer der letzten Signalwerte je BSSID mit gleitendem Mittel und Hysterese.
+
+    Alle Werte liegen in einem vorab angelegten Block (capacity x window) in
+    array.array; liefert ein Scan NUMPY_MIN_ROWS BSSIDs oder mehr und ist NumPy
+    installiert, wird der Block einmalig in NumPy-Arrays übernommen. Summe,
+    Quadratsumme und EWMA werden
+    je neuem Wert in O(1) nachgeführt, Minimum und Maximum über das feste
+    Fenster gelesen. Sind mehr als capacity BSSIDs bekannt, wird die am längsten
+    nicht mehr gesehene verdrängt. update() liefert je Access Point das Signal,
+    auf dem die Bewertung beruhen soll: geglättet und erst mit Abstand
+    hysteresis über bzw. unter einer Schwelle in einer anderen Einstufung.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, window=DEFAULT_WINDOW, alpha=DEFAULT_ALPHA,
+                 hysteresis=DEFAULT_HYSTERESIS):
+        self.capacity = capacity
+        self.window = window
+        self.alpha = alpha
+        self.hysteresis = hysteresis
+        # BSSID -> Zeile im Block, in der Reihenfolge der letzten Messung
+        self._slots = OrderedDict()
+        self._free = list(range(capacity - 1, -1, -1))
+        self._numpy = None
+        self.samples = None
+
+    def __len__(self):
+        return len(self._slots)
+
+    def _allocate(self):
+        # Erst beim ersten Scan anlegen, der Programmstart braucht den Speicher nicht
+        self._numpy = None
+        self.samples = array("h", [-1]) * (self.capacity * self.window)
+        self.heads = array("l", [0]) * self.capacity
+        self.counts = array("l", [0]) * self.capacity
+        self.sums = array("d", [0.0]) * self.capacity
+        self.squares = array("d", [0.0]) * self.capacity
+        self.ewma = array("d", [0.0]) * self.capacity
+        self.levels = array("b", [0]) * self.capacity
+
+    def _use_numpy(self, np):
+        # Bisherige Werte übernehmen; kleine Scans kommen so ohne den Import von NumPy aus
+        self._numpy = np
+        self.samples = np.array(self.samples, dtype=np.int16).reshape(self.capacity, self.window)
+        self.heads = np.array(self.heads, dtype=np.int32)
+        self.counts = np.array(self.counts, dtype=np.int32)
+        self.sums = np.array(self.sums, dtype=np.float64)
+        self.squares = np.array(self.squares, dtype=np.float64)
+        self.ewma = np.array(self.ewma, dtype=np.float64)
+        self.levels = np.array(self.levels, dtype=np.int8)
+
+    def _reset(self, slot):
+        if self._numpy is not None:
+            self.samples[slot] = -1
+        else:
+            start = slot * self.window
+            self.samples[start:start + self.window] = array("h", [-1]) * self.window
+        self.heads[slot] = 0
+        self.counts[slot] = 0
+        self.sums[slot] = 0.0
+        self.squares[slot] = 0.0
+        self.ewma[slot] = 0.0
+        self.levels[slot] = 0
+
+    def _slot(self, bssid):
+        slot = self._slots.get(bssid)
+        if slot is not None:
+            self._slots.move_to_end(bssid)
+            return slot
+        if self._free:
+            slot = self._free.pop()
+        else:
+            # Voll: die am längsten nicht gesehene BSSID verdrängen
+            _, slot = self._slots.popitem(last=False)
+            self._reset(slot)
+        self._slots[bssid] = slot
+        return slot
+
+    def update(self, access_points):
+        """Nimmt das aktuelle Signal jedes Access Points auf und liefert die Signale für die Bewertung.
+
+        Access Points ohne bekanntes Signal werden nicht aufgenommen und behalten -1.
+        Sieht ein Scan mehr als capacity BSSIDs, werden die übrigen ungeglättet bewertet.
+        """
+        if self.samples is None:
+            self._allocate()
+        stable = [-1 if ap.signal is None or ap.signal < 0 else ap.signal for ap in access_points]
+        # Je BSSID nur ein Wert pro Scan, sonst stimmen Summen und Zähler nicht; höchstens
+        # capacity BSSIDs, damit keine Zeile innerhalb desselben Scans verdrängt wird
+        positions = {}
+        for position, signal in enumerate(stable):
+            if signal >= 0:
+                bssid = access_points[position].bssid
+                if bssid in positions or len(positions) < self.capacity:
+                    positions[bssid] = position
+        if not positions:
+            return stable
+        if self._numpy is None and len(positions) >= NUMPY_MIN_ROWS and numpy_module() is not None:
+            self._use_numpy(numpy_module())
+        slots = [self._slot(bssid) for bssid in positions]
+        values = [access_points[position].signal for position in positions.values()]
+        if self._numpy is not None:
+            results = self._update_numpy(slots, values)
+        else:
+            results = self._update_python(slots, values)
+        for position, value in zip(positions.values(), results):
+            stable[position] = value
+        return stable
+
+    def _update_numpy(self, slots, values):
+        np = self._numpy
+        slots = np.asarray(slots, dtype=np.intp)
+        values = np.asarray(values, dtype=np.int16)
+        heads = self.heads[slots]
+        old = self.samples[slots, heads]
+        replaced = old >= 0
+        self.samples[slots, heads] = values
+        self.heads[slots] = (heads + 1) % self.window
+        new = values.astype(np.float64)
+        old = np.where(replaced, old, 0).astype(np.float64)
+        self.sums[slots] += new - old
+        self.squares[slots] += new * new - old * old
+        counts = self.counts[slots] + ~replaced
+        self.counts[slots] = counts
+        ewma = np.where(counts == 1, new, self.alpha * new + (1 - self.alpha) * self.ewma[slots])
+        self.ewma[slots] = ewma
+        # Hysterese je Zeile wie in hysteresis_bucket()
+        previous = self.levels[slots]
+        up = self._buckets(ewma - self.hysteresis)
+        down = self._buckets(ewma + self.hysteresis)
+        levels = np.where(previous == 0, self._buckets(ewma),
+                          np.where(up > previous, up, np.where(down < previous, down, previous)))
+        self.levels[slots] = levels
+        low = np.choose(levels - 1, [_BUCKET_RANGES[bucket][0] for bucket in (1, 2, 3)])
+        high = np.choose(levels - 1, [_BUCKET_RANGES[bucket][1] for bucket in (1, 2, 3)])
+        return np.clip(np.round(ewma), low, high).astype(np.int16).tolist()
+
+    def _buckets(self, values):
+        np = self._numpy
+        return np.where(values < WEAK_SIGNAL_THRESHOLD, 1, np.where(values < STRONG_SIGNAL_THRESHOLD, 2, 3)).astype(np.int8)
+
+    def _update_python(self, slots, values):
+        results = []
+        window = self.window
+        alpha = self.alpha
+        for slot, value in zip(slots, values):
+            head = self.heads[slot]
+            index = slot * window + head
+            old = self.samples[index]
+            self.samples[index] = value
+            self.heads[slot] = (head + 1) % window
+            if old >= 0:
+                self.sums[slot] += value - old
+                self.squares[slot] += value * value - old * old
+            else:
+                self.sums[slot] += value
+                self.squares[slot] += value * value
+                self.counts[slot] += 1
+            ewma = value if self.counts[slot] == 1 else alpha * value + (1 - alpha) * self.ewma[slot]
+            self.ewma[slot] = ewma
+            level = hysteresis_bucket(self.levels[slot], ewma, self.hysteresis)
+            self.levels[slot] = level
+            results.append(stable_signal(ewma, level))
+        return results
+
+    def _row(self, slot):
+        if self._numpy is not None:
+            return self.samples[slot].tolist()
+        start = slot * self.window
+        return self.samples[start:start + self.window].tolist()
+
+    def statistics(self, bssid):
+        """Kennzahlen der letzten Werte einer BSSID oder None, wenn keine aufgenommen wurden."""
+        slot = self._slots.get(bssid.lower()) if bssid else None
+        if slot is None or not self.counts[slot]:
+            return None
+        count = int(self.counts[slot])
+        values = [value for value in self._row(slot) if value >= 0]
+        mean = float(self.sums[slot]) / count
+        # Rundungsfehler der laufenden Summen nicht als negative Varianz ausgeben
+        variance = max(0.0, float(self.squares[slot]) / count - mean * mean)
+        ewma = float(self.ewma[slot])
+        return SignalStatistics(count, ewma, min(values), max(values), mean, variance,
+                                stable_signal(ewma, int(self.levels[slot])))
+
+    def clear(self):
+        self._slots.clear()
+        self._free = list(range(self.capacity - 1, -1, -1))
+        self.samples = None
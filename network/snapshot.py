@@ -0,0 +1,93 @@
+import json
+import os
+import time
+from network.models import Network
+
+# Pfad des gespeicherten Scans für den Warmstart, "0" oder leer schaltet ihn aus
+SNAPSHOT_ENV = "WLAN_SNAPSHOT"
+
+# Wird erhöht, wenn sich das Format ändert; ältere Dateien werden dann ignoriert
+SNAPSHOT_VERSION = 4
+
+def data_directory():
+    """Verzeichnis für gespeicherte Daten (Verlauf, letzter Scan) des Benutzers."""
+    base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(base, "wlan-scanner")
+
+def default_snapshot_path():
+    path = os.environ.get(SNAPSHOT_ENV)
+    if path is not None:
+        return None if path in ("", "0") else path
+    return os.path.join(data_directory(), "snapshot.json")
+
+class Snapshot:
+    """Ein gespeicherter, bereits bewerteter Scan mit dem Zeitpunkt der Aufnahme."""
+
+    __slots__ = ("networks", "timestamp")
+
+    def __init__(self, networks, timestamp):
+        self.networks = networks
+        self.timestamp = timestamp
+
+    @property
+    def age(self):
+        return time.time() - self.timestamp
+
+def snapshot_rows(networks):
+    # Kompakt als Listen statt Wörterbüchern, die Texte der Bewertung werden beim Laden neu erzeugt:
+    # [ssid, auth, encryption, [[bssid, signal, channel, band, radio_type, interface, verdict, channel_usage,
+    #                            interference, stable_signal], ...]]
+    return [
+        [net.ssid, net.auth, net.encryption,
+         [[ap.bssid, ap.signal, ap.channel, ap.band, ap.radio_type, ap.interface, ap.verdict, ap.channel_usage,
+           ap.interference, ap.stable_signal]
+          for ap in net.access_points]]
+        for net in networks
+    ]
+
+def networks_from_rows(rows):
+    networks = []
+    for ssid, auth, encryption, access_points in rows:
+        net = Network(ssid, auth, encryption)
+        for (bssid, signal, channel, band, radio_type, interface, verdict, channel_usage, interference,
+             stable_signal) in access_points:
+            ap = net.add_access_point(bssid, signal, channel, radio_type, interface, band)
+            ap.verdict = verdict
+            ap.channel_usage = channel_usage
+            ap.interference = interference
+            ap.stable_signal = stable_signal
+        networks.append(net)
+    return networks
+
+def save_snapshot(networks, path=None, timestamp=None):
+    """Speichert den bewerteten Scan für den nächsten Start, ohne Pfad unter default_snapshot_path()."""
+    path = path or default_snapshot_path()
+    if path is None or not networks:
+        return False
+    data = {
+        "version": SNAPSHOT_VERSION,
+        "timestamp": time.time() if timestamp is None else timestamp,
+        "networks": snapshot_rows(networks),
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    # Erst vollständig schreiben, dann ersetzen, damit ein Absturz keine halbe Datei hinterlässt
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(temp_path, path)
+    return True
+
+def load_snapshot(path=None):
+    """Lädt den zuletzt gespeicherten Scan oder None, wenn keiner vorhanden oder lesbar ist."""
+    path = path or default_snapshot_path()
+    if path is None:
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != SNAPSHOT_VERSION:
+            return None
+        return Snapshot(networks_from_rows(data["networks"]), data["timestamp"])
+    except (OSError, ValueError, KeyError, TypeError):
+        # Fehlende oder beschädigte Datei: ohne Warmstart weitermachen
+        return None
@@ -0,0 +1,315 @@
+import socket
+import struct
+import sys
+import threading
+import time
+
+# Richtung aus Sicht dieses Rechners
+DIRECTION_DOWNLOAD = "download"
+DIRECTION_UPLOAD = "upload"
+
+# Erstes Byte jeder Verbindung: der Server sendet (Download) bzw. verwirft (Upload)
+_COMMANDS = {
+    DIRECTION_DOWNLOAD: b"D",
+    DIRECTION_UPLOAD: b"U",
+}
+
+DEFAULT_PORT = 5201
+DEFAULT_STREAMS = 4
+DEFAULT_DURATION = 5.0
+DEFAULT_TIMEOUT = 3.0
+SAMPLE_INTERVAL = 1.0
+
+# Puffer je Verbindung, einmal angelegt und für jeden Aufruf wiederverwendet;
+# groß genug, dass die Zahl der Systemaufrufe (und damit der Python-Anteil) klein bleibt
+BUFFER_SIZE = 256 * 1024
+
+# Maximale Wartezeit am Stück, damit Ende und Abbruch schnell wirken
+CANCEL_POLL_INTERVAL = 0.1
+
+# tcp_info.tcpi_total_retrans (Linux): 8 Byte Zustandsfelder, dann das 24. u32-Feld
+_TCP_INFO_SIZE = 104
+_TCP_INFO_TOTAL_RETRANS = struct.Struct("=I")
+_TCP_INFO_TOTAL_RETRANS_OFFSET = 100
+
+class ThroughputTarget:
+    """Gegenstelle einer Durchsatzmessung (ThroughputServer oder kompatibler Dienst)."""
+
+    __slots__ = ("host", "port")
+
+    def __init__(self, host, port=DEFAULT_PORT):
+        self.host = host
+        self.port = port
+
+    def to_dict(self):
+        return {"host": self.host, "port": self.port}
+
+    def __repr__(self):
+        return f"ThroughputTarget({self.host}:{self.port})"
+
+class ThroughputResult:
+    """Ergebnis einer Durchsatzmessung.
+
+    streams ist die Zahl der aufgebauten Verbindungen, samples enthält den
+    Durchsatz je Sekunde in Bit/s. retransmits und
+    retransmit_free (Sekunden ohne Neuübertragung) sind nur bekannt, wenn
+    dieser Rechner sendet und das System TCP_INFO liefert (Linux), sonst None.
+    """
+
+    __slots__ = ("target", "direction", "streams", "duration", "bytes", "samples",
+                 "retransmits", "retransmit_free", "errors")
+
+    def __init__(self, target, direction, streams, duration, transferred, samples,
+                 retransmits=None, retransmit_free=None, errors=None):
+        self.target = target
+        self.direction = direction
+        self.streams = streams
+        self.duration = duration
+        self.bytes = transferred
+        self.samples = samples
+        self.retransmits = retransmits
+        self.retransmit_free = retransmit_free
+        self.errors = errors or []
+
+    @property
+    def goodput(self):
+        """Nutzdaten in Bit/s über die gesamte Messung."""
+        return self.bytes * 8 / self.duration if self.duration else 0.0
+
+    @property
+    def goodput_mbit(self):
+        return self.goodput / 1e6
+
+    def to_dict(self):
+        """Ergebnis als JSON-taugliches Wörterbuch (Raten in Bit/s, Zeiten in Sekunden)."""
+        return {
+            "target": self.target.to_dict(),
+            "direction": self.direction,
+            "streams": self.streams,
+            "duration": self.duration,
+            "bytes": self.bytes,
+            "goodput": self.goodput,
+            "samples": self.samples,
+            "retransmits": self.retransmits,
+            "retransmit_free": self.retransmit_free,
+            "errors": self.errors,
+        }
+
+    def __repr__(self):
+        return f"ThroughputResult({self.target!r}, {self.direction}, {self.goodput_mbit:.1f} MBit/s, {self.streams} Streams)"
+
+def total_retransmits(sock):
+    """Bisher neu übertragene Segmente der Verbindung oder None, wenn das System es nicht liefert."""
+    if not sys.platform.startswith("linux") or not hasattr(socket, "TCP_INFO"):
+        return None
+    try:
+        info = sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_INFO, _TCP_INFO_SIZE)
+    except OSError:
+        return None
+    if len(info) < _TCP_INFO_TOTAL_RETRANS_OFFSET + 4:
+        return None
+    return _TCP_INFO_TOTAL_RETRANS.unpack_from(info, _TCP_INFO_TOTAL_RETRANS_OFFSET)[0]
+
+def _receive_stream(sock, index, counters, stop_event, errors):
+    # Ein Puffer je Verbindung, recv_into schreibt direkt hinein (keine neuen bytes-Objekte)
+    buffer = bytearray(BUFFER_SIZE)
+    recv_into = sock.recv_into
+    try:
+        while not stop_event.is_set():
+            try:
+                received = recv_into(buffer)
+            except socket.timeout:
+                continue
+            if not received:
+                break
+            counters[index] += received
+    except OSError as e:
+        if not stop_event.is_set():
+            errors.append(f"Stream {index + 1}: {e}")
+
+def _send_stream(sock, index, counters, stop_event, errors):
+    # Derselbe Puffer wird immer wieder gesendet, bei Teilsendungen über eine memoryview ohne Kopie
+    view = memoryview(bytearray(BUFFER_SIZE))
+    send = sock.send
+    try:
+        while not stop_event.is_set():
+            try:
+                sent = send(view)
+            except socket.timeout:
+                continue
+            counters[index] += sent
+    except OSError as e:
+        if not stop_event.is_set():
+            errors.append(f"Stream {index + 1}: {e}")
+
+def _retransmit_counts(sockets):
+    counts = [total_retransmits(sock) for sock in sockets]
+    return None if any(count is None for count in counts) else sum(counts)
+
+def measure_throughput(target, direction=DIRECTION_DOWNLOAD, streams=DEFAULT_STREAMS, duration=DEFAULT_DURATION,
+                       timeout=DEFAULT_TIMEOUT, on_sample=None, cancel_event=None):
+    """Misst den Durchsatz zum Ziel über streams parallele TCP-Verbindungen.
+
+    Jede Verbindung hat einen eigenen Thread mit festem Puffer; dieser Thread
+    zählt nur Bytes, Stichproben und Neuübertragungen liest der aufrufende
+    Thread einmal je SAMPLE_INTERVAL. on_sample(sekunde, bit_pro_sekunde) wird
+    nach jeder Stichprobe aufgerufen. Ein Abbruch beendet die Messung vorzeitig
+    und liefert das Ergebnis bis dahin. Verbindungen, die sich nicht aufbauen
+    lassen, stehen in errors und die Messung läuft mit den übrigen; nur wenn
+    keine zustande kommt, wird ein Fehler ausgelöst.
+    """
+    command = _COMMANDS[direction]
+    worker = _receive_stream if direction == DIRECTION_DOWNLOAD else _send_stream
+    sockets = []
+    errors = []
+    for index in range(streams):
+        sock = None
+        try:
+            sock = socket.create_connection((target.host, target.port), timeout=timeout)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.sendall(command)
+            sock.settimeout(CANCEL_POLL_INTERVAL)
+        except OSError as e:
+            if sock is not None:
+                sock.close()
+            error = e
+            errors.append(f"Stream {index + 1}: {e}")
+            continue
+        sockets.append(sock)
+    if not sockets:
+        raise Exception(f"Fehler beim Verbinden mit {target.host}:{target.port}: {error}")
+
+    streams = len(sockets)
+    counters = [0] * streams
+    stop_event = threading.Event()
+    threads = [
+        threading.Thread(target=worker, args=(sock, index, counters, stop_event, errors), daemon=True)
+        for index, sock in enumerate(sockets)
+    ]
+    # Neuübertragungen entstehen beim Sender, beim Download also auf der Gegenstelle
+    measure_retransmits = direction == DIRECTION_UPLOAD
+    retransmits_start = _retransmit_counts(sockets) if measure_retransmits else None
+    retransmits_last = retransmits_start
+    retransmit_free = 0.0 if retransmits_start is not None else None
+    samples = []
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    try:
+        last_time = started
+        last_bytes = 0
+        end = started + duration
+        while True:
+            now = time.perf_counter()
+            if now >= end or not any(thread.is_alive() for thread in threads):
+                break
+            wait = min(SAMPLE_INTERVAL - (now - last_time), end - now)
+            if cancel_event is not None:
+                if cancel_event.wait(max(0.0, wait)):
+                    break
+            else:
+                time.sleep(max(0.0, wait))
+            now = time.perf_counter()
+            if now - last_time < SAMPLE_INTERVAL and now < end:
+                continue
+            transferred = sum(counters)
+            rate = (transferred - last_bytes) * 8 / (now - last_time)
+            samples.append(rate)
+            if retransmits_last is not None:
+                retransmits = _retransmit_counts(sockets)
+                if retransmits is not None and retransmits == retransmits_last:
+                    retransmit_free += now - last_time
+                retransmits_last = retransmits
+            if on_sample is not None:
+                on_sample(len(samples), rate)
+            last_time = now
+            last_bytes = transferred
+    finally:
+        elapsed = time.perf_counter() - started
+        transferred = sum(counters)
+        stop_event.set()
+        retransmits_end = _retransmit_counts(sockets) if measure_retransmits else None
+        for thread in threads:
+            thread.join(1)
+        for sock in sockets:
+            sock.close()
+    retransmits = retransmits_end - retransmits_start if retransmits_start is not None and retransmits_end is not None else None
+    return ThroughputResult(target, direction, streams, elapsed, transferred, samples,
+                            retransmits, retransmit_free, errors)
+
+class ThroughputServer:
+    """Gegenstelle für measure_throughput(), z. B. auf 127.0.0.1 für Tests ohne Netzwerk.
+
+    Sendet bei Download-Verbindungen fortlaufend aus einem festen Puffer und
+    verwirft bei Upload-Verbindungen alles in einen festen Puffer, bis der
+    Client die Verbindung schließt. Verwendung:
+    with ThroughputServer() as server: measure_throughput(server.target())
+    """
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.socket.bind((host, port))
+        self.socket.listen(64)
+        # Vor dem Start des Threads setzen, stop() kann den Socket sofort schließen
+        self.socket.settimeout(0.2)
+        self.host, self.port = self.socket.getsockname()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+
+    def target(self):
+        return ThroughputTarget(self.host, self.port)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+        self.socket.close()
+        self._thread.join(1)
+
+    def serve_forever(self):
+        """Bedient Verbindungen im aufrufenden Thread bis stop() oder KeyboardInterrupt."""
+        self._serve()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _serve(self):
+        while not self._stop_event.is_set():
+            try:
+                connection, _ = self.socket.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            threading.Thread(target=self._handle, args=(connection,), daemon=True).start()
+
+    def _handle(self, connection):
+        with connection:
+            try:
+                connection.settimeout(DEFAULT_TIMEOUT)
+                command = connection.recv(1)
+                connection.settimeout(CANCEL_POLL_INTERVAL)
+                buffer = bytearray(BUFFER_SIZE)
+                if command == _COMMANDS[DIRECTION_DOWNLOAD]:
+                    view = memoryview(buffer)
+                    while not self._stop_event.is_set():
+                        try:
+                            connection.send(view)
+                        except socket.timeout:
+                            continue
+                elif command == _COMMANDS[DIRECTION_UPLOAD]:
+                    while not self._stop_event.is_set():
+                        try:
+                            if not connection.recv_into(buffer):
+                                break
+                        except socket.timeout:
+                            continue
+            except OSError:
+                # Client hat die Verbindung beendet
+                pass
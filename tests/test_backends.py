@@ -0,0 +1,119 @@
+import pytest
+
+from network import backends
+from network.backends import NetshBackend, parse_networks
+from network.evaluation import AUTH_OPEN, AUTH_SECURE, classify_auth, evaluate_access_points
+from network.interference import BAND_24, BAND_6
+from network.profiles import ProfileStore
+
+NETSH_EN = """
+Interface name : WLAN
+There are 2 networks currently visible.
+
+SSID 1 : Cafe
+    Network type            : Infrastructure
+    Authentication          : Open
+    Encryption              : None
+    BSSID 1                 : aa:bb:cc:dd:ee:01
+         Signal             : 80%
+         Radio type         : 802.11n
+         Channel            : 6
+
+SSID 2 : Home
+    Network type            : Infrastructure
+    Authentication          : WPA2-Personal
+    Encryption              : CCMP
+    BSSID 1                 : aa:bb:cc:dd:ee:02
+         Signal             : 60%
+         Radio type         : 802.11ac
+         Channel            : 36
+"""
+
+def test_parse_english_open_network():
+    networks = {net.ssid: net for net in parse_networks(NETSH_EN)}
+    assert networks["Cafe"].auth == "Offen"
+    assert networks["Cafe"].encryption == "Keine"
+    assert classify_auth(networks["Cafe"].auth) == AUTH_OPEN
+    assert classify_auth(networks["Home"].auth) == AUTH_SECURE
+
+def test_parse_english_matches_german():
+    german = NETSH_EN.replace("Authentication", "Authentifizierung").replace("Encryption", "Verschlüsselung") \
+        .replace("Open", "Offen").replace("None", "Keine").replace("Radio type", "Funktyp").replace("Channel", "Kanal")
+    english = [(net.ssid, net.auth, net.encryption) for net in parse_networks(NETSH_EN)]
+    assert english == [(net.ssid, net.auth, net.encryption) for net in parse_networks(german)]
+
+NETSH_EN_BANDS = """
+SSID 1 : Home
+    Network type            : Infrastructure
+    Authentication          : WPA3-Personal
+    Encryption              : CCMP
+    BSSID 1                 : aa:bb:cc:dd:ee:01
+         Signal             : 70%
+         Radio type         : 802.11ax
+         Band               : 2.4 GHz
+         Channel            : 1
+    BSSID 2                 : aa:bb:cc:dd:ee:02
+         Signal             : 90%
+         Radio type         : 802.11ax
+         Band               : 6 GHz
+         Channel            : 1
+"""
+
+def test_parse_band_keeps_6ghz_channels_apart():
+    (home,) = parse_networks(NETSH_EN_BANDS)
+    assert [(ap.channel, ap.band) for ap in home.access_points] == [(1, BAND_24), (1, BAND_6)]
+    evaluate_access_points(home.access_points)
+    # Kanal 1 im 6-GHz-Band stört Kanal 1 im 2,4-GHz-Band nicht
+    assert [(ap.channel_usage, ap.interference) for ap in home.access_points] == [(1, 0.0), (1, 0.0)]
+
+class _Completed:
+    def __init__(self, stdout):
+        self.stdout = stdout.encode("cp850")
+
+def _fake_netsh(outputs, calls):
+    def run(args, **kwargs):
+        calls.append(args[2])
+        return _Completed(outputs[args[2]])
+    return run
+
+NETSH_RESULTS = {
+    "de": {
+        "delete": 'Das Profil "Cafe" wurde von der Schnittstelle "WLAN" gelöscht.',
+        "add": 'Das Profil "Cafe" wird der Schnittstelle "WLAN" hinzugefügt.',
+        "connect": "Die Verbindungsanforderung wurde erfolgreich abgeschlossen.",
+    },
+    "en": {
+        "delete": 'Profile "Cafe" is deleted from interface "Wi-Fi".',
+        "add": "Profile Cafe is added on interface Wi-Fi.",
+        "connect": "Connection request was completed successfully.",
+    },
+}
+
+@pytest.mark.parametrize("locale", sorted(NETSH_RESULTS))
+def test_connect_recognizes_success_in_each_locale(monkeypatch, locale):
+    calls = []
+    monkeypatch.setattr(backends.subprocess, "run", _fake_netsh(NETSH_RESULTS[locale], calls))
+    monkeypatch.setattr(backends, "profile_store", ProfileStore())
+    assert NetshBackend().connect("Cafe", "geheim123") == "Erfolgreich verbunden"
+    assert calls == ["delete", "add", "connect"]
+
+def test_connect_reports_failure_in_english(monkeypatch):
+    outputs = dict(NETSH_RESULTS["en"], connect='There is no profile "Cafe" assigned to the specified interface.')
+    monkeypatch.setattr(backends.subprocess, "run", _fake_netsh(outputs, []))
+    monkeypatch.setattr(backends, "profile_store", ProfileStore())
+    with pytest.raises(Exception, match="Fehler beim Verbinden"):
+        NetshBackend().connect("Cafe", "geheim123")
+
+def test_installed_profile_is_remembered_across_restarts(monkeypatch, tmp_path):
+    path = str(tmp_path / "profiles.json")
+    calls = []
+    monkeypatch.setattr(backends.subprocess, "run", _fake_netsh(NETSH_RESULTS["de"], calls))
+    monkeypatch.setattr(backends, "profile_store", ProfileStore(path))
+    NetshBackend().connect("Cafe", "geheim123")
+    # Neuer Prozess: Fingerabdrücke aus der Datei, das unveränderte Profil wird nicht neu geschrieben
+    monkeypatch.setattr(backends, "profile_store", ProfileStore(path))
+    NetshBackend().connect("Cafe", "geheim123")
+    NetshBackend().connect("Cafe", "anderes-passwort")
+    assert calls == ["delete", "add", "connect", "connect", "delete", "add", "connect"]
+    with open(path, encoding="utf-8") as f:
+        assert "geheim123" not in f.read()
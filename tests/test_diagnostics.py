@@ -0,0 +1,51 @@
+import threading
+import time
+
+import pytest
+
+from network import diagnostics
+from network.diagnostics import CONNECTED_INFO, NETWORKS, PACKET_LOSS, run_diagnostics_sync
+from network.scanner import ScanCancelled
+
+class _FakeBackend:
+    def probe(self, target, cancel_event=None):
+        return "statistik"
+
+@pytest.fixture
+def stopped_scans(monkeypatch):
+    # Scan blockiert bis zum Abbruch, Verbindungsabfrage schlägt fehl, Paketverlust gelingt
+    stopped = []
+
+    def scan(cancel_event=None, on_network=None):
+        stopped.append(cancel_event.wait(5))
+        return []
+
+    def connected_info(cancel_event=None):
+        raise Exception("Keine WLAN-Schnittstelle gefunden")
+
+    monkeypatch.setattr(diagnostics, "scan_networks", scan)
+    monkeypatch.setattr(diagnostics, "get_connected_network_info", connected_info)
+    monkeypatch.setattr(diagnostics, "get_backend", _FakeBackend)
+    return stopped
+
+def test_timeout_and_failure_are_reported_per_diagnostic(stopped_scans):
+    reported = []
+    started = time.perf_counter()
+    result = run_diagnostics_sync(timeouts={NETWORKS: 0.2},
+                                  on_result=lambda name, value, error: reported.append((name, value, error)))
+    assert time.perf_counter() - started < 2.0
+    assert result.errors == {
+        NETWORKS: "Zeitlimit von 0.2 Sekunden überschritten",
+        CONNECTED_INFO: "Keine WLAN-Schnittstelle gefunden",
+    }
+    assert (result.networks, result.connected_info, result.packet_loss) == (None, None, "statistik")
+    assert sorted(name for name, _, _ in reported) == sorted([NETWORKS, CONNECTED_INFO, PACKET_LOSS])
+    # Das Zeitlimit setzt das Abbruch-Event des blockierenden Scans
+    assert stopped_scans == [True]
+
+def test_cancel_stops_all_diagnostics(stopped_scans):
+    cancel_event = threading.Event()
+    threading.Timer(0.2, cancel_event.set).start()
+    with pytest.raises(ScanCancelled):
+        run_diagnostics_sync(cancel_event=cancel_event)
+    assert stopped_scans == [True]
@@ -0,0 +1,102 @@
+import random
+
+import pytest
+
+from network import evaluation
+from network.evaluation import NUMPY_MIN_ROWS, evaluate_access_points, reevaluate_access_points
+from network.interference import BAND_6, round_score
+from network.models import Network
+
+# (SSID, Authentifizierung, Verschlüsselung, [(BSSID, Signal, Kanal), ...])
+SCAN = [
+    ("Home", "WPA2-Personal", "CCMP", [("aa:00:00:00:00:01", 80, 1), ("aa:00:00:00:00:02", 45, 36)]),
+    ("Office", "WPA3-Personal", "CCMP", [("aa:00:00:00:00:03", 60, 6), ("aa:00:00:00:00:04", 20, 40)]),
+    ("Cafe", "Offen", "Keine", [("aa:00:00:00:00:05", 70, 11)]),
+    ("Lab", "WPA2-Personal", "CCMP", [("aa:00:00:00:00:06", 55, 44), ("aa:00:00:00:00:07", 90, 48)]),
+]
+
+def _networks(scan=SCAN):
+    networks = []
+    for ssid, auth, encryption, access_points in scan:
+        net = Network(ssid, auth, encryption)
+        for bssid, signal, channel in access_points:
+            net.add_access_point(bssid, signal, channel)
+        networks.append(net)
+    return networks
+
+def _evaluated(networks):
+    evaluate_access_points([ap for net in networks for ap in net.access_points])
+    return networks
+
+def _index(networks):
+    return {ap.bssid: ap for net in networks for ap in net.access_points}
+
+def _results(networks):
+    return [(ap.bssid, ap.verdict, ap.channel_usage, ap.interference, ap.stable_signal)
+            for net in networks for ap in net.access_points]
+
+def test_unchanged_rescan_reuses_every_verdict():
+    previous = _index(_evaluated(_networks()))
+    rescan = _networks()
+    assert reevaluate_access_points(rescan, previous) == 0
+    assert _results(rescan) == _results(_evaluated(_networks()))
+
+def test_rescan_recomputes_only_changed_access_points():
+    previous = _index(_evaluated(_networks()))
+    scan = [list(entry) for entry in SCAN]
+    # Signalbereich (45 -> 25), Kanal (40 -> 52), Sicherheit (Cafe jetzt WPA2) und eine neue BSSID
+    scan[0][3] = [("aa:00:00:00:00:01", 80, 1), ("aa:00:00:00:00:02", 25, 36)]
+    scan[1][3] = [("aa:00:00:00:00:03", 60, 6), ("aa:00:00:00:00:04", 20, 52)]
+    scan[2][1:3] = ["WPA2-Personal", "CCMP"]
+    scan[3][3] = scan[3][3] + [("aa:00:00:00:00:08", 75, 149)]
+    # Signal ändert sich innerhalb des Bereichs: Bewertung bleibt gültig
+    scan[3][3][0] = ("aa:00:00:00:00:06", 58, 44)
+    rescan = _networks(scan)
+    assert reevaluate_access_points(rescan, previous) == 4
+    assert _results(rescan) == _results(_evaluated(_networks(scan)))
+
+def test_interference_crossing_threshold_invalidates_neighbours():
+    previous = _index(_evaluated(_networks()))
+    # Viele starke Access Points auf Kanal 2 überlasten Kanal 1 (Nachbarkanal) für "Home"
+    crowd = ("Crowd", "WPA2-Personal", "CCMP", [(f"bb:00:00:00:00:{index:02x}", 90, 2) for index in range(4)])
+    scan = SCAN + [crowd]
+    rescan = _networks(scan)
+    recomputed = reevaluate_access_points(rescan, previous)
+    expected = _evaluated(_networks(scan))
+    assert _results(rescan) == _results(expected)
+    home = next(ap for net in rescan for ap in net.access_points if ap.bssid == "aa:00:00:00:00:01")
+    assert home.verdict != previous["aa:00:00:00:00:01"].verdict
+    # Die vier neuen und der überlastete Access Point, die übrigen Kanäle sind unverändert
+    assert recomputed == 5
+
+def _large_scan(seed=7):
+    # Mehr Access Points als NUMPY_MIN_ROWS, mit unbekanntem Signal und Kanal und 6-GHz-Kanälen
+    rng = random.Random(seed)
+    auths = [("WPA2-Personal", "CCMP"), ("WPA3-Personal", "GCMP"), ("Offen", "Keine"), ("WEP", "WEP"), (None, None)]
+    channels = [None, 1, 2, 3, 6, 9, 11, 13, 14, 36, 40, 149, 165]
+    networks = []
+    for index in range(2 * NUMPY_MIN_ROWS):
+        net = Network(f"Net {index}", *rng.choice(auths))
+        for ap_index in range(rng.randint(1, 3)):
+            signal = rng.choice([None, rng.randint(0, 100)])
+            if rng.random() < 0.2:
+                net.add_access_point(f"{index:06x}{ap_index:06x}", signal, rng.choice((1, 5, 37, 233)), band=BAND_6)
+            else:
+                net.add_access_point(f"{index:06x}{ap_index:06x}", signal, rng.choice(channels))
+        networks.append(net)
+    return networks
+
+def test_numpy_and_python_paths_agree(monkeypatch):
+    pytest.importorskip("numpy")
+    with_numpy = _evaluated(_large_scan())
+    monkeypatch.setattr(evaluation, "NUMPY_MIN_ROWS", 10 ** 9)
+    pure_python = _evaluated(_large_scan())
+    assert _results(with_numpy) == _results(pure_python)
+    assert any(ap.interference > 0 for net in with_numpy for ap in net.access_points)
+
+def test_round_score_matches_numpy_round():
+    np = pytest.importorskip("numpy")
+    # Grenzfälle, an denen round(value, 3) anders rundet als NumPy
+    values = [2.0785, 2.7335, 1.6355, 2.2135, 2.6945, 0.0005, 1.5]
+    assert [round_score(value) for value in values] == np.round(np.asarray(values), 3).tolist()
+
@@ -0,0 +1,51 @@
+import time
+
+import pytest
+
+from network.history import DOWNSAMPLE_AFTER, DOWNSAMPLE_INTERVAL, RETENTION, ScanHistory
+from network.models import Network
+
+def _scan(signal, bssid="aa:00:00:00:00:01"):
+    net = Network("Home", "WPA2-Personal", "CCMP")
+    net.add_access_point(bssid, signal, 6)
+    return [net]
+
+@pytest.fixture
+def history(tmp_path):
+    history = ScanHistory(str(tmp_path / "history.sqlite3"))
+    yield history
+    history.close()
+
+def _rows(history, bssid="aa:00:00:00:00:01"):
+    return [(observation.timestamp, observation.signal, observation.resolution)
+            for observation in history.bssid_history(bssid)]
+
+def test_old_observations_are_averaged_per_window(history):
+    now = time.time()
+    window = (now - DOWNSAMPLE_AFTER - 3600) // DOWNSAMPLE_INTERVAL * DOWNSAMPLE_INTERVAL
+    for offset, signal in ((5, 40), (100, 50), (200, 61)):
+        history.record(_scan(signal), window + offset)
+    # Nächstes Fenster und ein aktueller Scan, der als Rohdaten bleibt
+    history.record(_scan(30), window + DOWNSAMPLE_INTERVAL + 1)
+    history.record(_scan(70), now - 60)
+    history.flush()
+    history.maintain(now)
+    expected = [(window, 50, DOWNSAMPLE_INTERVAL), (window + DOWNSAMPLE_INTERVAL, 30, DOWNSAMPLE_INTERVAL),
+                (now - 60, 70, 0)]
+    assert _rows(history) == expected
+    # Erneutes Verdichten ändert nichts mehr
+    history.maintain(now)
+    assert _rows(history) == expected
+
+def test_observations_past_retention_are_deleted(history):
+    now = time.time()
+    history.record(_scan(20), now - RETENTION - 3600)
+    history.record(_scan(45, "aa:00:00:00:00:02"), now - RETENTION + 3600)
+    history.record(_scan(80), now - 10)
+    history.flush()
+    history.maintain(now)
+    assert history.count() == 2
+    assert [signal for _, signal, _ in _rows(history)] == [80]
+    assert [signal for _, signal, _ in _rows(history, "aa:00:00:00:00:02")] == [45]
+    # Die letzte Stunde enthält nur den aktuellen Scan
+    assert [observation.signal for observation in history.signal_trend("Home", now=now)] == [80]
@@ -0,0 +1,61 @@
+import struct
+
+from network import native
+from network.interference import BAND_6
+from network.models import UNKNOWN
+from network.native import (NL80211_ATTR_IFINDEX, NL80211_ATTR_IFNAME, NL80211_ATTR_SSID, NL80211_ATTR_WIPHY_FREQ,
+                            NativeBackend, frequency_to_band, frequency_to_channel)
+
+class _FakeClient:
+    # Ersetzt den Netlink-Client: ein verbundener Adapter auf der angegebenen Frequenz
+    def __init__(self, frequency):
+        self.closed = False
+        self.interface = {
+            NL80211_ATTR_IFINDEX: struct.pack("=I", 3),
+            NL80211_ATTR_IFNAME: b"wlan0\0",
+            NL80211_ATTR_SSID: b"Home",
+            NL80211_ATTR_WIPHY_FREQ: struct.pack("=I", frequency),
+        }
+
+    def interfaces(self):
+        return [self.interface]
+
+    def scan_results(self, ifindex):
+        return []
+
+    def station_info(self, ifindex):
+        return None
+
+    def close(self):
+        self.closed = True
+
+def _linux_wlan(monkeypatch, frequency=2437):
+    clients = []
+
+    def client():
+        clients.append(_FakeClient(frequency))
+        return clients[-1]
+
+    monkeypatch.setattr(native.sys, "platform", "linux")
+    monkeypatch.setattr(native, "Nl80211Client", client)
+    return clients
+
+def test_is_available_closes_the_probe_client(monkeypatch):
+    clients = _linux_wlan(monkeypatch)
+    assert NativeBackend.is_available()
+    assert [client.closed for client in clients] == [True]
+
+def test_connected_info_reports_unknown_channel(monkeypatch):
+    # 60 GHz (802.11ad) hat keine Kanalnummer in frequency_to_channel()
+    _linux_wlan(monkeypatch, 58320)
+    info = NativeBackend().connected_info()
+    assert (info["ssid"], info["interface"], info["channel"]) == ("Home", "wlan0", UNKNOWN)
+
+def test_connected_info_reports_6ghz_band(monkeypatch):
+    _linux_wlan(monkeypatch, 5975)
+    info = NativeBackend().connected_info()
+    assert (info["channel"], info["band"]) == ("5", BAND_6)
+
+def test_frequencies_map_to_channel_and_band():
+    assert [(frequency_to_channel(f), frequency_to_band(f)) for f in (2412, 2484, 5180, 5955)] == [
+        (1, "2,4 GHz"), (14, "2,4 GHz"), (36, "5 GHz"), (1, BAND_6)]
@@ -0,0 +1,82 @@
+import socket
+import struct
+import threading
+
+import pytest
+
+from network.probe import (PROBE_UDP, LocalEchoServer, ProbeResult, ProbeTarget, compute_statistics, iter_probes,
+                           probe_target)
+
+class _DroppingUdpServer:
+    # Antwortet nur auf Messungen mit gerader Sequenznummer, die übrigen gehen "verloren"
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.settimeout(0.1)
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+
+    def target(self):
+        return ProbeTarget(*self.sock.getsockname(), PROBE_UDP)
+
+    def _serve(self):
+        while not self.stop_event.is_set():
+            try:
+                data, address = self.sock.recvfrom(2048)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            if struct.unpack("!I", data[-4:])[0] % 2 == 0:
+                self.sock.sendto(data, address)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop_event.set()
+        self.thread.join(1)
+        self.sock.close()
+
+def test_udp_echo_measures_latency_without_loss():
+    with LocalEchoServer() as server:
+        statistics = probe_target(server.udp_target(), count=5, interval=0.0, timeout=1.0)
+    assert (statistics.sent, statistics.received, statistics.loss_percent) == (5, 5, 0.0)
+    assert 0 < statistics.rtt_min <= statistics.rtt_p50 <= statistics.rtt_p90 <= statistics.rtt_max < 1.0
+    assert 0 <= statistics.jitter <= statistics.rtt_max - statistics.rtt_min
+
+def test_tcp_connect_counts_as_reply():
+    with LocalEchoServer() as server:
+        statistics = probe_target(server.tcp_target(), count=3, interval=0.0, timeout=1.0)
+    assert (statistics.received, statistics.loss_percent) == (3, 0.0)
+    assert statistics.rtt_max < 1.0
+
+def test_silent_target_times_out_as_loss():
+    # Gebundener Socket ohne Antworten: jede Messung läuft in die Zeitüberschreitung
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as silent:
+        silent.bind(("127.0.0.1", 0))
+        target = ProbeTarget(*silent.getsockname(), PROBE_UDP)
+        results = list(iter_probes(target, count=2, interval=0.0, timeout=0.1))
+    assert [(result.lost, result.error) for result in results] == [(True, "Zeitüberschreitung")] * 2
+    statistics = compute_statistics(target, results)
+    assert (statistics.received, statistics.loss_percent) == (0, 100.0)
+    assert statistics.rtt_p50 is None and statistics.jitter is None
+
+def test_partial_loss_keeps_statistics_of_replies():
+    with _DroppingUdpServer() as server:
+        target = server.target()
+        results = list(iter_probes(target, count=4, interval=0.0, timeout=0.2))
+    assert [result.lost for result in results] == [False, True, False, True]
+    statistics = compute_statistics(target, results)
+    assert (statistics.sent, statistics.received, statistics.loss_percent) == (4, 2, 50.0)
+    assert statistics.jitter == pytest.approx(abs(results[2].rtt - results[0].rtt))
+
+def test_jitter_is_mean_difference_of_consecutive_replies():
+    target = ProbeTarget("127.0.0.1", 9, PROBE_UDP)
+    results = [ProbeResult(target, sequence, rtt) for sequence, rtt in enumerate((0.010, 0.030, None, 0.020))]
+    statistics = compute_statistics(target, results)
+    assert statistics.loss_percent == 25.0
+    assert statistics.rtt_p50 == pytest.approx(0.020)
+    # |0.030 - 0.010| und |0.020 - 0.030|, der Verlust dazwischen wird übersprungen
+    assert statistics.jitter == pytest.approx(0.015)
@@ -0,0 +1,53 @@
+import pytest
+
+from network import scanner, service
+from network.models import Network
+from network.service import ScannerService, ServiceClient, ServiceUnavailable, get_service_client
+
+def _networks(ssid):
+    net = Network(ssid, "WPA2-Personal", "CCMP")
+    net.add_access_point("aa:00:00:00:00:01", 70, 6)
+    return [net]
+
+@pytest.fixture
+def scans(monkeypatch, tmp_path):
+    # Dienst und Client scannen nie selbst, Dienstdatei und Client-Zustand je Test neu
+    monkeypatch.setattr(service, "scan_local_networks", lambda cancel_event=None: _networks("Dienst"))
+    monkeypatch.setattr(scanner, "scan_local_networks", lambda cancel_event=None, on_network=None: _networks("Lokal"))
+    monkeypatch.setenv("LOCALAPPDATA", str(tmp_path))
+    monkeypatch.delenv(service.SERVICE_ENV, raising=False)
+    monkeypatch.setattr(service, "_client", None)
+    monkeypatch.setattr(service, "_client_configured", False)
+    monkeypatch.setattr(service, "_lookup_after", 0.0)
+
+def test_client_reads_snapshot_from_service(scans):
+    with ScannerService(port=0, interval=60.0) as running:
+        snapshot = ServiceClient((running.host, running.port)).snapshot()
+    assert [net.ssid for net in snapshot.networks] == ["Dienst"]
+    assert [ap.bssid for ap in snapshot.networks[0].access_points] == ["aa:00:00:00:00:01"]
+
+def test_scan_falls_back_to_local_scan_when_service_is_down(scans):
+    running = ScannerService(port=0, interval=60.0).start()
+    try:
+        assert [net.ssid for net in scanner.scan_networks()] == ["Dienst"]
+        client = get_service_client()
+        assert client.address == (running.host, running.port)
+    finally:
+        running.stop()
+    # Dienst beendet (Datei entfernt): selbst scannen und die Adresse neu suchen
+    assert [net.ssid for net in scanner.scan_networks()] == ["Lokal"]
+    assert client.stale and not client.is_available()
+    assert get_service_client() is None
+
+def test_service_address_is_cached_until_a_failure(scans):
+    with ScannerService(port=0, interval=60.0) as running:
+        running._write_service_file()
+        client = get_service_client()
+        running._remove_service_file()
+        # Ohne Fehlversuch wird die Datei nicht erneut gelesen
+        assert get_service_client() is client
+        client.snapshot()
+        assert get_service_client() is client
+    with pytest.raises(ServiceUnavailable):
+        client.snapshot()
+    assert get_service_client() is None
@@ -0,0 +1,24 @@
+from network.models import Network
+from network.snapshot import load_snapshot, networks_from_rows, save_snapshot, snapshot_rows
+
+def _networks():
+    net = Network("Home", "WPA2-Personal", "CCMP")
+    ap = net.add_access_point("AA:BB:CC:DD:EE:01", 48, 6, "802.11ax", "WLAN 2")
+    ap.verdict = 4
+    ap.channel_usage = 3
+    ap.interference = 1.2
+    ap.stable_signal = 55
+    return [net]
+
+def test_rows_keep_interface_and_stable_signal():
+    ap = networks_from_rows(snapshot_rows(_networks()))[0].access_points[0]
+    assert ap.interface == "WLAN 2"
+    assert ap.stable_signal == 55
+    assert (ap.signal, ap.channel, ap.verdict, ap.channel_usage, ap.interference) == (48, 6, 4, 3, 1.2)
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "snapshot.json")
+    assert save_snapshot(_networks(), path, timestamp=100.0)
+    snapshot = load_snapshot(path)
+    assert snapshot.timestamp == 100.0
+    assert snapshot_rows(snapshot.networks) == snapshot_rows(_networks())
@@ -0,0 +1,79 @@
+import socket
+import struct
+import sys
+import threading
+
+import pytest
+
+from network import throughput
+from network.throughput import (DIRECTION_DOWNLOAD, DIRECTION_UPLOAD, ThroughputServer, ThroughputTarget,
+                                measure_throughput)
+
+def _free_port():
+    # Port, auf dem (gleich danach) niemand lauscht: Verbindungen werden abgelehnt
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+@pytest.mark.parametrize("direction", [DIRECTION_DOWNLOAD, DIRECTION_UPLOAD])
+def test_loopback_counts_bytes_over_the_duration(direction):
+    with ThroughputServer() as server:
+        result = measure_throughput(server.target(), direction, streams=2, duration=0.3)
+    assert (result.direction, result.streams, result.errors) == (direction, 2, [])
+    assert 0.3 <= result.duration < 1.3
+    assert result.bytes > 0
+    assert result.goodput == pytest.approx(result.bytes * 8 / result.duration)
+    # Kürzer als SAMPLE_INTERVAL: genau eine Stichprobe über die ganze Messung
+    assert len(result.samples) == 1 and result.samples[0] > 0
+
+def test_cancel_ends_the_measurement_early():
+    cancel_event = threading.Event()
+    timer = threading.Timer(0.2, cancel_event.set)
+    with ThroughputServer() as server:
+        timer.start()
+        result = measure_throughput(server.target(), streams=1, duration=5.0, cancel_event=cancel_event)
+    assert result.duration < 2.0
+    assert result.bytes > 0
+
+def test_refused_connection_raises_when_no_stream_connects():
+    with pytest.raises(Exception, match="Fehler beim Verbinden"):
+        measure_throughput(ThroughputTarget("127.0.0.1", _free_port()), streams=2, duration=0.1, timeout=1.0)
+
+def test_refused_stream_is_reported_in_errors(monkeypatch):
+    create_connection = socket.create_connection
+    attempts = []
+
+    def refuse_second(address, *args, **kwargs):
+        attempts.append(address)
+        if len(attempts) == 2:
+            raise ConnectionRefusedError("Verbindung abgelehnt")
+        return create_connection(address, *args, **kwargs)
+
+    monkeypatch.setattr(throughput.socket, "create_connection", refuse_second)
+    with ThroughputServer() as server:
+        result = measure_throughput(server.target(), streams=3, duration=0.2)
+    assert result.streams == 2
+    assert result.errors == ["Stream 2: Verbindung abgelehnt"]
+    assert result.bytes > 0
+
+def test_reset_during_upload_is_reported_in_errors():
+    # Gegenstelle nimmt an und bricht die Verbindung mit RST ab (SO_LINGER 0)
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as listener:
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(1)
+
+        def reset():
+            connection, _ = listener.accept()
+            # Erst nach dem Befehlsbyte abbrechen, sonst scheitert schon der Verbindungsaufbau
+            connection.recv(1)
+            linger = struct.pack("HH" if sys.platform == "win32" else "ii", 1, 0)
+            connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, linger)
+            connection.close()
+
+        thread = threading.Thread(target=reset, daemon=True)
+        thread.start()
+        result = measure_throughput(ThroughputTarget(*listener.getsockname()), DIRECTION_UPLOAD, streams=1,
+                                    duration=1.0)
+        thread.join(1)
+    assert len(result.errors) == 1 and result.errors[0].startswith("Stream 1: ")
+    assert result.duration < 1.5